@@ -0,0 +1,202 @@
+"""Spaltenorientierter Lesepfad für große Analyse-Abfragen (Apache Arrow statt JSON).
+
+PostgREST liefert JSON, das erst in Python-Dicts und dann in DataFrames
+umgewandelt wird. Hier werden die großen Tabellen (Strafen, Trainingssiege,
+Spielereignisse, Aufstellungen) stattdessen direkt spaltenweise gelesen:
+
+- Postgres-Backend (pg_backend.py): ``COPY (...) TO STDOUT`` als CSV-Strom, der
+  von pyarrow.csv mehrfädig in C++ geparst wird – keine Python-Objekte pro Zeile.
+- Lokale Replik (local_replica.py): Zeilentupel aus SQLite, spaltenweise in eine
+  Arrow-Tabelle übernommen.
+
+Ergebnis ist eine ``pyarrow.Table`` mit festem Schema; ``to_frame`` macht daraus
+ein DataFrame (numerische Spalten ohne Kopie, auf Wunsch auch Text-Spalten
+über ``pd.ArrowDtype``). Ohne pyarrow (optionale Abhängigkeit) bleibt es beim
+JSON-Weg von DatabaseHelper.
+"""
+
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+try:  # pragma: no cover - optionale Abhängigkeit
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover
+    pa = None  # type: ignore[assignment]
+    pa_csv = None  # type: ignore[assignment]
+
+
+def arrow_available() -> bool:
+    return pa is not None
+
+
+@dataclass(frozen=True)
+class AnalyticsQuery:
+    """Abfrage mit festem Ergebnisschema.
+
+    sql enthält ``{where}``; es wird nur mit ganzzahligen date_key-Grenzen gefüllt,
+    damit dieselbe Abfrage unverändert in COPY (ohne Parameter) und SQLite läuft.
+    """
+
+    table: str
+    sql: str
+    columns: Tuple[Tuple[str, str], ...]
+    date_column: Optional[str] = None
+
+    def render(self, start_key: Optional[int] = None, end_key: Optional[int] = None) -> str:
+        conditions = []
+        if start_key is not None:
+            conditions.append(f"{self.date_column} >= {int(start_key)}")
+        if end_key is not None:
+            conditions.append(f"{self.date_column} <= {int(end_key)}")
+        return self.sql.format(where=f"where {' and '.join(conditions)}" if conditions else "")
+
+    def schema(self) -> "pa.Schema":
+        return pa.schema([(name, _ARROW_TYPES[kind]()) for name, kind in self.columns])
+
+
+_ARROW_TYPES = {
+    "int": lambda: pa.int64(),
+    "float": lambda: pa.float64(),
+    "bool": lambda: pa.bool_(),
+    "str": lambda: pa.string(),
+}
+
+# Spaltennamen und Standardwerte wie PENALTY_FIELDS/TRAINING_FIELDS in database_helper
+ANALYTICS_QUERIES: Dict[str, AnalyticsQuery] = {
+    "penalties": AnalyticsQuery(
+        "fact_penalty",
+        """select f.penalty_id, f.date_key,
+                  coalesce(p.name, 'Unbekannt') as "Spieler",
+                  coalesce(t.description, 'Unbekannte Strafe') as "Strafe",
+                  coalesce(f.amount_eur, 0) as "Betrag",
+                  coalesce(f.note, '') as "Zusatzinfo"
+           from fact_penalty f
+           left join dim_player p on p.player_key = f.player_key
+           left join dim_penalty_type t on t.penalty_type_key = f.penalty_type_key
+           {where}
+           order by f.date_key desc, f.penalty_id desc""",
+        (("penalty_id", "int"), ("date_key", "int"), ("Spieler", "str"), ("Strafe", "str"),
+         ("Betrag", "float"), ("Zusatzinfo", "str")),
+        date_column="f.date_key",
+    ),
+    "training_victories": AnalyticsQuery(
+        "fact_training_win",
+        """select coalesce(p.name, 'Unbekannt') as "Spieler", w.date_key,
+                  coalesce(w.win_cnt, 0) > 0 as "Sieg"
+           from fact_training_win w
+           left join dim_player p on p.player_key = w.player_key
+           {where}
+           order by w.date_key desc, w.player_key desc""",
+        (("Spieler", "str"), ("date_key", "int"), ("Sieg", "bool")),
+        date_column="w.date_key",
+    ),
+    "events": AnalyticsQuery(
+        "events",
+        """select match_id, minute, phase, type, team_side, player_primary, player_id,
+                  player_in, player_id_in, player_out, player_id_out, score_home, score_away, detail
+           from events {where}""",
+        (("match_id", "str"), ("minute", "int"), ("phase", "str"), ("type", "str"), ("team_side", "str"),
+         ("player_primary", "str"), ("player_id", "str"), ("player_in", "str"), ("player_id_in", "str"),
+         ("player_out", "str"), ("player_id_out", "str"), ("score_home", "int"), ("score_away", "int"),
+         ("detail", "str")),
+    ),
+    "lineups": AnalyticsQuery(
+        "lineups",
+        """select match_id, team_side, team_name, team_key, role, number, name, player_id,
+                  is_captain, is_goalkeeper
+           from lineups {where}""",
+        (("match_id", "str"), ("team_side", "str"), ("team_name", "str"), ("team_key", "str"),
+         ("role", "str"), ("number", "int"), ("name", "str"), ("player_id", "str"),
+         ("is_captain", "bool"), ("is_goalkeeper", "bool")),
+    ),
+}
+
+
+def table_from_csv(data: bytes, schema: "pa.Schema") -> "pa.Table":
+    """CSV aus ``COPY ... (format csv, header true)`` als Arrow-Tabelle.
+
+    COPY schreibt NULL als leeres Feld und den Leerstring als ``""`` – genau so
+    werden die beiden hier wieder unterschieden.
+    """
+    return pa_csv.read_csv(
+        io.BytesIO(data),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=schema,
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=False,
+            true_values=["t", "true", "1"],
+            false_values=["f", "false", "0"],
+        ),
+    )
+
+
+def table_from_rows(rows: Any, schema: "pa.Schema") -> "pa.Table":
+    """Zeilentupel (z.B. sqlite3) spaltenweise als Arrow-Tabelle."""
+    columns = list(zip(*rows)) if rows else [[] for _ in schema]
+    arrays = [_column(values, field.type) for values, field in zip(columns, schema)]
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _column(values: Any, arrow_type: "pa.DataType") -> "pa.Array":
+    if arrow_type == pa.bool_():
+        # SQLite kennt kein boolean, Wahrheitswerte kommen als 0/1
+        return pa.array(values, type=pa.int64()).cast(arrow_type)
+    return pa.array(values, type=arrow_type)
+
+
+def date_keys_to_datetime(keys: pd.Series) -> pd.Series:
+    """date_key (YYYYMMDD) → datetime64[ns], rein arithmetisch ohne Text-Parsing."""
+    keys = keys.astype("int64")
+    parts = pd.DataFrame({"year": keys // 10000, "month": keys // 100 % 100, "day": keys % 100})
+    return pd.to_datetime(parts, errors="coerce").astype("datetime64[ns]")
+
+
+def to_frame(table: "pa.Table", arrow_dtypes: bool = False) -> pd.DataFrame:
+    """Arrow-Tabelle als DataFrame; date_key wird zur Spalte Datum (datetime64).
+
+    arrow_dtypes=True behält alle Spalten als Arrow-Puffer (pd.ArrowDtype, ohne Kopie),
+    sonst werden Text-Spalten wie im JSON-Weg zu object.
+    """
+    df = table.to_pandas(types_mapper=pd.ArrowDtype if arrow_dtypes else None)
+    if "date_key" in df.columns:
+        position = df.columns.get_loc("date_key")
+        datum = date_keys_to_datetime(df.pop("date_key"))
+        df.insert(position, "Datum", datum)
+    return df
+
+
+class AnalyticsReader:
+    """Liest ANALYTICS_QUERIES spaltenweise aus dem Postgres-Backend oder der lokalen Replik."""
+
+    def __init__(self, pg: Any = None, replica: Any = None) -> None:
+        if not arrow_available():
+            raise ImportError(
+                "Das Paket 'pyarrow' wird benötigt, ist aber nicht installiert. "
+                "Bitte 'pip install pyarrow' ausführen."
+            )
+        if pg is None and replica is None:
+            raise ValueError("AnalyticsReader braucht das Postgres-Backend oder die lokale Replik")
+        self.pg = pg
+        self.replica = replica
+
+    def read_table(self, name: str, start_key: Optional[int] = None, end_key: Optional[int] = None) -> "pa.Table":
+        query = ANALYTICS_QUERIES[name]
+        sql = query.render(start_key, end_key)
+        if self.pg is not None:
+            return table_from_csv(self.pg.copy_csv(sql), query.schema())
+        return table_from_rows(self.replica.query_tuples(sql, table=query.table), query.schema())
+
+    def read_frame(
+        self,
+        name: str,
+        start_key: Optional[int] = None,
+        end_key: Optional[int] = None,
+        arrow_dtypes: bool = False,
+    ) -> pd.DataFrame:
+        return to_frame(self.read_table(name, start_key, end_key), arrow_dtypes=arrow_dtypes)
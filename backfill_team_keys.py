@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Einmaliges Nachtragen der Team-Keys in Bestandszeilen.
+
+Verwendung:
+- supabase_team_keys.sql im Supabase SQL-Editor ausführen (legt die Spalten an)
+- python backfill_team_keys.py
+
+Die Keys werden mit season_config.resolve_team_key berechnet, also genau wie
+bei neuen Zeilen aus dem Scraper. Mehrfaches Ausführen ist unkritisch, es
+werden nur Zeilen ohne Key angefasst.
+"""
+
+import sys
+
+from database_helper import db
+
+
+def main():
+    """Hauptfunktion für das Nachtragen der Team-Keys"""
+    print("🔄 Trage fehlende Team-Keys nach...")
+
+    try:
+        updated = db.backfill_team_keys()
+    except Exception as e:
+        print(f"❌ Fehler beim Nachtragen: {e}")
+        print("💡 Wurde supabase_team_keys.sql bereits eingespielt?")
+        sys.exit(1)
+
+    if not db.connected:
+        print("❌ Keine Datenbankverbindung")
+        sys.exit(1)
+
+    for column, count in updated.items():
+        print(f"✅ {column}: {count} Zeilen aktualisiert")
+
+
+if __name__ == "__main__":
+    main()
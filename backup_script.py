@@ -14,8 +14,8 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def create_backup():
-    """Erstellt Backup aller wichtigen Datenbank-Tabellen als Excel-Dateien"""
+def _create_client():
+    """Verbindet sich mit Supabase anhand der Umgebungsvariablen"""
     
     try:
         # Supabase importieren
@@ -42,10 +42,26 @@ def create_backup():
     logger.info("🔑 Supabase-Credentials gefunden")
     
     try:
-        # Mit Supabase verbinden
         supabase: Client = create_client(supabase_url, supabase_key)
         logger.info("🔗 Erfolgreich mit Supabase verbunden")
-        
+        return supabase
+    except Exception as e:
+        logger.error(f"❌ Verbindung zu Supabase fehlgeschlagen:")
+        logger.error(f"   {e}")
+        sys.exit(1)
+
+
+def create_backup(supabase=None):
+    """Erstellt Backup aller wichtigen Datenbank-Tabellen als Excel-Dateien
+    
+    Args:
+        supabase: Optional bereits verbundener Client (z.B. aus dem Scheduler)
+    """
+    
+    if supabase is None:
+        supabase = _create_client()
+    
+    try:
         # Timestamp für Dateinamen
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         logger.info(f"📅 Backup-Timestamp: {timestamp}")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JSON-Weg (PostgREST) gegen spaltenweisen Arrow-Weg (analytics_reader.py).
+
+Vergleicht Übertragungsgröße und Zeit bis zum fertigen DataFrame:
+- JSON: Antwort parsen (json.loads) und mit flatten_rows flach machen
+- CSV/Arrow: COPY-Ausgabe mit pyarrow.csv parsen (table_from_csv + to_frame)
+- Parquet: dieselbe Arrow-Tabelle als Parquet-Datei (Größe und Lesezeit)
+
+Ohne Argumente läuft der Vergleich auf einer synthetischen Saison (wie
+bench_flatten.py). Mit --live werden die echten Tabellen gelesen; dafür sind
+SUPABASE_URL/SUPABASE_ANON_KEY und SUPABASE_DB_URL nötig.
+
+Verwendung:
+- python benchmarks/bench_analytics.py
+- python benchmarks/bench_analytics.py --rows 200000 --repeat 5
+- python benchmarks/bench_analytics.py --live
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics_reader import ANALYTICS_QUERIES, arrow_available, table_from_csv, to_frame  # noqa: E402
+from bench_flatten import synthetic_penalties, synthetic_training  # noqa: E402
+from database_helper import PENALTY_COLUMNS, DatabaseHelper  # noqa: E402
+
+if not arrow_available():
+    raise SystemExit("❌ pyarrow wird benötigt: pip install pyarrow")
+
+import pyarrow.parquet as pq  # noqa: E402
+
+
+def _csv_field(value):
+    # Wie COPY (format csv): NULL leer, Leerstring gequotet, Booleans als t/f
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    text = str(value)
+    if text == "" or any(char in text for char in ',"\n\r'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def copy_csv(rows, query):
+    """CSV wie COPY ... TO STDOUT (format csv, header true)."""
+    lines = [",".join(name for name, _ in query.columns)]
+    lines.extend(",".join(_csv_field(value) for value in row) for row in rows)
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def flat_penalties(rows):
+    return [
+        (row['penalty_id'], row['date_key'], (row['dim_player'] or {}).get('name') or 'Unbekannt',
+         (row['dim_penalty_type'] or {}).get('description') or 'Unbekannte Strafe',
+         row['amount_eur'], row['note'] or '')
+        for row in rows
+    ]
+
+
+def flat_training(rows):
+    return [((row['dim_player'] or {}).get('name') or 'Unbekannt', row['date_key'], row['win_cnt'] > 0)
+            for row in rows]
+
+
+def parquet_bytes(table):
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, compression="zstd")
+    return buffer.getvalue()
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def synthetic_cases(count):
+    penalties = synthetic_penalties(count)
+    training = synthetic_training(count)
+    for row in penalties:
+        row.pop('dim_date')
+    for row in training:
+        row.pop('dim_date')
+    return [
+        ("penalties", json.dumps(penalties).encode("utf-8"),
+         lambda rows: DatabaseHelper._penalty_frame(rows, list(PENALTY_COLUMNS)),
+         copy_csv(flat_penalties(penalties), ANALYTICS_QUERIES["penalties"])),
+        ("training_victories", json.dumps(training).encode("utf-8"),
+         lambda rows: DatabaseHelper._training_frame(rows, None),
+         copy_csv(flat_training(training), ANALYTICS_QUERIES["training_victories"])),
+    ]
+
+
+def live_cases():
+    helper = DatabaseHelper()
+    helper.replica = None
+    helper._replica_path = ""
+    helper._pg_enabled = True
+    helper._ensure_connected()
+    pg = helper._get_pg() if helper.connected else None
+    if pg is None:
+        raise SystemExit("❌ Supabase-Verbindung und Postgres-Backend nötig (SUPABASE_DB_URL, psycopg[pool])")
+
+    selects = {
+        "penalties": ("fact_penalty", "penalty_id, date_key, amount_eur, note, dim_player(name), "
+                      "dim_penalty_type(description)", ["penalty_id"],
+                      lambda rows: DatabaseHelper._penalty_frame(rows, list(PENALTY_COLUMNS))),
+        "training_victories": ("fact_training_win", "date_key, player_key, win_cnt, dim_player(name)",
+                               ["date_key", "player_key"], lambda rows: DatabaseHelper._training_frame(rows, None)),
+        "events": ("events", "*", [], None),
+        "lineups": ("lineups", "*", [], None),
+    }
+    cases = []
+    for name, (table, select, keys, to_df) in selects.items():
+        rows = helper.read_table(table, select, keys)
+        cases.append((name, json.dumps(rows).encode("utf-8"), to_df or pd.DataFrame,
+                      pg.copy_csv(ANALYTICS_QUERIES[name].render())))
+    pg.close()
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON- und Arrow-Lesepfad vergleichen")
+    parser.add_argument("--rows", type=int, default=50_000, help="Zeilen pro Tabelle (synthetische Saison)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--live", action="store_true", help="echte Tabellen über PostgREST und COPY lesen")
+    args = parser.parse_args()
+
+    cases = live_cases() if args.live else synthetic_cases(args.rows)
+
+    print("Live-Daten" if args.live else f"{args.rows} synthetische Zeilen", f"- bester von {args.repeat} Läufen")
+    print(f"{'Abfrage':20} {'JSON':>9} {'CSV':>9} {'Parquet':>9} "
+          f"{'JSON→df':>9} {'Arrow→df':>9} {'Parquet→df':>11} {'Speed-up':>9}")
+    for name, payload, json_to_frame, csv_payload in cases:
+        schema = ANALYTICS_QUERIES[name].schema()
+        parquet = parquet_bytes(table_from_csv(csv_payload, schema))
+        json_seconds = best_of(lambda: json_to_frame(json.loads(payload)), args.repeat)
+        arrow_seconds = best_of(lambda: to_frame(table_from_csv(csv_payload, schema)), args.repeat)
+        parquet_seconds = best_of(lambda: to_frame(pq.read_table(io.BytesIO(parquet))), args.repeat)
+        print(f"{name:20} {len(payload) / 1024:7.0f}KB {len(csv_payload) / 1024:7.0f}KB {len(parquet) / 1024:7.0f}KB "
+              f"{json_seconds * 1000:7.0f}ms {arrow_seconds * 1000:7.0f}ms {parquet_seconds * 1000:9.0f}ms "
+              f"{json_seconds / arrow_seconds:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: PostgREST (supabase-py über HTTPS) gegen Postgres-Backend (psycopg-Pool).
+
+Misst die Lesepfade von DatabaseHelper mit geleertem Abfrage-Cache und optional
+den Schreibpfad eines Trainingstags (Löschen + Einfügen). Benötigt
+SUPABASE_URL/SUPABASE_ANON_KEY sowie SUPABASE_DB_URL.
+
+Verwendung:
+- python benchmarks/bench_backends.py
+- python benchmarks/bench_backends.py --repeat 10 --write
+  (schreibt einen Trainingstag am 31.12.2099 und löscht ihn danach wieder)
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database_helper import DatabaseHelper  # noqa: E402
+
+BENCH_DAY = date(2099, 12, 31)
+
+
+def make_helper(backend):
+    helper = DatabaseHelper()
+    helper._pg_enabled = backend == "postgres"
+    helper.replica = None
+    helper._replica_path = ""
+    helper._ensure_connected()
+    if not helper.connected:
+        raise SystemExit("❌ Keine Supabase-Verbindung (SUPABASE_URL/SUPABASE_ANON_KEY)")
+    if backend == "postgres" and helper._get_pg() is None:
+        raise SystemExit("❌ Postgres-Backend nicht verfügbar (psycopg[pool] und SUPABASE_DB_URL nötig)")
+    return helper
+
+
+def median_ms(helper, func, repeat):
+    timings = []
+    for _ in range(repeat):
+        helper.cache.clear()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def cases(helper, write):
+    players = helper.get_player_names()[:20]
+    winners = players[::2]
+    result = [
+        ("get_penalties", lambda: helper.get_penalties()),
+        ("get_penalties (1 Woche)", lambda: helper.get_penalties(start=date(2025, 9, 1), end=date(2025, 9, 7))),
+        ("get_training_victories", lambda: helper.get_training_victories()),
+    ]
+    if write and players:
+        result.append(("Trainingstag speichern", lambda: helper.add_training_day_entries(BENCH_DAY, winners, players)))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PostgREST- und Postgres-Backend vergleichen")
+    parser.add_argument("--repeat", type=int, default=5, help="Läufe pro Messung (Median)")
+    parser.add_argument("--write", action="store_true", help=f"auch Schreibpfad messen (Testtag {BENCH_DAY})")
+    args = parser.parse_args()
+
+    helpers = {backend: make_helper(backend) for backend in ("postgrest", "postgres")}
+    # Aufwärmen: Dimensions-Maps laden, Pool-Verbindungen öffnen
+    for helper in helpers.values():
+        helper.get_player_names()
+        helper._load_dimension_maps()
+
+    print(f"Median aus {args.repeat} Läufen, Cache jeweils geleert")
+    print(f"{'Abfrage':26} {'PostgREST':>10} {'Postgres':>10} {'Speed-up':>9}")
+    try:
+        for (name, rest_call), (_, pg_call) in zip(cases(helpers["postgrest"], args.write),
+                                                    cases(helpers["postgres"], args.write)):
+            rest_ms = median_ms(helpers["postgrest"], rest_call, args.repeat)
+            pg_ms = median_ms(helpers["postgres"], pg_call, args.repeat)
+            print(f"{name:26} {rest_ms:8.0f}ms {pg_ms:8.0f}ms {rest_ms / pg_ms:8.1f}x")
+    finally:
+        if args.write:
+            helpers["postgrest"].delete_training_day(BENCH_DAY)
+        helpers["postgres"].pg.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Verarbeitung eingebetteter Join-Antworten (PostgREST) zu DataFrames.
+
+Vergleicht die frühere zeilenweise Schleife (dict pro Zeile, verschachtelte
+.get()-Aufrufe, try/except) mit pd.json_normalize und postgrest_rows.flatten_rows
+auf einer synthetischen Saison.
+
+Verwendung:
+- python benchmarks/bench_flatten.py
+- python benchmarks/bench_flatten.py --rows 100000 --repeat 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database_helper import PENALTY_FIELDS, TRAINING_FIELDS  # noqa: E402
+from postgrest_rows import flatten_rows  # noqa: E402
+
+PLAYERS = [f"Spieler {i:02d}" for i in range(30)]
+PENALTY_TYPES = ["Verspätung", "Handy in Besprechung", "Falscher Einwurf", "Stange umgeworfen", "Rote Karte"]
+
+
+def synthetic_penalties(count, seed=1):
+    rng = random.Random(seed)
+    start = date(2026, 7, 1)
+    rows = []
+    for penalty_id in range(count, 0, -1):
+        day = start + timedelta(days=rng.randrange(300))
+        rows.append({
+            'penalty_id': penalty_id,
+            'date_key': int(day.strftime('%Y%m%d')),
+            'player_key': rng.randrange(len(PLAYERS)),
+            'amount_eur': f"{rng.choice([0.5, 1, 5, 15, 50]):.2f}",
+            'note': rng.choice(['', None, 'Token-Schnell-Strafe']),
+            'dim_player': {'name': rng.choice(PLAYERS)},
+            'dim_penalty_type': {'description': rng.choice(PENALTY_TYPES)} if rng.random() > 0.01 else None,
+            'dim_date': {'full_date': day.isoformat()},
+        })
+    return rows
+
+
+def synthetic_training(count, seed=2):
+    rng = random.Random(seed)
+    start = date(2026, 7, 1)
+    return [
+        {
+            'date_key': int((start + timedelta(days=i // len(PLAYERS))).strftime('%Y%m%d')),
+            'player_key': i % len(PLAYERS),
+            'played_cnt': 1,
+            'win_cnt': rng.randrange(2),
+            'dim_player': {'name': PLAYERS[i % len(PLAYERS)]},
+            'dim_date': {'full_date': (start + timedelta(days=i // len(PLAYERS))).isoformat()},
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_penalties(rows):
+    processed_data = []
+    for row in rows:
+        try:
+            player_name = row.get('dim_player', {}).get('name', 'Unbekannt') if row.get('dim_player') else 'Unbekannt'
+            penalty_desc = row.get('dim_penalty_type', {}).get('description', 'Unbekannte Strafe') if row.get('dim_penalty_type') else 'Unbekannte Strafe'
+            penalty_date = row.get('dim_date', {}).get('full_date', None) if row.get('dim_date') else None
+            processed_data.append({
+                'penalty_id': row.get('penalty_id'),
+                'Spieler': player_name,
+                'Strafe': penalty_desc,
+                'Betrag': float(row.get('amount_eur', 0)),
+                'Zusatzinfo': row.get('note', ''),
+                'Datum': penalty_date
+            })
+        except Exception:
+            continue
+    df = pd.DataFrame(processed_data)
+    df['Datum'] = pd.to_datetime(df['Datum'])
+    return df
+
+
+def legacy_training(rows):
+    processed_data = []
+    for row in rows:
+        try:
+            player_name = row.get('dim_player', {}).get('name', 'Unbekannt') if row.get('dim_player') else 'Unbekannt'
+            training_date = row.get('dim_date', {}).get('full_date', None) if row.get('dim_date') else None
+            processed_data.append({
+                'Spieler': player_name,
+                'Datum': training_date,
+                'Sieg': row.get('win_cnt', 0) > 0
+            })
+        except Exception:
+            continue
+    df = pd.DataFrame(processed_data)
+    df['Datum'] = pd.to_datetime(df['Datum'])
+    return df
+
+
+def json_normalize_penalties(rows):
+    df = pd.json_normalize(rows)
+    return pd.DataFrame({
+        'penalty_id': df['penalty_id'],
+        'Datum': pd.to_datetime(df['date_key'].astype(str), format='%Y%m%d'),
+        'Spieler': df['dim_player.name'].fillna('Unbekannt'),
+        'Strafe': df['dim_penalty_type.description'].fillna('Unbekannte Strafe'),
+        'Betrag': pd.to_numeric(df['amount_eur']).astype(float),
+        'Zusatzinfo': df['note'].fillna(''),
+    })
+
+
+def json_normalize_training(rows):
+    df = pd.json_normalize(rows)
+    return pd.DataFrame({
+        'Spieler': df['dim_player.name'].fillna('Unbekannt'),
+        'Datum': pd.to_datetime(df['date_key'].astype(str), format='%Y%m%d'),
+        'Sieg': df['win_cnt'] > 0,
+    })
+
+
+def best_of(func, rows, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(rows)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für das Flachmachen von Join-Antworten")
+    parser.add_argument("--rows", type=int, default=50_000, help="Zeilen pro Tabelle (synthetische Saison)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cases = [
+        ("fact_penalty", synthetic_penalties(args.rows), legacy_penalties, json_normalize_penalties,
+         lambda rows: flatten_rows(rows, PENALTY_FIELDS)),
+        ("fact_training_win", synthetic_training(args.rows), legacy_training, json_normalize_training,
+         lambda rows: flatten_rows(rows, TRAINING_FIELDS)),
+    ]
+
+    print(f"{args.rows} Zeilen, bester von {args.repeat} Läufen")
+    print(f"{'Tabelle':18} {'Schleife':>10} {'json_norm.':>11} {'flatten':>10} {'Speed-up':>9}")
+    for name, rows, legacy, normalized, flattened in cases:
+        legacy_seconds = best_of(legacy, rows, args.repeat)
+        normalize_seconds = best_of(normalized, rows, args.repeat)
+        flatten_seconds = best_of(flattened, rows, args.repeat)
+        print(f"{name:18} {legacy_seconds * 1000:8.0f}ms {normalize_seconds * 1000:9.0f}ms "
+              f"{flatten_seconds * 1000:8.0f}ms {legacy_seconds / flatten_seconds:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
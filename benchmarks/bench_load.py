@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Last-Benchmark: alle öffentlichen DatabaseHelper-Methoden und die Seiten bei
+1×, 10× und 100× der heutigen Datenmenge.
+
+Die Daten erzeugt synthetic_data.py (reproduzierbar per Seed), sie liegen in
+einer SQLite-Datenbank hinter dem PostgREST-Stand-in postgrest_standin.py.
+DatabaseHelper läuft unverändert dagegen, jede Antwort kostet die simulierte
+Netzwerk-Latenz (--latency-ms) plus JSON-Serialisierung. Mit
+--backend replica wird zusätzlich die lokale Replik (und damit der
+Arrow-Lesepfad) aus dem Stand-in synchronisiert und genutzt.
+
+Lesende Methoden: Median aus --repeat Läufen mit geleertem Abfrage-Cache.
+Schreibende Methoden laufen danach je einmal. Die Seiten (Startseite,
+Teamkalender, Trainingsstatistiken, Esel der Woche) werden mit Streamlits
+AppTest ohne Browser ausgeführt – einmal kalt (leerer Cache, inkl.
+Datenbank) und einmal warm (nur Datenaufbereitung und Rendering); ohne
+installiertes Streamlit entfällt dieser Teil.
+
+Messungen über --budget-ms werden markiert, am Ende steht pro Methode, ab
+welchem Faktor sie das Budget reißt. Methoden, für die es keinen Messfall
+gibt, werden aufgelistet.
+
+Verwendung:
+- python benchmarks/bench_load.py
+- python benchmarks/bench_load.py --scales 1 10 --seasons 5 --latency-ms 60
+- python benchmarks/bench_load.py --backend replica --no-pages
+"""
+
+import argparse
+import importlib.util
+import inspect
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import database_helper  # noqa: E402
+from connection_manager import ConnectionManager  # noqa: E402
+from database_helper import DatabaseHelper  # noqa: E402
+from postgrest_standin import SqlitePostgrest  # noqa: E402
+from season_config import CURRENT_STANDINGS_SEASON, EXPECTED_GROUP_TEAMS  # noqa: E402
+from synthetic_data import generate, load_sqlite, row_counts  # noqa: E402
+from timezone_helper import get_german_now  # noqa: E402
+from write_journal import WriteJournal  # noqa: E402
+
+PAGES = ["startseite", "teamkalender", "trainingsstatistiken", "esel_der_woche"]
+
+
+def make_helper(client, backend, workdir):
+    """DatabaseHelper gegen den Stand-in, ohne Health-Thread, Postgres-Backend und Journal-Thread"""
+    helper = DatabaseHelper()
+    helper.connection = ConnectionManager(lambda: client, lambda _: None)
+    helper._start_health_checks = lambda: None
+    helper._pg_enabled = False
+    helper.replica = None
+    helper._replica_path = os.path.join(workdir, "replica.sqlite3") if backend == "replica" else ""
+    # Journal ohne Hintergrund-Thread, damit flush_journal deterministisch messbar ist
+    helper._journal_path = os.path.join(workdir, "write_journal.jsonl")
+    helper.journal = WriteJournal(helper._journal_path)
+    helper._ensure_connected()
+    return helper
+
+
+def read_cases(helper, tables):
+    """(Name, Methode, Aufruf) der lesenden Messfälle"""
+    today = get_german_now().date()
+    players = [row["name"] for row in tables["dim_player"] if row["active_flag"]]
+    training_day = max((row["date_key"] for row in tables["fact_training_win"]), default=None)
+    training_day = date(training_day // 10000, training_day // 100 % 100, training_day % 100) if training_day else today
+    startseite = {
+        'birthdays': helper.get_birthdays,
+        'training_stats': helper.get_training_statistics,
+        'donkey': helper.get_last_week_donkey,
+        'standings_history': helper.get_team_standings_history,
+    }
+    return [
+        ("get_player_names", "get_player_names", helper.get_player_names),
+        ("get_players_by_role", "get_players_by_role", helper.get_players_by_role),
+        ("get_birthdays", "get_birthdays", helper.get_birthdays),
+        ("get_penalty_types", "get_penalty_types", helper.get_penalty_types),
+        ("get_penalties", "get_penalties", helper.get_penalties),
+        ("get_penalties (4 Wochen)", "get_penalties",
+         lambda: helper.get_penalties(start=today - timedelta(days=28), end=today)),
+        ("get_penalties (3 Spieler)", "get_penalties", lambda: helper.get_penalties(players=players[:3])),
+        ("get_last_week_donkey", "get_last_week_donkey", helper.get_last_week_donkey),
+        ("get_training_victories", "get_training_victories", helper.get_training_victories),
+        ("get_training_victories (alle)", "get_training_victories",
+         lambda: helper.get_training_victories(season_start=None)),
+        ("get_training_statistics", "get_training_statistics", helper.get_training_statistics),
+        ("get_training_day_entries", "get_training_day_entries", lambda: helper.get_training_day_entries(training_day)),
+        ("call_rpc (training_statistics)", "call_rpc",
+         lambda: helper.call_rpc('training_statistics', {'p_season_start': None})),
+        ("get_standings_snapshot", "get_standings_snapshot", helper.get_standings_snapshot),
+        ("get_latest_viktoria_data", "get_latest_viktoria_data", helper.get_latest_viktoria_data),
+        ("is_standings_data_current", "is_standings_data_current", helper.is_standings_data_current),
+        ("get_standings_last_update", "get_standings_last_update", helper.get_standings_last_update),
+        ("get_team_standings_history", "get_team_standings_history", helper.get_team_standings_history),
+        ("read_table (events)", "read_table", lambda: helper.read_table('events', '*', [])),
+        ("read_table (lineups)", "read_table", lambda: helper.read_table('lineups', '*', [])),
+        ("iter_table_rows (matches)", "iter_table_rows",
+         lambda: sum(1 for _ in helper.iter_table_rows('matches', '*', []))),
+        ("read_analytics (events)", "read_analytics", lambda: helper.read_analytics('events')),
+        ("gather (Startseite)", "gather", lambda: {key: result.get() for key, result in helper.gather(startseite).items()}),
+        ("sync_replica", "sync_replica", lambda: helper.sync_replica(force=True)),
+        ("ensure_season_dates", "ensure_season_dates", helper.ensure_season_dates),
+        ("get_available_tables", "get_available_tables", helper.get_available_tables),
+        ("test_penalties_table", "test_penalties_table", helper.test_penalties_table),
+        ("test_connection", "test_connection", helper.test_connection),
+        ("check_connection", "check_connection", helper.check_connection),
+        ("get_connection_health", "get_connection_health", helper.get_connection_health),
+        ("get_connection_info", "get_connection_info", helper.get_connection_info),
+        ("get_cache_stats", "get_cache_stats", helper.get_cache_stats),
+        ("get_query_metrics", "get_query_metrics", helper.get_query_metrics),
+        ("get_journal_status", "get_journal_status", helper.get_journal_status),
+    ]
+
+
+def write_cases(helper, client, tables):
+    """Schreibende Messfälle in Ausführungsreihenfolge (jeweils ein Lauf)"""
+    today = get_german_now().date()
+    players = [row["name"] for row in tables["dim_player"] if row["active_flag"]]
+    penalty = {'Datum': today.strftime('%d.%m.%Y'), 'Spieler': players[0], 'Strafe': 'Falscher Einwurf',
+               'Betrag': 1.0, 'Zusatzinfo': 'Benchmark'}
+    records = [dict(penalty, Spieler=players[index % len(players)]) for index in range(50)]
+    standings = [
+        {'team_name': team, 'position': position, 'games_played': 10, 'wins': 5, 'draws': 2, 'losses': 3,
+         'goals_for': 20, 'goals_against': 15, 'goal_difference': 5, 'points': 17}
+        for position, team in enumerate(EXPECTED_GROUP_TEAMS, start=1)
+    ]
+    bench_day = today + timedelta(days=1)
+
+    def latest_penalty_ids(count):
+        rows = client.table('fact_penalty').select('penalty_id').order('penalty_id', desc=True).limit(count).execute()
+        return [row['penalty_id'] for row in rows.data]
+
+    return [
+        ("add_penalty", "add_penalty", lambda: helper.add_penalty(penalty)),
+        ("add_penalties (50)", "add_penalties", lambda: helper.add_penalties(records)),
+        ("enqueue_penalty", "enqueue_penalty", lambda: helper.enqueue_penalty(penalty)),
+        ("flush_journal", "flush_journal", helper.flush_journal),
+        ("delete_penalty", "delete_penalty", lambda: helper.delete_penalty(latest_penalty_ids(1)[0])),
+        ("delete_multiple_penalties (10)", "delete_multiple_penalties",
+         lambda: helper.delete_multiple_penalties(latest_penalty_ids(10))),
+        ("delete_penalties_bulk (40)", "delete_penalties_bulk",
+         lambda: helper.delete_penalties_bulk(latest_penalty_ids(40))),
+        ("add_training_victory", "add_training_victory",
+         lambda: helper.add_training_victory({'Datum': bench_day.isoformat(), 'Spieler': players[0], 'Sieg': True})),
+        ("add_training_day_entries", "add_training_day_entries",
+         lambda: helper.add_training_day_entries(bench_day, players[::2], players)),
+        ("enqueue_training_day", "enqueue_training_day",
+         lambda: helper.enqueue_training_day(bench_day, players[1::2], players)),
+        ("delete_training_day", "delete_training_day", lambda: helper.delete_training_day(bench_day)),
+        ("save_team_standings", "save_team_standings", lambda: helper.save_team_standings(standings)),
+        ("save_team_standings_batch", "save_team_standings_batch",
+         lambda: helper.save_team_standings_batch([(CURRENT_STANDINGS_SEASON, standings)] * 2)),
+    ]
+
+
+def measure(helper, client, func, repeat):
+    """Median in ms und Requests pro Lauf, Abfrage-Cache vor jedem Lauf geleert"""
+    timings, requests = [], []
+    for _ in range(repeat):
+        helper.cache.clear()
+        before = client.requests
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+        requests.append(client.requests - before)
+    return statistics.median(timings) * 1000, max(requests)
+
+
+def page_cases(helper, client):
+    """Seiten per AppTest: kalt (leerer Cache) und warm, None ohne Streamlit"""
+    if importlib.util.find_spec("streamlit") is None:
+        return None
+    from streamlit.testing.v1 import AppTest
+
+    import pages  # noqa: F401
+    for name in PAGES:
+        __import__(f"pages.{name}")
+    # Seiten und team_scraper halten eine Referenz auf database_helper.db
+    original = database_helper.db
+    for module in list(sys.modules.values()):
+        if getattr(module, "db", None) is original:
+            module.db = helper
+
+    results = []
+    for name in PAGES:
+        app = AppTest.from_string(f"from pages import {name}\n{name}.show()", default_timeout=600)
+        app.session_state["authenticated"] = True
+        app.session_state["username"] = "benchmark"
+        app.session_state["user_role"] = "user"
+        helper.cache.clear()
+        for label in ("kalt", "warm"):
+            before = client.requests
+            started = time.perf_counter()
+            app.run()
+            elapsed = (time.perf_counter() - started) * 1000
+            error = app.exception[0].message if len(app.exception) else None
+            results.append((f"Seite {name} ({label})", None, elapsed, client.requests - before, error))
+    return results
+
+
+def run_scale(scale, args, workdir):
+    started = time.perf_counter()
+    tables = generate(args.seasons, scale, args.seed)
+    conn = load_sqlite(tables)
+    counts = row_counts(tables)
+    print(f"\n{scale}× ({args.seasons} Saisons, {sum(counts.values())} Zeilen, "
+          f"erzeugt in {time.perf_counter() - started:.1f}s): "
+          + ", ".join(f"{table} {count}" for table, count in counts.items()))
+
+    client = SqlitePostgrest(conn, latency=args.latency_ms / 1000)
+    helper = make_helper(client, args.backend, workdir)
+    results = []
+    if args.backend == "replica":
+        # Erstsynchronisation einmal vorab, die Messungen lesen dann aus der Replik
+        helper.sync_replica(force=True)
+
+    for name, method, func in read_cases(helper, tables):
+        elapsed, requests = measure(helper, client, func, args.repeat)
+        results.append((name, method, elapsed, requests, None))
+    for name, method, func in write_cases(helper, client, tables):
+        before = client.requests
+        started = time.perf_counter()
+        outcome = func()
+        elapsed = (time.perf_counter() - started) * 1000
+        failed = outcome is False or (isinstance(outcome, tuple) and outcome and outcome[0] is False)
+        results.append((name, method, elapsed, client.requests - before, str(outcome) if failed else None))
+    if args.pages:
+        pages = page_cases(helper, client)
+        if pages is None:
+            print("ℹ️  Streamlit nicht installiert, Seiten werden nicht gemessen")
+        else:
+            results.extend(pages)
+
+    if helper.replica is not None:
+        helper.replica.close()
+    conn.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DatabaseHelper und Seiten bei wachsender Datenmenge messen")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100], help="Vielfache der heutigen Datenmenge")
+    parser.add_argument("--seasons", type=int, default=3, help="Saisons bis einschließlich der aktuellen")
+    parser.add_argument("--seed", type=int, default=26)
+    parser.add_argument("--repeat", type=int, default=3, help="Läufe pro lesender Messung (Median)")
+    parser.add_argument("--latency-ms", type=float, default=30, help="simulierte Roundtrip-Zeit pro Request")
+    parser.add_argument("--backend", choices=("postgrest", "replica"), default="postgrest")
+    parser.add_argument("--budget-ms", type=float, default=2000, help="ab hier gilt eine Messung als zu langsam")
+    parser.add_argument("--no-pages", dest="pages", action="store_false", help="Seiten nicht per AppTest messen")
+    args = parser.parse_args()
+
+    print(f"Backend {args.backend}, Latenz {args.latency_ms:.0f}ms/Request, Median aus {args.repeat} Läufen")
+    by_scale = {}
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as workdir:
+            by_scale[scale] = run_scale(scale, args, workdir)
+
+    first = by_scale[args.scales[0]]
+    print(f"\n{'Messung':34}" + "".join(f"{f'{scale}×':>18}" for scale in args.scales))
+    for index, (name, *_rest) in enumerate(first):
+        cells = []
+        for scale in args.scales:
+            _, _, elapsed, requests, error = by_scale[scale][index]
+            mark = "❌" if error else ("⚠️" if elapsed > args.budget_ms else "  ")
+            cells.append(f"{elapsed:9.0f}ms {requests:4}r {mark}")
+        print(f"{name:34}" + "".join(f"{cell:>18}" for cell in cells))
+
+    print(f"\nÜber dem Budget von {args.budget_ms:.0f}ms bzw. fehlgeschlagen:")
+    broken = False
+    for index, (name, *_rest) in enumerate(first):
+        for scale in args.scales:
+            _, _, elapsed, _, error = by_scale[scale][index]
+            if error or elapsed > args.budget_ms:
+                print(f"- {name}: ab {scale}×" + (f" ({error[:120]})" if error else f" ({elapsed:.0f}ms)"))
+                broken = True
+                break
+    if not broken:
+        print("- nichts")
+
+    measured = {method for results in by_scale.values() for _, method, *_ in results if method}
+    public = {name for name, _ in inspect.getmembers(DatabaseHelper, callable) if not name.startswith("_")}
+    if public - measured:
+        print("\nOhne Messfall:", ", ".join(sorted(public - measured)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Import-Zeit der Automatisierungs-Einstiegspunkte messen (Kaltstart).
+
+Jeder Import läuft in einem frischen Python-Prozess. Zum Vergleich wird
+derselbe Import mit vorab geladenem Streamlit/Supabase gemessen - so wie
+database_helper und team_scraper sie früher beim Modul-Import geladen haben.
+
+Verwendung:
+- python benchmarks/import_time.py
+- python benchmarks/import_time.py --repeat 10 standings_updater scheduler
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = [
+    "standings_updater",
+    "smart_standings_updater",
+    "scraper_service",
+    "database_helper",
+    "backup_script",
+    "scheduler",
+    "scrape_match_reports",
+    "generate_daily_content",
+]
+EAGER_UI_MODULES = ["streamlit", "supabase"]
+
+CHILD_CODE = """
+import importlib, json, sys, time
+preload, module = sys.argv[1].split(",") if sys.argv[1] else [], sys.argv[2]
+started = time.perf_counter()
+for name in preload:
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        pass
+importlib.import_module(module)
+print(json.dumps({
+    "seconds": time.perf_counter() - started,
+    "streamlit": "streamlit" in sys.modules,
+    "supabase": "supabase" in sys.modules,
+}))
+"""
+
+
+def measure(module, preload, repeat):
+    """Median der Import-Zeit über mehrere frische Prozesse, None bei Importfehler."""
+    samples = []
+    loaded = {}
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", CHILD_CODE, ",".join(preload), module],
+            cwd=ROOT, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()
+            return None, {"error": error[-1] if error else "unbekannter Fehler"}
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+        samples.append(data["seconds"])
+        loaded = data
+    return statistics.median(samples), loaded
+
+
+def available_ui_modules():
+    code = "import importlib.util, sys; print(','.join(m for m in sys.argv[1:] if importlib.util.find_spec(m)))"
+    result = subprocess.run([sys.executable, "-c", code, *EAGER_UI_MODULES], capture_output=True, text=True)
+    return [name for name in result.stdout.strip().split(",") if name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kaltstart-Importzeit der Einstiegspunkte messen")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--repeat", type=int, default=5, help="Prozesse pro Messung (Median)")
+    args = parser.parse_args()
+
+    eager = available_ui_modules()
+    print(f"Python {sys.version.split()[0]} | Vergleich mit vorab geladen: {', '.join(eager) or '- (nicht installiert)'}")
+    print(f"{'Modul':26} {'lazy (ms)':>10} {'eager (ms)':>11} {'Ersparnis':>10}  geladen")
+
+    for module in args.modules:
+        lazy, info = measure(module, [], args.repeat)
+        if lazy is None:
+            print(f"{module:26} {'Fehler':>10}  {info['error']}")
+            continue
+        loaded = ", ".join(name for name in EAGER_UI_MODULES if info.get(name)) or "-"
+        if eager:
+            eager_seconds, _ = measure(module, eager, args.repeat)
+        else:
+            eager_seconds = None
+        if eager_seconds:
+            saving = f"{(1 - lazy / eager_seconds) * 100:9.0f}%"
+            eager_text = f"{eager_seconds * 1000:11.0f}"
+        else:
+            saving, eager_text = f"{'-':>10}", f"{'-':>11}"
+        print(f"{module:26} {lazy * 1000:10.0f} {eager_text} {saving}  {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,512 @@
+"""
+PostgREST-Stand-in auf SQLite für Last-Benchmarks ohne Supabase.
+
+SqlitePostgrest bietet die Teilmenge der supabase-py-API, die DatabaseHelper
+nutzt (table().select/insert/upsert/update/delete mit eq/neq/gt/gte/lt/lte/
+in_/ilike/or_/order/limit/range, eingebettete Joins wie dim_player(name) und
+rpc()). Die Tabellen entsprechen supabase_Datenbankschema.md inklusive
+Primärschlüsseln und der Indizes aus den Migrationen, damit große Datenmengen
+wie in Postgres über Indizes gelesen werden.
+
+Jede Antwort wird wie über HTTP einmal als JSON serialisiert und wieder
+geparst; mit latency wird zusätzlich eine Netzwerk-Roundtrip-Zeit pro Request
+simuliert. Die RPCs aus supabase_statistics_functions.sql und
+supabase_training_day_function.sql sind in SQLite nachgebaut, unbekannte
+Funktionen schlagen wie PostgREST mit PGRST202 fehl.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+
+SCHEMA = {
+    "dim_date": """
+        date_key integer primary key, full_date text not null unique, year integer not null,
+        month_nr integer not null, month_name text, quarter integer not null, week_nr integer not null,
+        weekday_nr integer not null, weekday_name text, is_weekend integer not null default 0
+    """,
+    "dim_penalty_type": """
+        penalty_type_key integer primary key autoincrement, description text, default_amount_eur real
+    """,
+    "dim_player": """
+        player_key integer primary key autoincrement, name text not null unique, birthday text,
+        join_date text, active_flag integer default 1, created_at text default current_timestamp, "Rolle" text
+    """,
+    "fact_penalty": """
+        penalty_id integer primary key autoincrement, date_key integer, player_key integer,
+        penalty_type_key integer, amount_eur real not null, penalty_cnt integer not null default 1,
+        created_at text default current_timestamp, source_penalty_id integer unique, note text,
+        request_id text unique
+    """,
+    "fact_training_win": """
+        date_key integer not null, player_key integer not null, played_cnt integer not null default 1,
+        win_cnt integer not null default 0, primary key (date_key, player_key)
+    """,
+    "team_standings": """
+        standing_id integer primary key autoincrement, team_name text not null, team_key text,
+        season text not null, match_day integer, position integer not null, games_played integer not null,
+        wins integer not null, draws integer not null, losses integer not null, goals_for integer not null,
+        goals_against integer not null, goal_difference integer not null, points integer not null,
+        scraped_at text not null default current_timestamp
+    """,
+    "matches": """
+        match_id text, source_url text, competition text, season text, match_date text, home_team text,
+        away_team text, score_home integer, score_away integer, home_team_key text, away_team_key text
+    """,
+    "events": """
+        match_id text, source_url text, minute integer, phase text, type text, team_side text,
+        player_primary text, player_id text, player_in text, player_id_in text, player_out text,
+        player_id_out text, score_home integer, score_away integer, detail text, raw text
+    """,
+    "lineups": """
+        match_id text, source_url text, team_side text, team_name text, team_key text, role text,
+        number integer, name text, player_id text, is_captain integer, is_goalkeeper integer
+    """,
+}
+
+# Indizes, die auch die Produktionsdatenbank hat (supabase_statistics_functions.sql)
+INDEXES = (
+    "create index if not exists idx_fact_penalty_date_key on fact_penalty (date_key)",
+)
+
+BOOLEAN_COLUMNS = {
+    "dim_date": {"is_weekend"},
+    "dim_player": {"active_flag"},
+    "lineups": {"is_captain", "is_goalkeeper"},
+}
+
+_OPERATORS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+class StandinError(Exception):
+    """Fehler im Format von postgrest.APIError (code, message)"""
+
+    def __init__(self, code, message):
+        super().__init__(str({"code": code, "message": message}))
+        self.code = code
+        self.message = message
+
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+        self.count = None
+
+
+def create_schema(conn):
+    """Legt alle Tabellen und Indizes an (idempotent)."""
+    for table, columns in SCHEMA.items():
+        conn.execute(f"create table if not exists {table} ({columns})")
+    for statement in INDEXES:
+        conn.execute(statement)
+    conn.commit()
+
+
+def _quote(name):
+    return '"' + name.strip().strip('"') + '"'
+
+
+def _sql_value(value):
+    if isinstance(value, bool):
+        return int(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def _split_top_level(text):
+    """Trennt an Kommas außerhalb von Klammern und Anführungszeichen."""
+    parts, depth, quoted, current = [], 0, False, []
+    previous = ""
+    for char in text:
+        if char == '"' and previous != "\\":
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == "," and depth == 0 and not quoted:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+        previous = char
+    if "".join(current).strip():
+        parts.append("".join(current).strip())
+    return parts
+
+
+def _parse_literal(text):
+    if text.startswith('"') and text.endswith('"'):
+        return text[1:-1].replace('\\"', '"')
+    if text in ("true", "false"):
+        return int(text == "true")
+    if text == "null":
+        return None
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _logic_tree(text, joiner):
+    """PostgREST-Logikausdruck (or=(a.gt.1,and(a.eq.1,b.gt.2))) → (sql, params)"""
+    clauses, params = [], []
+    for part in _split_top_level(text):
+        match = re.fullmatch(r"(and|or)\((.*)\)", part, re.S)
+        if match:
+            sql, nested = _logic_tree(match.group(2), match.group(1).upper())
+        else:
+            column, operator, value = part.split(".", 2)
+            sql, nested = f"{_quote(column)} {_OPERATORS[operator]} ?", [_parse_literal(value)]
+        clauses.append(f"({sql})")
+        params.extend(nested)
+    return f" {joiner} ".join(clauses), params
+
+
+class _Query:
+    def __init__(self, client, table):
+        self._client = client
+        self._table = table
+        self._action = "select"
+        self._columns = "*"
+        self._where = []
+        self._params = []
+        self._order = []
+        self._limit = None
+        self._offset = None
+        self._payload = None
+        self._on_conflict = None
+        self._ignore_duplicates = False
+
+    # Aktionen
+    def select(self, columns="*", count=None):
+        self._columns = columns
+        return self
+
+    def insert(self, rows):
+        self._action, self._payload = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict=None, ignore_duplicates=False):
+        self._action, self._payload = "upsert", rows
+        self._on_conflict, self._ignore_duplicates = on_conflict, ignore_duplicates
+        return self
+
+    def update(self, values):
+        self._action, self._payload = "update", values
+        return self
+
+    def delete(self):
+        self._action = "delete"
+        return self
+
+    # Filter
+    def _filter(self, column, operator, value):
+        self._where.append(f"{_quote(column)} {operator} ?")
+        self._params.append(_sql_value(value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, "=", value)
+
+    def neq(self, column, value):
+        return self._filter(column, "<>", value)
+
+    def gt(self, column, value):
+        return self._filter(column, ">", value)
+
+    def gte(self, column, value):
+        return self._filter(column, ">=", value)
+
+    def lt(self, column, value):
+        return self._filter(column, "<", value)
+
+    def lte(self, column, value):
+        return self._filter(column, "<=", value)
+
+    def ilike(self, column, pattern):
+        self._where.append(f"lower({_quote(column)}) like lower(?)")
+        self._params.append(pattern)
+        return self
+
+    def in_(self, column, values):
+        values = list(values)
+        if not values:
+            self._where.append("0")
+            return self
+        self._where.append(f"{_quote(column)} in ({', '.join('?' for _ in values)})")
+        self._params.extend(_sql_value(value) for value in values)
+        return self
+
+    def or_(self, filters):
+        sql, params = _logic_tree(filters, "OR")
+        self._where.append(sql)
+        self._params.extend(params)
+        return self
+
+    def order(self, column, desc=False):
+        # PostgREST: aufsteigend NULLS LAST, absteigend NULLS FIRST
+        self._order.append(f"{_quote(column)} {'desc nulls first' if desc else 'asc nulls last'}")
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def range(self, start, end):
+        self._offset, self._limit = start, end - start + 1
+        return self
+
+    def execute(self):
+        return self._client._execute(self)
+
+    # SQL
+    def _where_sql(self, alias=None):
+        if not self._where:
+            return ""
+        if alias is None:
+            return " where " + " and ".join(self._where)
+        # Filterspalten auf die Basistabelle beziehen (Joins haben gleichnamige Schlüssel)
+        qualified = [re.sub(r'(?<![\w.])("[^"]+")', rf"{alias}.\1", clause) for clause in self._where]
+        return " where " + " and ".join(qualified)
+
+    def _tail_sql(self, alias):
+        sql = ""
+        if self._order:
+            sql += " order by " + ", ".join(f"{alias}.{order}" for order in self._order)
+        if self._limit is not None or self._offset is not None:
+            sql += f" limit {self._limit if self._limit is not None else -1} offset {self._offset or 0}"
+        return sql
+
+
+class SqlitePostgrest:
+    """supabase-py-kompatibler Client (Teilmenge) über einer SQLite-Datenbank."""
+
+    def __init__(self, conn, latency=0.0):
+        self._conn = conn
+        self._lock = threading.Lock()
+        self.latency = latency
+        self.requests = 0
+        self.bytes = 0
+        self._columns = {}
+
+    @classmethod
+    def connect(cls, path=":memory:", latency=0.0):
+        conn = sqlite3.connect(path, check_same_thread=False)
+        create_schema(conn)
+        return cls(conn, latency)
+
+    def table(self, name):
+        if name not in SCHEMA:
+            raise StandinError("42P01", f'relation "public.{name}" does not exist')
+        return _Query(self, name)
+
+    def rpc(self, function, params=None):
+        return _Rpc(self, function, params or {})
+
+    def columns(self, table):
+        if table not in self._columns:
+            self._columns[table] = [row[1] for row in self._conn.execute(f"pragma table_info({table})")]
+        return self._columns[table]
+
+    def _primary_key(self, table):
+        rows = sorted((row[5], row[1]) for row in self._conn.execute(f"pragma table_info({table})") if row[5])
+        return [name for _, name in rows]
+
+    def _respond(self, rows):
+        # Wie über HTTP: einmal JSON hin und zurück
+        payload = json.dumps(rows)
+        with self._lock:
+            self.requests += 1
+            self.bytes += len(payload)
+        if self.latency:
+            time.sleep(self.latency)
+        return _Response(json.loads(payload))
+
+    def _rows(self, cursor, table):
+        names = [column[0] for column in cursor.description]
+        booleans = BOOLEAN_COLUMNS.get(table, ())
+        rows = []
+        for values in cursor.fetchall():
+            row = dict(zip(names, values))
+            for column in booleans:
+                if row.get(column) is not None:
+                    row[column] = bool(row[column])
+            rows.append(row)
+        return rows
+
+    def _execute(self, query):
+        with self._lock:
+            if query._action == "select":
+                data = self._select(query)
+            else:
+                data = self._write(query)
+        return self._respond(data)
+
+    def _select(self, query):
+        base_columns = self.columns(query._table)
+        selected, embeds = [], []
+        for part in _split_top_level(query._columns.strip()):
+            match = re.fullmatch(r"(\w+)\((.*)\)", part, re.S)
+            if match:
+                embeds.append((match.group(1), _split_top_level(match.group(2))))
+            elif part == "*":
+                selected.extend(base_columns)
+            else:
+                selected.append(part.strip('"'))
+
+        columns = [f"b.{_quote(column)} as {_quote(column)}" for column in selected]
+        joins = []
+        for index, (embed, embed_columns) in enumerate(embeds):
+            alias = f"e{index}"
+            key = self._primary_key(embed)[0]
+            if "*" in embed_columns:
+                embed_columns = self.columns(embed)
+            joins.append(f" left join {embed} {alias} on {alias}.{_quote(key)} = b.{_quote(key)}")
+            columns.append(f"{alias}.{_quote(key)} as {_quote(embed + '.__key')}")
+            columns.extend(f"{alias}.{_quote(column)} as {_quote(embed + '.' + column.strip(chr(34)))}"
+                           for column in embed_columns)
+
+        sql = (f"select {', '.join(columns)} from {query._table} b{''.join(joins)}"
+               f"{query._where_sql('b')}{query._tail_sql('b')}")
+        cursor = self._conn.execute(sql, query._params)
+        names = [column[0] for column in cursor.description]
+        booleans = BOOLEAN_COLUMNS.get(query._table, ())
+        rows = []
+        for values in cursor.fetchall():
+            row = {}
+            for name, value in zip(names, values):
+                if "." in name:
+                    embed, column = name.split(".", 1)
+                    nested = row.setdefault(embed, {})
+                    if column in BOOLEAN_COLUMNS.get(embed, ()) and value is not None:
+                        value = bool(value)
+                    nested[column] = value
+                else:
+                    row[name] = bool(value) if name in booleans and value is not None else value
+            for embed, _ in embeds:
+                nested = row[embed]
+                row[embed] = None if nested.pop("__key") is None else nested
+            rows.append(row)
+        return rows
+
+    def _write(self, query):
+        table = query._table
+        if query._action == "delete":
+            cursor = self._conn.execute(f"delete from {table}{query._where_sql()} returning *", query._params)
+        elif query._action == "update":
+            assignments = ", ".join(f"{_quote(column)} = ?" for column in query._payload)
+            cursor = self._conn.execute(
+                f"update {table} set {assignments}{query._where_sql()} returning *",
+                [_sql_value(value) for value in query._payload.values()] + query._params,
+            )
+        else:
+            rows = query._payload if isinstance(query._payload, list) else [query._payload]
+            if not rows:
+                return []
+            result = []
+            for row in rows:
+                columns = list(row)
+                sql = (f"insert into {table} ({', '.join(_quote(column) for column in columns)}) "
+                       f"values ({', '.join('?' for _ in columns)})")
+                if query._action == "upsert":
+                    conflict = query._on_conflict.split(",") if query._on_conflict else self._primary_key(table)
+                    target = ", ".join(_quote(column) for column in conflict)
+                    updates = [column for column in columns if column not in conflict]
+                    if query._ignore_duplicates or not updates:
+                        sql += f" on conflict ({target}) do nothing"
+                    else:
+                        sql += (f" on conflict ({target}) do update set "
+                                + ", ".join(f"{_quote(column)} = excluded.{_quote(column)}" for column in updates))
+                try:
+                    cursor = self._conn.execute(sql + " returning *", [_sql_value(row[column]) for column in columns])
+                except sqlite3.IntegrityError as e:
+                    self._conn.rollback()
+                    raise StandinError("23505", str(e))
+                result.extend(self._rows(cursor, table))
+            self._conn.commit()
+            return result
+        rows = self._rows(cursor, table)
+        self._conn.commit()
+        return rows
+
+    def _call(self, function, params):
+        handler = _RPC_FUNCTIONS.get(function)
+        if handler is None:
+            raise StandinError("PGRST202", f"Could not find the function public.{function} in the schema cache")
+        with self._lock:
+            data = handler(self._conn, params)
+            self._conn.commit()
+        return self._respond(data)
+
+
+class _Rpc:
+    def __init__(self, client, function, params):
+        self._client = client
+        self._function = function
+        self._params = params
+
+    def execute(self):
+        return self._client._call(self._function, self._params)
+
+
+def _date_key(value):
+    return int(value.replace("-", "")) if value else None
+
+
+def _training_statistics(conn, params):
+    start_key = _date_key(params.get("p_season_start"))
+    per_day = conn.execute(
+        "select date_key, sum(win_cnt > 0) from fact_training_win where ? is null or date_key >= ? "
+        "group by date_key order by date_key desc",
+        (start_key, start_key),
+    ).fetchall()
+    victories = [count for _, count in per_day]
+    return [{
+        "total_trainings": len(per_day),
+        "total_victories": sum(victories),
+        "latest_participants": victories[0] * 2 if len(victories) > 0 else None,
+        "previous_participants": victories[1] * 2 if len(victories) > 1 else None,
+    }]
+
+
+def _weekly_donkey(conn, params):
+    rows = conn.execute(
+        "select coalesce(p.name, 'Unbekannt') as player_name, round(sum(f.amount_eur), 2) as total_amount, "
+        "count(*) as penalty_count from fact_penalty f left join dim_player p on p.player_key = f.player_key "
+        "where f.date_key between ? and ? group by 1 order by total_amount desc, player_name limit 1",
+        (_date_key(params["p_week_start"]), _date_key(params["p_week_end"])),
+    ).fetchall()
+    return [dict(zip(("player_name", "total_amount", "penalty_count"), row)) for row in rows]
+
+
+def _replace_training_day(conn, params):
+    date_key, entries = params["p_date_key"], params["p_entries"]
+    keys = [entry["player_key"] for entry in entries]
+    deleted = conn.execute(
+        f"delete from fact_training_win where date_key = ? and player_key not in ({', '.join('?' for _ in keys)})",
+        [date_key] + keys,
+    ).rowcount
+    upserted = 0
+    for entry in entries:
+        upserted += conn.execute(
+            "insert into fact_training_win as f (date_key, player_key, played_cnt, win_cnt) values (?, ?, ?, ?) "
+            "on conflict (date_key, player_key) do update set played_cnt = excluded.played_cnt, "
+            "win_cnt = excluded.win_cnt where f.played_cnt <> excluded.played_cnt or f.win_cnt <> excluded.win_cnt",
+            (date_key, entry["player_key"], entry.get("played_cnt") or 1, entry["win_cnt"]),
+        ).rowcount
+    return [{"deleted": deleted, "upserted": upserted}]
+
+
+_RPC_FUNCTIONS = {
+    "training_statistics": _training_statistics,
+    "weekly_donkey": _weekly_donkey,
+    "replace_training_day": _replace_training_day,
+}
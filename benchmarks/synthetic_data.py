@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Synthetische Vereinsdaten für Last-Benchmarks (reproduzierbar per Seed).
+
+Erzeugt N Saisons mit Spielern, Strafenkatalog, Strafen, Trainingssiegen,
+Tabellen-Snapshots, Spielen, Spielereignissen und Aufstellungen im Schema von
+supabase_Datenbankschema.md. Die Mengen pro Saison orientieren sich am
+heutigen Stand (TODAY); mit scale werden alle Faktentabellen vervielfacht.
+Der Kalender bleibt dabei gleich – bei 10× trainieren also zehnmal so viele
+Spieler pro Trainingstag, es gibt zehnmal so viele Strafen pro Woche, der
+Tabellen-Scraper läuft zehnmal so oft und es werden zehnmal so viele Spiele
+(z.B. weiterer Mannschaften) erfasst.
+
+Die Daten landen in einer SQLite-Datei für postgrest_standin.SqlitePostgrest
+und lassen sich von dort wie aus Supabase in die lokale Replik
+synchronisieren.
+
+Verwendung:
+- python benchmarks/synthetic_data.py --scale 10 --seasons 3 --output /tmp/viktoria_10x.sqlite3
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from date_keys import build_dim_date_rows  # noqa: E402
+from postgrest_standin import SCHEMA, _sql_value, create_schema  # noqa: E402
+from season_config import EXPECTED_GROUP_TEAMS, SEASON_GROUPS, TRAINING_SEASON_START, resolve_team_key  # noqa: E402
+
+VIKTORIA = "TuS Viktoria Buchholz"
+
+
+@dataclass(frozen=True)
+class Volume:
+    """Mengen pro Saison"""
+    squad: int                 # aktive Spieler, pro Saison wechseln ca. 20 %
+    training_participants: int  # Spieler pro Trainingstag (die Hälfte gewinnt)
+    penalties: int
+    standings_runs: int        # Scrape-Läufe des Tabellen-Updaters
+    matches: int
+    events_per_match: int
+    lineup_per_match: int
+
+
+# Heutiger Stand (Saison 25/26): Kader, zwei Trainings pro Woche, Strafenkatalog,
+# ein Tabellen-Scrape pro Spieltag plus Nachträge, Spielberichte von fussball.de
+TODAY = Volume(
+    squad=28,
+    training_participants=16,
+    penalties=350,
+    standings_runs=40,
+    matches=30,
+    events_per_match=16,
+    lineup_per_match=38,
+)
+
+TRAINING_WEEKDAYS = (1, 3)  # Dienstag, Donnerstag
+PENALTY_TYPES = [
+    ("Verspätung Training/Spiel (auf dem Platz) - ab 5 Min.", 5.0),
+    ("Verspätung Training/Spiel (auf dem Platz) - ab 30 Min.", 15.0),
+    ("Handynutzung nach der Besprechung", 5.0),
+    ("Beini in der Ecke", 1.0),
+    ("Falscher Einwurf", 1.0),
+    ("Stange umgeworfen", 0.5),
+    ("Gelbe Karte (Meckern)", 10.0),
+    ("Rote Karte (Alles außer Foulspiel)", 50.0),
+    ("Fehlendes Trikot", 5.0),
+    ("Training unentschuldigt verpasst", 15.0),
+    ("Kiste Bier (Geburtstag)", 15.0),
+    ("Ball über den Zaun", 1.0),
+]
+EVENT_TYPES = ["goal", "yellow_card", "substitution", "substitution", "yellow_card", "goal", "yellow_red_card"]
+FIRST_NAMES = ["Ben", "Luca", "Finn", "Jonas", "Max", "Paul", "Tim", "Leon", "Niklas", "Jan", "Tom", "Noah",
+               "Elias", "Felix", "Moritz", "David", "Lukas", "Marvin", "Kevin", "Dennis", "Mert", "Can", "Ali"]
+LAST_NAMES = ["Schmidt", "Müller", "Weber", "Wagner", "Becker", "Hoffmann", "Schulz", "Koch", "Richter",
+              "Klein", "Wolf", "Neumann", "Schwarz", "Zimmermann", "Krüger", "Hartmann", "Yilmaz", "Kaya"]
+
+
+def season_years(seasons, current=TRAINING_SEASON_START.year):
+    """Startjahre der letzten N Saisons, älteste zuerst"""
+    return list(range(current - seasons + 1, current + 1))
+
+
+def _season_code(year):
+    return f"{year % 100:02d}{(year + 1) % 100:02d}"
+
+
+def _player_name(index):
+    first = FIRST_NAMES[index % len(FIRST_NAMES)]
+    last = LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]
+    suffix = index // (len(FIRST_NAMES) * len(LAST_NAMES))
+    return f"{first} {last}" + (f" {suffix + 1}" if suffix else "")
+
+
+def _date_key(day):
+    return int(day.strftime('%Y%m%d'))
+
+
+def _match_id(rng):
+    return "".join(rng.choice("0123456789ABCDEFGHIJKLMNOPQRSTUV") for _ in range(32))
+
+
+def generate(seasons=1, scale=1, seed=26, until=None):
+    """
+    Synthetische Tabellen als {Tabelle: [Zeilen]}
+
+    Args:
+        seasons: Anzahl Saisons bis einschließlich der aktuellen
+        scale: Faktor auf die heutigen Mengen (TODAY)
+        seed: Zufallsstartwert, gleiche Parameter → gleiche Daten
+        until: letzter Tag mit Daten (Standard: heute), spätere Tage bleiben leer
+    """
+    rng = random.Random(seed)
+    until = until or date.today()
+    years = season_years(seasons)
+    volume = Volume(**{name: value * scale if name not in ("events_per_match", "lineup_per_match") else value
+                       for name, value in TODAY.__dict__.items()})
+    tables = {table: [] for table in SCHEMA}
+
+    first_day = date(years[0], 7, 1)
+    last_day = date(years[-1] + 1, 6, 30)
+    tables["dim_date"] = build_dim_date_rows(first_day, last_day)
+    tables["dim_penalty_type"] = [
+        {"penalty_type_key": key, "description": description, "default_amount_eur": amount}
+        for key, (description, amount) in enumerate(PENALTY_TYPES, start=1)
+    ]
+
+    # Kader: pro Saison scheidet ein Fünftel aus und wird durch neue Spieler ersetzt
+    players, squad = [], []
+    for year in years:
+        leaving = len(squad) // 5
+        for player in rng.sample(squad, leaving):
+            squad.remove(player)
+        while len(squad) < volume.squad:
+            key = len(players) + 1
+            birthday = date(rng.randrange(1990, 2007), rng.randrange(1, 13), rng.randrange(1, 29))
+            player = {
+                "player_key": key, "name": _player_name(key - 1), "birthday": birthday.isoformat(),
+                "join_date": date(year, 7, 1).isoformat(), "active_flag": True,
+                "created_at": f"{year}-07-01T12:00:00", "Rolle": "Trainer" if key % 40 == 1 else "Spieler",
+            }
+            players.append(player)
+            squad.append(player)
+        squad_keys = [player["player_key"] for player in squad]
+
+        season_start, season_end = date(year, 7, 1), min(date(year + 1, 6, 30), until)
+        days = [season_start + timedelta(days=offset) for offset in range((season_end - season_start).days + 1)]
+
+        # Trainingstage: zwei pro Woche, Sommer- und Winterpause ausgenommen
+        for day in days:
+            if day.weekday() not in TRAINING_WEEKDAYS or day.month == 6 or (day.month == 12 and day.day > 20):
+                continue
+            participants = rng.sample(squad_keys, min(volume.training_participants, len(squad_keys)))
+            winners = set(participants[:len(participants) // 2])
+            tables["fact_training_win"].extend(
+                {"date_key": _date_key(day), "player_key": key, "played_cnt": 1, "win_cnt": int(key in winners)}
+                for key in participants
+            )
+
+        # Strafen über die Saison verteilt
+        if days:
+            for _ in range(volume.penalties * len(days) // 365):
+                day = rng.choice(days)
+                type_key = rng.randrange(len(PENALTY_TYPES)) + 1
+                tables["fact_penalty"].append({
+                    "penalty_id": len(tables["fact_penalty"]) + 1,
+                    "date_key": _date_key(day), "player_key": rng.choice(squad_keys),
+                    "penalty_type_key": type_key, "amount_eur": PENALTY_TYPES[type_key - 1][1],
+                    "penalty_cnt": 1, "created_at": f"{day.isoformat()}T20:00:00", "source_penalty_id": None,
+                    "note": rng.choice(["", "", "", "Token-Schnell-Strafe", None]), "request_id": None,
+                })
+
+        _generate_matches(tables, rng, volume, year, days)
+
+    for player in players:
+        player["active_flag"] = player in squad
+    tables["dim_player"] = players
+    return tables
+
+
+def _generate_matches(tables, rng, volume, year, days):
+    season = _season_code(year)
+    teams = SEASON_GROUPS.get(season, EXPECTED_GROUP_TEAMS)
+    match_days = [day for day in days if day.weekday() == 6 and day.month not in (6, 7)]
+    if not match_days:
+        return
+
+    # Tabellen-Snapshots: jeder Scrape-Lauf speichert alle Teams der Gruppe
+    runs = max(1, volume.standings_runs * len(match_days) // 40)
+    strengths = {team: rng.random() for team in teams}
+    for run in range(runs):
+        played = min(1 + run * len(match_days) // runs, 2 * (len(teams) - 1))
+        scraped_at = datetime.combine(match_days[run * len(match_days) // runs], datetime.min.time(),
+                                      tzinfo=timezone.utc) + timedelta(hours=20, seconds=run)
+        ranking = sorted(teams, key=lambda team: strengths[team] + rng.random() * 0.3, reverse=True)
+        for position, team in enumerate(ranking, start=1):
+            wins = round(played * (1 - position / (len(teams) + 1)))
+            draws = min(played - wins, rng.randrange(4))
+            goals_for, goals_against = wins * 2 + draws, (played - wins) * 2
+            tables["team_standings"].append({
+                "standing_id": len(tables["team_standings"]) + 1, "team_name": team,
+                "team_key": resolve_team_key(team), "season": season, "match_day": played,
+                "position": position, "games_played": played, "wins": wins, "draws": draws,
+                "losses": played - wins - draws, "goals_for": goals_for, "goals_against": goals_against,
+                "goal_difference": goals_for - goals_against, "points": wins * 3 + draws,
+                "scraped_at": scraped_at.isoformat(),
+            })
+
+    # Spiele mit Ereignissen und Aufstellungen (Format wie scrape_match_reports.py)
+    opponents = [team for team in teams if team != VIKTORIA]
+    matches = max(1, volume.matches * len(match_days) // 40)
+    for number in range(matches):
+        match_id = _match_id(rng)
+        url = f"https://www.fussball.de/spiel/-/spiel/{match_id}#!/"
+        home, away = (VIKTORIA, opponents[number % len(opponents)])[::rng.choice((1, -1))]
+        score_home, score_away = rng.randrange(5), rng.randrange(4)
+        tables["matches"].append({
+            "match_id": match_id, "source_url": url, "competition": "Bezirksliga",
+            "season": f"{season[:2]}/{season[2:]}", "match_date": match_days[number % len(match_days)].isoformat(),
+            "home_team": home, "away_team": away, "score_home": score_home, "score_away": score_away,
+            "home_team_key": resolve_team_key(home), "away_team_key": resolve_team_key(away),
+        })
+        for minute in sorted(rng.randrange(1, 95) for _ in range(volume.events_per_match)):
+            event_type = rng.choice(EVENT_TYPES)
+            player = _player_name(rng.randrange(60))
+            tables["events"].append({
+                "match_id": match_id, "source_url": url, "minute": minute, "phase": "1H" if minute <= 45 else "2H",
+                "type": event_type, "team_side": rng.choice(("home", "away")), "player_primary": player,
+                "player_id": None, "player_in": player if event_type == "substitution" else None,
+                "player_id_in": None, "player_out": None, "player_id_out": None,
+                "score_home": None, "score_away": None, "detail": None, "raw": f"{minute}’ {event_type}",
+            })
+        for slot in range(volume.lineup_per_match):
+            side = "home" if slot % 2 == 0 else "away"
+            team = home if side == "home" else away
+            tables["lineups"].append({
+                "match_id": match_id, "source_url": url, "team_side": side, "team_name": team,
+                "team_key": resolve_team_key(team), "role": "start" if slot < 22 else "bench",
+                "number": slot // 2 + 1, "name": _player_name(rng.randrange(60)), "player_id": _match_id(rng),
+                "is_captain": slot in (0, 1), "is_goalkeeper": slot in (2, 3),
+            })
+
+
+def load_sqlite(tables, path=":memory:"):
+    """Schreibt generierte Tabellen in eine (neue) SQLite-Datenbank für den PostgREST-Stand-in."""
+    conn = sqlite3.connect(path, check_same_thread=False)
+    create_schema(conn)
+    for table, rows in tables.items():
+        if not rows:
+            continue
+        columns = list(rows[0])
+        conn.executemany(
+            f"insert into {table} ({', '.join(chr(34) + column + chr(34) for column in columns)}) "
+            f"values ({', '.join('?' for _ in columns)})",
+            ([_sql_value(row[column]) for column in columns] for row in rows),
+        )
+    conn.commit()
+    return conn
+
+
+def row_counts(tables):
+    return {table: len(rows) for table, rows in tables.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetische Vereinsdaten erzeugen")
+    parser.add_argument("--scale", type=int, default=1, help="Vielfaches der heutigen Datenmenge")
+    parser.add_argument("--seasons", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=26)
+    parser.add_argument("--output", required=True, help="Ziel-Datei (SQLite)")
+    args = parser.parse_args()
+
+    if os.path.exists(args.output):
+        raise SystemExit(f"❌ {args.output} existiert bereits")
+    tables = generate(args.seasons, args.scale, args.seed)
+    load_sqlite(tables, args.output).close()
+    for table, count in row_counts(tables).items():
+        print(f"{table:20} {count:>9}")
+
+
+if __name__ == "__main__":
+    main()
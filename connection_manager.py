@@ -0,0 +1,152 @@
+"""Verbindungsverwaltung mit Health-Probes, Backoff und Circuit Breaker.
+
+Zustände:
+    closed     Verbindung steht, Probes laufen regelmäßig
+    open       Backend gilt als ausgefallen; Aufrufer bekommen sofort None
+               (Fallback auf Replik/CSV) statt in Timeouts zu laufen
+    half_open  Backoff abgelaufen, genau ein Verbindungsversuch läuft
+
+Fehlgeschlagene Versuche verdoppeln die Wartezeit bis MAX_DELAY_SECONDS. Ein
+erfolgreicher Probe schließt den Kreis wieder, ohne dass der Prozess neu
+starten muss. Liefert connect() None, ist nichts konfiguriert (keine
+Zugangsdaten) – dann wird nicht erneut versucht.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+FAILURE_THRESHOLD = 2
+BASE_DELAY_SECONDS = 2.0
+MAX_DELAY_SECONDS = 300.0
+
+
+class ConnectionManager:
+    """Thread-sicherer Circuit Breaker um einen Client (z.B. supabase-py)."""
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        probe: Callable[[Any], Any],
+        failure_threshold: int = FAILURE_THRESHOLD,
+        base_delay: float = BASE_DELAY_SECONDS,
+        max_delay: float = MAX_DELAY_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._connect = connect
+        self._probe = probe
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._attempting = False
+        self.client: Any = None
+        self.state = CLOSED
+        self.configured = True
+        self.failures = 0
+        self.trips = 0
+        self.next_attempt = 0.0
+        self.last_error: Optional[str] = None
+        self.last_ok: Optional[float] = None
+
+    def retry_due(self) -> bool:
+        return self.configured and self.state != CLOSED and self._clock() >= self.next_attempt
+
+    def connect(self) -> Any:
+        """Client oder None. Baut neu auf, wenn kein Client besteht und der Backoff abgelaufen ist.
+
+        Läuft schon ein Versuch in einem anderen Thread, kommt sofort None zurück.
+        """
+        with self._lock:
+            if self.client is not None and self.state == CLOSED:
+                return self.client
+            if not self.configured or self._attempting:
+                return None
+            if self.state == OPEN:
+                if self._clock() < self.next_attempt:
+                    return None
+                self.state = HALF_OPEN
+            self._attempting = True
+
+        client = None
+        error = None
+        try:
+            client = self._connect()
+            if client is not None:
+                self._probe(client)
+        except Exception as e:
+            error = e
+
+        with self._lock:
+            self._attempting = False
+            if error is not None:
+                self._trip(error)
+                return None
+            if client is None:
+                self.configured = False
+                self.state = CLOSED
+                return None
+            self._close(client)
+            return client
+
+    def check(self) -> bool:
+        """Health-Probe der bestehenden Verbindung bzw. Wiederverbindung nach Ablauf des Backoffs."""
+        client = self.client
+        if client is None or self.state != CLOSED:
+            return self.connect() is not None
+        try:
+            self._probe(client)
+        except Exception as e:
+            self.record_failure(e)
+            return self.state == CLOSED
+        self.record_success()
+        return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.client is not None:
+                self._close(self.client)
+
+    def record_failure(self, error: Any) -> None:
+        """Fehlgeschlagene Abfrage/Probe; ab failure_threshold in Folge öffnet der Kreis."""
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)
+            if self.failures >= self.failure_threshold or self.state == HALF_OPEN:
+                self._trip(error)
+
+    def _trip(self, error: Any) -> None:
+        self.state = OPEN
+        self.client = None
+        self.last_error = str(error)
+        self.failures = max(self.failures, 1)
+        delay = min(self.base_delay * 2 ** self.trips, self.max_delay)
+        self.trips += 1
+        self.next_attempt = self._clock() + delay
+
+    def _close(self, client: Any) -> None:
+        self.client = client
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.last_ok = self._clock()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Zustand für UI und get_connection_info."""
+        with self._lock:
+            now = self._clock()
+            return {
+                "state": self.state if self.configured else "not_configured",
+                "connected": self.client is not None and self.state == CLOSED,
+                "consecutive_failures": self.failures,
+                "retry_in_seconds": round(max(self.next_attempt - now, 0), 1) if self.state == OPEN else None,
+                "last_ok_seconds_ago": round(now - self.last_ok, 1) if self.last_ok is not None else None,
+                "last_error": self.last_error,
+            }
@@ -0,0 +1,94 @@
+"""Kennzahlen für Dashboard-Seiten aus bereits geladenen Daten (ohne Datenbankzugriff).
+
+DatabaseHelper liefert die Rohdaten bzw. Aggregate; die Funktionen hier sind
+reine Berechnungen und damit auch ohne Verbindung testbar.
+"""
+
+from datetime import date
+
+import pandas as pd
+
+
+def build_training_statistics(total_trainings, total_victories, latest_participants=None, previous_participants=None):
+    """Dashboard-Kennzahlen aus den Aggregaten (None = Training existiert nicht)."""
+    if not total_trainings:
+        return {
+            'total_trainings': 0,
+            'total_victories': 0,
+            'latest_training_participants': 0,
+            'training_delta': 0,
+            'training_delta_text': "Keine Daten"
+        }
+
+    latest_training_participants = latest_participants or 0
+    training_delta = 0
+    if previous_participants is None:
+        training_delta_text = "Erstes Training"
+    else:
+        training_delta = latest_training_participants - previous_participants
+        if training_delta > 0:
+            training_delta_text = f"+ {training_delta}"
+        elif training_delta < 0:
+            training_delta_text = f"{training_delta}"
+        else:
+            training_delta_text = "±0"
+
+    return {
+        'total_trainings': int(total_trainings),
+        'total_victories': int(total_victories),
+        'latest_training_participants': latest_training_participants,
+        'training_delta': training_delta,
+        'training_delta_text': training_delta_text
+    }
+
+
+WEEKLY_DONKEY_COLUMNS = ['iso_year', 'iso_week', 'week_start', 'Spieler', 'total_amount', 'count']
+
+
+def compute_weekly_donkeys(df):
+    """
+    Esel jeder ISO-Kalenderwoche in einem Durchlauf (höchste Strafen-Summe, bei Gleichstand alphabetisch)
+
+    Gruppiert nach ISO-Jahr und ISO-Woche, damit der Jahreswechsel (auch 53-Wochen-Jahre
+    wie 2026) korrekt ist. Ergebnis: eine Zeile pro Woche, neueste Woche zuerst.
+    """
+    if df is None or len(df) == 0:
+        return pd.DataFrame(columns=WEEKLY_DONKEY_COLUMNS)
+
+    dates = pd.to_datetime(df['Datum'], errors='coerce')
+    valid = dates.notna()
+    iso = dates[valid].dt.isocalendar()
+    penalties = pd.DataFrame({
+        'iso_year': iso['year'].astype(int),
+        'iso_week': iso['week'].astype(int),
+        'Spieler': df.loc[valid, 'Spieler'],
+        'Betrag': pd.to_numeric(df.loc[valid, 'Betrag'], errors='coerce').fillna(0.0),
+    })
+    if penalties.empty:
+        return pd.DataFrame(columns=WEEKLY_DONKEY_COLUMNS)
+
+    totals = penalties.groupby(['iso_year', 'iso_week', 'Spieler'], sort=False)['Betrag'].agg(
+        total_amount='sum', count='count'
+    ).reset_index()
+    totals['total_amount'] = totals['total_amount'].round(2)
+
+    # Pro Woche die erste Zeile nach (Summe absteigend, Name aufsteigend)
+    totals = totals.sort_values(
+        ['iso_year', 'iso_week', 'total_amount', 'Spieler'], ascending=[False, False, False, True]
+    )
+    donkeys = totals.drop_duplicates(['iso_year', 'iso_week']).reset_index(drop=True)
+    donkeys['count'] = donkeys['count'].astype(int)
+    donkeys.insert(2, 'week_start', [
+        date.fromisocalendar(year, week, 1) for year, week in zip(donkeys['iso_year'], donkeys['iso_week'])
+    ])
+    return donkeys[WEEKLY_DONKEY_COLUMNS]
+
+
+def get_week_donkey(weekly_donkeys, week_start):
+    """Esel der Woche, die am Montag week_start beginnt, als (Name, Betrag, Anzahl)"""
+    iso_year, iso_week, _ = week_start.isocalendar()
+    match = weekly_donkeys[(weekly_donkeys['iso_year'] == iso_year) & (weekly_donkeys['iso_week'] == iso_week)]
+    if match.empty:
+        return None, 0, 0
+    top = match.iloc[0]
+    return top['Spieler'], float(top['total_amount']), int(top['count'])
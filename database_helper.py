@@ -1,8 +1,26 @@
+import importlib.util
+import math
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import pandas as pd
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from timezone_helper import get_german_now, convert_to_german_tz
-from season_config import CURRENT_STANDINGS_SEASON, TRAINING_SEASON_START
+from season_config import CURRENT_STANDINGS_SEASON, TRAINING_SEASON_START, VIKTORIA_TEAM_KEY, resolve_team_key, season_date_range
+from query_cache import QueryCache
+from query_decorators import cached_query, instrumented, invalidates, reports_health
+from query_metrics import JsonLogSink, QueryMetrics, RingBufferSink
+from connection_manager import ConnectionManager
+from db_errors import is_connection_error, is_missing_column, is_missing_request_id
+from date_keys import build_dim_date_row, build_dim_date_rows, date_key_partitions, to_date_key
+from postgrest_rows import flatten_rows, keyset_condition
+from dashboard_stats import build_training_statistics, compute_weekly_donkeys, get_week_donkey
+from local_replica import PENALTY_TABLES, TRAINING_TABLES, LocalReplica
+from pg_backend import PostgresBackend, get_database_url, postgres_available
+from write_journal import WriteJournal
+from analytics_reader import ANALYTICS_QUERIES, AnalyticsReader, arrow_available
+from streamlit_helper import get_secret, get_streamlit
 
 
 
@@ -15,22 +33,6 @@ def filter_training_victories_for_season(df, season_start=TRAINING_SEASON_START)
     result = result.dropna(subset=['Datum'])
     return result[result['Datum'] >= pd.Timestamp(season_start)]
 
-# Try to import streamlit (optional)
-try:
-    import streamlit as st
-    STREAMLIT_AVAILABLE = True
-except ImportError:
-    STREAMLIT_AVAILABLE = False
-    # Mock streamlit.secrets für Nicht-Streamlit-Umgebungen
-    class MockSecrets:
-        def get(self, key, default=None):
-            return default
-    
-    class MockStreamlit:
-        secrets = MockSecrets()
-    
-    st = MockStreamlit()
-
 # Try to load .env file if available
 try:
     from dotenv import load_dotenv
@@ -39,56 +41,732 @@ try:
 except ImportError:
     DOTENV_AVAILABLE = False
 
-try:
-    from supabase import create_client, Client
-    SUPABASE_AVAILABLE = True
-except ImportError:
-    SUPABASE_AVAILABLE = False
+# Streamlit und Supabase werden erst bei Bedarf importiert, damit
+# Automatisierungs-Skripte schnell starten.
+SUPABASE_AVAILABLE = importlib.util.find_spec("supabase") is not None
+
+# Cache-Laufzeiten in Sekunden. Schreibende Methoden invalidieren sofort,
+# die TTL begrenzt nur Änderungen aus anderen Prozessen (Cronjobs, zweite App-Instanz).
+CACHE_TTL_PLAYERS = 600
+CACHE_TTL_PENALTIES = 120
+CACHE_TTL_TRAINING = 120
+CACHE_TTL_STANDINGS = 300
+CACHE_TTL_STANDINGS_AGE = 60
+# Team-Key-Spalten aus supabase_team_keys.sql: (Tabelle, Namensspalte, Key-Spalte)
+TEAM_KEY_COLUMNS = (
+    ('team_standings', 'team_name', 'team_key'),
+    ('matches', 'home_team', 'home_team_key'),
+    ('matches', 'away_team', 'away_team_key'),
+    ('lineups', 'team_name', 'team_key'),
+)
+# Dimensions-Maps (Name → Key) werden so lange ohne Rückfrage verwendet
+DIMENSION_MAP_TTL = 600
+# IDs pro in_-Filter beim Massenlöschen (begrenzt die URL-Länge)
+DELETE_CHUNK_SIZE = 200
+# Seitengröße für Keyset-Pagination; darf das PostgREST-Limit (max-rows, Supabase: 1000) nicht überschreiten
+PAGE_SIZE = 1000
+READ_MAX_WORKERS = 4
+# Parallele Seitenabfragen über db.gather()
+GATHER_MAX_WORKERS = 8
+GATHER_TIMEOUT_SECONDS = 10
+
+# Timeout pro PostgREST-Request; Health-Probe alle HEALTH_CHECK_INTERVAL Sekunden
+# (bei offenem Circuit Breaker nach Ablauf des Backoffs, siehe connection_manager.py)
+DB_REQUEST_TIMEOUT = int(os.getenv("DB_REQUEST_TIMEOUT", "10"))
+HEALTH_CHECK_INTERVAL = 30
+
+# Zugriffsweg: "postgrest" (supabase-py über HTTPS) oder "postgres" (pg_backend.py, psycopg-Pool)
+DB_BACKEND = os.getenv("DB_BACKEND", "postgrest").lower()
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "4"))
+DB_PREPARE = os.getenv("DB_PREPARE", "1") != "0"
+
+# Lokale SQLite-Replik (local_replica.py) für Lesezugriffe und Offline-Betrieb, leer = deaktiviert
+LOCAL_REPLICA_PATH = os.getenv("LOCAL_REPLICA_PATH", "")
+
+# Write-Behind-Journal (write_journal.py) für Strafen und Trainingstage, leer = direkt schreiben.
+# Opt-in: für duplikatfreie Wiederholungen sollte supabase_write_journal.sql eingespielt sein
+WRITE_JOURNAL_PATH = os.getenv("WRITE_JOURNAL_PATH", "")
+# Spätestens so oft wird das Journal geleert; neue Einträge stoßen den Flush sofort an
+JOURNAL_FLUSH_INTERVAL = 5
+JOURNAL_BATCH_SIZE = 200
+
+# Abfrage-Metriken (query_metrics.py): Ringpuffer für die Diagnose-Seite, optional JSON-Log (leer = aus)
+QUERY_METRICS_LOG = os.getenv("QUERY_METRICS_LOG", "")
+QUERY_METRICS_BUFFER = 500
+
+# Replik-Tabellen der spaltenweisen Analyse-Abfragen (analytics_reader.py), sonst nur die Tabelle selbst
+ANALYTICS_TABLES = {'penalties': PENALTY_TABLES, 'training_victories': TRAINING_TABLES}
+
+# Spalten von get_penalties und ihre Select-Ausdrücke auf fact_penalty
+PENALTY_COLUMNS = ('penalty_id', 'Datum', 'Spieler', 'Strafe', 'Betrag', 'Zusatzinfo')
+PENALTY_SELECT = {
+    'Datum': 'date_key',
+    'Spieler': 'dim_player(name)',
+    'Strafe': 'dim_penalty_type(description)',
+    'Betrag': 'amount_eur',
+    'Zusatzinfo': 'note',
+}
+PENALTY_FIELDS = {
+    'penalty_id': ('penalty_id', 'int', 0),
+    'Datum': ('date_key', 'date_key', None),
+    'Spieler': ('dim_player.name', 'str', 'Unbekannt'),
+    'Strafe': ('dim_penalty_type.description', 'str', 'Unbekannte Strafe'),
+    'Betrag': ('amount_eur', 'float', 0.0),
+    'Zusatzinfo': ('note', 'str', ''),
+}
+TRAINING_FIELDS = {
+    'Spieler': ('dim_player.name', 'str', 'Unbekannt'),
+    'Datum': ('date_key', 'date_key', None),
+    'Sieg': ('win_cnt', 'flag', False),
+}
+
+
+class QueryTimeout(TimeoutError):
+    """Abfrage hat das Zeitbudget von db.gather() überschritten."""
+
+
+class QueryResult:
+    """Ergebnis einer Abfrage aus db.gather(): get() liefert den Wert oder wirft den Fehler."""
+
+    def __init__(self, value=None, error=None, seconds=None):
+        self.value = value
+        self.error = error
+        self.seconds = seconds
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def get(self):
+        if self.error is not None:
+            raise self.error
+        return self.value
+
 
 class DatabaseHelper:
     def __init__(self):
         self.supabase = None
         self.connected = False
         self._connection_attempted = False
+        self.connection = ConnectionManager(self._create_client, self._probe)
+        self._health_thread = None
+        self.cache = QueryCache()
+        # Pro Thread: hat die laufende Abfrage einen Fallback/Fehlerpfad genommen? (siehe cached_query)
+        self._query_state = threading.local()
+        self.metrics = QueryMetrics([RingBufferSink(QUERY_METRICS_BUFFER)])
+        if QUERY_METRICS_LOG:
+            self.metrics.add_sink(JsonLogSink(QUERY_METRICS_LOG))
+        self._dim_lock = threading.Lock()
+        self._player_keys = {}
+        self._penalty_type_keys = {}
+        self._date_keys = set()
+        self._season_dates_ready = False
+        self._dim_loaded_at = None
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self.replica = None
+        self._replica_path = LOCAL_REPLICA_PATH
+        self.pg = None
+        self._pg_enabled = DB_BACKEND == "postgres"
+        self.journal = None
+        self._journal_path = WRITE_JOURNAL_PATH
+        self._idempotent_writes = True
+        self._team_key_columns = True
+        self._journal_wakeup = threading.Event()
+        self._journal_thread = None
+        self._flush_lock = threading.Lock()
     
     def _connect(self):
-        """Verbindung zu Supabase herstellen"""
-        if self._connection_attempted:
-            return
-            
+        """Verbindung zu Supabase herstellen (erster Versuch; danach übernimmt der Health-Check)"""
         self._connection_attempted = True
-        
+        self.connection.connect()
+        self._sync_connection()
+        if self.connection.configured:
+            self._start_health_checks()
+    
+    @staticmethod
+    def _create_client():
+        """supabase-py-Client oder None, wenn Paket oder Zugangsdaten fehlen"""
         if not SUPABASE_AVAILABLE:
-            return
-            
-        try:
-            # Umgebungsvariablen laden (mehrere Quellen)
-            supabase_url = (
-                os.getenv("SUPABASE_URL") or 
-                st.secrets.get("SUPABASE_URL") or
-                st.secrets.get("supabase", {}).get("SUPABASE_URL")
-            )
-            supabase_key = (
-                os.getenv("SUPABASE_ANON_KEY") or 
-                st.secrets.get("SUPABASE_ANON_KEY") or
-                st.secrets.get("supabase", {}).get("SUPABASE_ANON_KEY")
-            )
+            return None
+        
+        # Umgebungsvariablen laden (mehrere Quellen)
+        supabase_url = get_secret("SUPABASE_URL")
+        supabase_key = get_secret("SUPABASE_ANON_KEY")
+        
+        if not supabase_url or not supabase_key:
+            return None
+        
+        # Supabase Client erstellen; der Timeout verhindert Hänger bei totem Backend
+        from supabase import ClientOptions, create_client
+        return create_client(supabase_url, supabase_key,
+                             options=ClientOptions(postgrest_client_timeout=DB_REQUEST_TIMEOUT))
+    
+    @staticmethod
+    def _probe(client):
+        """Health-Probe: kleinste mögliche Abfrage, wirft bei Netzwerk- oder Serverfehlern"""
+        client.table('dim_player').select('player_key').limit(1).execute()
+    
+    def _sync_connection(self):
+        """Übernimmt Client und Status des ConnectionManagers"""
+        client = self.connection.client
+        self.supabase = client
+        self.connected = client is not None
+    
+    def _start_health_checks(self):
+        with self._executor_lock:
+            if self._health_thread is None:
+                self._health_thread = threading.Thread(target=self._health_loop, name='db-health', daemon=True)
+                self._health_thread.start()
+    
+    def _health_loop(self):
+        while True:
+            retry_in = self.connection.get_status()['retry_in_seconds']
+            # retry_in == 0.0 heißt "Backoff abgelaufen": sofort prüfen, nicht erst nach dem Intervall
+            time.sleep(max(HEALTH_CHECK_INTERVAL if retry_in is None else retry_in, 1))
+            try:
+                self.check_connection()
+            except Exception as e:
+                print(f"Fehler beim Health-Check der Datenbank: {e}")
+    
+    def check_connection(self):
+        """
+        Health-Probe bzw. Wiederverbindung (Circuit Breaker), auch manuell aus der UI
+        
+        Returns:
+            bool: True, wenn die Datenbank erreichbar ist
+        """
+        was_connected = self.connected
+        ok = self.connection.check()
+        self._sync_connection()
+        if ok and not was_connected:
+            # Während des Ausfalls kann sich die Datenbank geändert haben
+            self.cache.clear()
+            self._dim_loaded_at = None
+            # Während des Ausfalls gesammelte Journal-Einträge sofort schreiben
+            self._journal_wakeup.set()
+            print("Datenbankverbindung wiederhergestellt")
+        return ok
+    
+    def get_connection_health(self):
+        """Zustand des Circuit Breakers (closed/open/half_open/not_configured) für die UI"""
+        return self.connection.get_status()
+    
+    def _ensure_connected(self):
+        """Stelle sicher, dass eine Verbindung besteht; Wiederverbindung läuft im Health-Check"""
+        if not self._connection_attempted:
+            self._connect()
+    
+    def gather(self, calls, timeout=GATHER_TIMEOUT_SECONDS):
+        """
+        Führt unabhängige Abfragen parallel aus
+        
+        Die Wartezeit entspricht der langsamsten Abfrage statt der Summe. Abfragen,
+        die das gemeinsame Zeitbudget überschreiten, liefern einen QueryTimeout.
+        
+        Args:
+            calls: dict Name → Funktion ohne Argumente (z.B. db.get_birthdays)
+            timeout: Zeitbudget in Sekunden für alle Abfragen zusammen
             
-            if not supabase_url or not supabase_key:
-                return
+        Returns:
+            dict: Name → QueryResult
+        """
+        # Verbindung einmal im aufrufenden Thread aufbauen statt parallel in jedem Worker
+        self._ensure_connected()
+        executor = self._get_executor()
+        
+        def timed(func):
+            started = time.perf_counter()
+            value = func()
+            return value, time.perf_counter() - started
+        
+        futures = {name: executor.submit(timed, func) for name, func in calls.items()}
+        deadline = time.monotonic() + timeout
+        results = {}
+        for name, future in futures.items():
+            try:
+                value, seconds = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                results[name] = QueryResult(value=value, seconds=seconds)
+            except FutureTimeoutError:
+                results[name] = QueryResult(error=QueryTimeout(f"Abfrage '{name}' nach {timeout}s abgebrochen"))
+            except Exception as e:
+                results[name] = QueryResult(error=e)
+        return results
+    
+    def _get_executor(self):
+        # Langlebiger Pool; bei Timeout laufende Abfragen werden nicht abgebrochen, blockieren die Seite aber nicht
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=GATHER_MAX_WORKERS, thread_name_prefix='db-gather')
+        return self._executor
+    
+    def iter_table_rows(self, table, columns, key_columns, filters=None, descending=False, page_size=PAGE_SIZE):
+        """
+        Liest alle Zeilen einer Tabelle seitenweise (Generator)
+        
+        Die Seiten werden per Keyset auf dem Primärschlüssel geholt statt mit
+        range-Offsets, damit große Tabellen vollständig und stabil gelesen werden.
+        
+        Args:
+            table: Tabellenname
+            columns: Select-String, muss die key_columns enthalten
+            key_columns: Spalten des Primärschlüssels, z.B. ('date_key', 'player_key');
+                leer für Tabellen ohne Schlüssel (dann range-Offsets)
+            filters: optionale Funktion query -> query für zusätzliche Filter
+            descending: absteigend nach Schlüssel lesen
+        """
+        key_columns = tuple(key_columns or ())
+        last_values = None
+        offset = 0
+        while True:
+            query = self.supabase.table(table).select(columns)
+            if filters is not None:
+                query = filters(query)
+            if not key_columns:
+                batch = query.range(offset, offset + page_size - 1).execute().data or []
+                yield from batch
+                if len(batch) < page_size:
+                    return
+                offset += page_size
+                continue
+            if last_values is not None:
+                if len(key_columns) > 1:
+                    query = query.or_(keyset_condition(key_columns, last_values, descending))
+                elif descending:
+                    query = query.lt(key_columns[0], last_values[0])
+                else:
+                    query = query.gt(key_columns[0], last_values[0])
+            for column in key_columns:
+                query = query.order(column, desc=descending)
+            batch = query.limit(page_size).execute().data or []
             
-            # Supabase Client erstellen
-            self.supabase: Client = create_client(supabase_url, supabase_key)
-            self.connected = True
+            yield from batch
             
+            # Weniger als page_size zurückbekommen -> letzte Seite
+            if len(batch) < page_size:
+                return
+            last_values = tuple(batch[-1][column] for column in key_columns)
+    
+    @instrumented
+    @reports_health
+    def read_table(self, table, columns, key_columns, filters=None, descending=False, partitions=None):
+        """
+        Liest alle Zeilen einer Tabelle als Liste
+        
+        Mit partitions (Liste disjunkter Filterfunktionen, z.B. date_key_partitions)
+        werden die Bereiche parallel gelesen und in Partitionsreihenfolge zusammengefügt.
+        """
+        if not partitions or len(partitions) == 1:
+            combined = filters
+            if partitions:
+                combined = self._combine_filters(filters, partitions[0])
+            return list(self.iter_table_rows(table, columns, key_columns, combined, descending))
+        
+        def read_partition(partition):
+            return list(self.iter_table_rows(
+                table, columns, key_columns, self._combine_filters(filters, partition), descending
+            ))
+        
+        with ThreadPoolExecutor(max_workers=min(READ_MAX_WORKERS, len(partitions))) as executor:
+            results = list(executor.map(read_partition, partitions))
+        return [row for rows in results for row in rows]
+    
+    def _get_replica(self):
+        """Öffnet die lokale Replik beim ersten Zugriff (None, wenn deaktiviert)"""
+        if self.replica is None and self._replica_path:
+            with self._executor_lock:
+                if self.replica is None:
+                    try:
+                        self.replica = LocalReplica(self._replica_path)
+                    except Exception as e:
+                        print(f"Lokale Replik nicht verfügbar: {e}")
+                        self._replica_path = ""
+        return self.replica
+    
+    def _replica_changed_since(self, tag, watermark):
+        """Schreibvorgang ab diesem Wasserstand (z.B. nachgetragener Trainingstag): Bereich in der Replik neu laden"""
+        if self.replica is not None:
+            self.replica.mark_stale(tag, since=watermark)
+    
+    def _mark_uncacheable(self):
+        """Ergebnis der laufenden Abfrage stammt aus Fallback oder Fehlerpfad → nicht cachen"""
+        self._query_state.uncacheable = True
+    
+    def _get_pg(self):
+        """Postgres-Backend, wenn per DB_BACKEND=postgres gewählt und verfügbar, sonst None"""
+        if self.pg is None and self._pg_enabled:
+            with self._executor_lock:
+                if self.pg is None and self._pg_enabled:
+                    database_url = get_database_url()
+                    try:
+                        if not postgres_available() or not database_url:
+                            raise RuntimeError("psycopg_pool oder SUPABASE_DB_URL fehlt")
+                        self.pg = PostgresBackend(database_url, max_size=DB_POOL_MAX_SIZE, prepare=DB_PREPARE)
+                    except Exception as e:
+                        print(f"Postgres-Backend nicht verfügbar, nutze PostgREST: {e}")
+                        self._pg_enabled = False
+        return self.pg
+    
+    def _replica_for(self, tables, sync=True):
+        """
+        Lokale Replik für diese Tabellen oder None
+        
+        Fällige Tabellen werden vorher inkrementell nachgezogen. Schlägt das fehl
+        (offline), wird der letzte synchronisierte Stand verwendet.
+        """
+        replica = self._get_replica()
+        if replica is None:
+            return None
+        if sync and self.connected:
+            try:
+                replica.sync(self.read_table, tables)
+            except Exception as e:
+                print(f"Sync der lokalen Replik fehlgeschlagen, nutze letzten Stand: {e}")
+        return replica if replica.is_synced(tables) else None
+    
+    def _analytics_reader(self, tables):
+        """Spaltenweiser Lesepfad (Arrow) über die Replik oder das Postgres-Backend, sonst None (JSON-Weg)"""
+        if not arrow_available():
+            return None
+        replica = self._replica_for(tables)
+        pg = self._get_pg() if replica is None else None
+        if replica is None and pg is None:
+            return None
+        return AnalyticsReader(pg=pg, replica=replica)
+    
+    @instrumented
+    def read_analytics(self, name, start=None, end=None, arrow_dtypes=False):
+        """
+        Große Tabelle (ANALYTICS_QUERIES: penalties, training_victories, events, lineups) als DataFrame
+        
+        Liest spaltenweise per Arrow statt über JSON. None, wenn weder Replik noch
+        Postgres-Backend (oder pyarrow) verfügbar sind.
+        """
+        self._ensure_connected()
+        reader = self._analytics_reader(ANALYTICS_TABLES.get(name, (ANALYTICS_QUERIES[name].table,)))
+        if reader is None:
+            return None
+        return reader.read_frame(
+            name,
+            to_date_key(start) if start is not None else None,
+            to_date_key(end) if end is not None else None,
+            arrow_dtypes=arrow_dtypes,
+        )
+    
+    @instrumented
+    def sync_replica(self, force=False):
+        """Zieht alle Tabellen der lokalen Replik nach (z.B. per Scheduler), liefert geladene Zeilen pro Tabelle"""
+        self._ensure_connected()
+        replica = self._get_replica()
+        if replica is None or not self.connected:
+            return {}
+        return replica.sync(self.read_table, force=force)
+    
+    def _get_journal(self):
+        """Write-Journal, auch während eines Ausfalls (None = direkt schreiben); startet den Hintergrund-Flush"""
+        self._ensure_connected()
+        # Ohne konfigurierte Datenbank käme das Journal nie an, dann bleibt es beim CSV-Fallback
+        if not self._journal_path or not self.connection.configured:
+            return None
+        if self.journal is None:
+            with self._executor_lock:
+                if self.journal is None:
+                    try:
+                        self.journal = WriteJournal(self._journal_path)
+                    except Exception as e:
+                        print(f"Write-Journal nicht verfügbar, schreibe direkt: {e}")
+                        self._journal_path = ""
+                        return None
+                    self._journal_thread = threading.Thread(
+                        target=self._journal_loop, name='db-write-behind', daemon=True
+                    )
+                    self._journal_thread.start()
+        return self.journal
+    
+    def _journal_loop(self):
+        while True:
+            self._journal_wakeup.wait(JOURNAL_FLUSH_INTERVAL)
+            self._journal_wakeup.clear()
+            try:
+                self.flush_journal()
+            except Exception as e:
+                print(f"Fehler beim Leeren des Write-Journals: {e}")
+    
+    def enqueue_penalty(self, penalty_data):
+        """
+        Strafe sofort lokal bestätigen und im Hintergrund speichern
+        
+        Returns:
+            tuple: (Erfolg, Nachricht); ohne Journal wird direkt gespeichert
+        """
+        problem, _ = self._validate_penalty_record(penalty_data)
+        if problem:
+            return False, f"❌ {problem}"
+        
+        journal = self._get_journal()
+        if journal is None:
+            if self.add_penalty(penalty_data):
+                return True, "💾 Strafe wurde in der Datenbank gespeichert!"
+            return False, "❌ Fehler beim Speichern in der Datenbank!"
+        
+        journal.append('penalty', penalty_data)
+        self._journal_wakeup.set()
+        return True, "💾 Strafe gespeichert, wird mit der Datenbank synchronisiert"
+    
+    def enqueue_training_day(self, datum, spieler_mit_sieg, alle_spieler):
+        """Trainingstag sofort lokal bestätigen und im Hintergrund speichern (wie add_training_day_entries)"""
+        journal = self._get_journal()
+        if journal is None:
+            return self.add_training_day_entries(datum, spieler_mit_sieg, alle_spieler)
+        
+        datum = datum.isoformat() if isinstance(datum, date) else datum
+        # Ein älterer, noch offener Eintrag für denselben Tag würde sonst danach geschrieben
+        journal.supersede('training_day', lambda payload: payload['datum'] == datum)
+        journal.append('training_day', {
+            'datum': datum,
+            'spieler_mit_sieg': list(spieler_mit_sieg),
+            'alle_spieler': list(alle_spieler),
+        })
+        self._journal_wakeup.set()
+        return True, f"✅ Trainingstag {datum} gespeichert, wird mit der Datenbank synchronisiert"
+    
+    @instrumented
+    def flush_journal(self):
+        """
+        Schreibt fällige Journal-Einträge in Reihenfolge nach Supabase
+        
+        Strafen gehen gesammelt mit ihrer request_id (idempotent) hinaus, Trainingstage
+        einzeln. Netzwerkfehler → Wiederholung mit Backoff (ohne Obergrenze), dauerhafte
+        Fehler → aufgegeben; lehnt die Datenbank einen Stapel ab, wird er einzeln
+        wiederholt, damit nur die betroffene Strafe aufgegeben wird.
+        
+        Returns:
+            dict: Anzahl gespeicherter, zurückgestellter und aufgegebener Einträge
+        """
+        result = {'saved': 0, 'retry': 0, 'failed': 0}
+        journal = self.journal
+        if journal is None:
+            return result
+        
+        # Offline nichts anfassen: _save_penalties würde sonst in die CSV-Dateien schreiben
+        self._ensure_connected()
+        if not self.connected:
+            return result
+        
+        with self._flush_lock:
+            entries = journal.ready()
+            penalties = [entry for entry in entries if entry.kind == 'penalty'][:JOURNAL_BATCH_SIZE]
+            if penalties:
+                self._flush_penalties(journal, penalties, result)
+            
+            for entry in entries:
+                if entry.kind != 'training_day':
+                    continue
+                payload = entry.payload
+                try:
+                    ok, message = self._save_training_day(
+                        payload['datum'], payload['spieler_mit_sieg'], payload['alle_spieler']
+                    )
+                except Exception as e:
+                    if is_connection_error(e):
+                        journal.retry([entry.id], str(e))
+                        result['retry'] += 1
+                    else:
+                        journal.fail([entry.id], f"❌ Fehler: {e}")
+                        result['failed'] += 1
+                    continue
+                if ok:
+                    self.cache.invalidate("training")
+                    journal.complete([entry.id])
+                    result['saved'] += 1
+                else:
+                    # Ungültiges Datum, keine gültigen Spieler: wird auch später nicht gelingen
+                    journal.fail([entry.id], message)
+                    result['failed'] += 1
+        
+        return result
+    
+    def _flush_penalties(self, journal, penalties, result):
+        records = [dict(entry.payload, request_id=entry.id) for entry in penalties]
+        try:
+            _, problems = self._save_penalties(records)
         except Exception as e:
-            self.connected = False
+            if is_connection_error(e):
+                journal.retry([entry.id for entry in penalties], str(e))
+                result['retry'] += len(penalties)
+            elif len(penalties) > 1:
+                for entry in penalties:
+                    self._flush_penalties(journal, [entry], result)
+            else:
+                journal.fail([penalties[0].id], str(e))
+                result['failed'] += 1
+            return
+        self.cache.invalidate("penalties", "penalty_types")
+        if self.replica is not None:
+            self.replica.mark_stale("penalties", "penalty_types")
+        failed = {penalties[index - 1].id: problem for index, problem in problems.items()}
+        for entry_id, problem in failed.items():
+            journal.fail([entry_id], problem)
+        journal.complete(entry.id for entry in penalties if entry.id not in failed)
+        result['saved'] += len(penalties) - len(failed)
+        result['failed'] += len(failed)
     
-    def _ensure_connected(self):
-        """Stelle sicher, dass eine Verbindung besteht"""
-        if not self._connection_attempted:
-            self._connect()
+    def get_journal_status(self):
+        """Offene und aufgegebene Einträge des Write-Journals (None, wenn nicht aktiv)"""
+        return self.journal.get_status() if self.journal is not None else None
+    
+    def get_failed_writes(self):
+        """Aufgegebene Journal-Einträge, die der Benutzer noch nicht gesehen hat (z.B. für die Sidebar)"""
+        # Lädt das Journal nach einem Neustart auch ohne neuen Eintrag (und leert offene Einträge)
+        self._ensure_connected()
+        journal = self._get_journal()
+        return journal.dead_entries() if journal is not None else []
+    
+    def acknowledge_failed_writes(self, ids):
+        """Aufgegebene Journal-Einträge als gesehen markieren"""
+        if self.journal is not None:
+            self.journal.acknowledge(ids)
+    
+    @instrumented
+    @reports_health
+    def call_rpc(self, function, params=None):
+        """Ruft eine Postgres-Funktion (supabase_statistics_functions.sql) auf und liefert deren Zeilen."""
+        response = self.supabase.rpc(function, params or {}).execute()
+        data = response.data
+        if data is None:
+            return []
+        return data if isinstance(data, list) else [data]
+
+    @staticmethod
+    def _combine_filters(filters, partition):
+        if filters is None:
+            return partition
+        return lambda query: partition(filters(query))
+    
+    def _load_dimension_maps(self):
+        """Lädt Name → player_key, Beschreibung → penalty_type_key und bekannte date_keys (je eine Seite pro 1000 Zeilen)"""
+        with self._dim_lock:
+            if self._dim_loaded_at is not None and time.monotonic() - self._dim_loaded_at < DIMENSION_MAP_TTL:
+                return
+            players = self.read_table('dim_player', 'player_key, name', ['player_key'])
+            penalty_types = self.read_table('dim_penalty_type', 'penalty_type_key, description', ['penalty_type_key'])
+            dates = self.read_table('dim_date', 'date_key', ['date_key'])
+            
+            self._player_keys = {row['name']: row['player_key'] for row in players if row.get('name')}
+            self._penalty_type_keys = {
+                row['description']: row['penalty_type_key'] for row in penalty_types if row.get('description')
+            }
+            self._date_keys = {row['date_key'] for row in dates}
+            self._dim_loaded_at = time.monotonic()
+    
+    def _lookup_missing_keys(self, table, key_column, name_column, keys, names):
+        """Fragt nur die in der Map fehlenden Namen einer Dimension nach (z.B. neu angelegte Spieler)"""
+        missing = [name for name in dict.fromkeys(names) if name not in keys]
+        if not missing:
+            return
+        pg = self._get_pg()
+        if pg is not None:
+            rows = pg.fetch_all(
+                f"SELECT {key_column}, {name_column} FROM {table} WHERE {name_column} = ANY(%s)", (missing,)
+            )
+        else:
+            rows = (self.supabase.table(table)
+                    .select(f'{key_column}, {name_column}')
+                    .in_(name_column, missing)
+                    .execute().data or [])
+        with self._dim_lock:
+            for row in rows:
+                keys[row[name_column]] = row[key_column]
+    
+    def _get_player_keys(self, player_names):
+        """player_keys zu Namen; unbekannte Namen werden gezielt in dim_player nachgeschlagen (neue Spieler)"""
+        self._load_dimension_maps()
+        self._lookup_missing_keys('dim_player', 'player_key', 'name', self._player_keys, player_names)
+        return {name: self._player_keys[name] for name in player_names if name in self._player_keys}
+    
+    def _get_player_key(self, player_name):
+        return self._get_player_keys([player_name]).get(player_name)
+    
+    def _get_or_create_penalty_type_keys(self, default_amounts):
+        """penalty_type_keys zu Beschreibungen; fehlende Strafenarten werden in einem Insert angelegt
+        
+        Args:
+            default_amounts: dict Beschreibung → Standardbetrag für neue Strafenarten
+        """
+        self._load_dimension_maps()
+        self._lookup_missing_keys('dim_penalty_type', 'penalty_type_key', 'description',
+                                  self._penalty_type_keys, default_amounts)
+        
+        missing = [
+            {'description': description, 'default_amount_eur': amount}
+            for description, amount in default_amounts.items()
+            if description not in self._penalty_type_keys
+        ]
+        if missing:
+            response = self.supabase.table('dim_penalty_type').insert(missing).execute()
+            with self._dim_lock:
+                for row in response.data or []:
+                    self._penalty_type_keys[row['description']] = row['penalty_type_key']
+        
+        return {
+            description: self._penalty_type_keys[description]
+            for description in default_amounts
+            if description in self._penalty_type_keys
+        }
+    
+    def _ensure_date_key(self, date_obj):
+        """Stellt den dim_date-Eintrag sicher; nur unbekannte Tage kosten einen Request"""
+        return self._ensure_date_keys([date_obj])[0]
+    
+    def _ensure_date_keys(self, date_objs):
+        """Stellt dim_date-Einträge für mehrere Tage mit höchstens einem Request sicher
+        
+        Bekannte Tage kosten keinen Request. Beim ersten unbekannten Tag wird die ganze
+        Saison mit angelegt, danach prüfen Schreibvorgänge dim_date nicht mehr.
+        """
+        date_keys = [to_date_key(date_obj) for date_obj in date_objs]
+        if all(date_key in self._date_keys for date_key in date_keys):
+            return date_keys
+        
+        self._load_dimension_maps()
+        rows = [build_dim_date_row(date_obj) for date_obj in date_objs]
+        if not self._season_dates_ready:
+            rows += build_dim_date_rows(*season_date_range())
+        self._upsert_dim_dates(rows)
+        self._season_dates_ready = True
+        return date_keys
+    
+    def _upsert_dim_dates(self, rows):
+        """Legt die noch unbekannten dim_date-Zeilen mit einem Upsert an, liefert deren Anzahl"""
+        missing = {row['date_key']: row for row in rows if row['date_key'] not in self._date_keys}
+        if missing:
+            # Upsert ohne Überschreiben, falls ein Tag außerhalb der geladenen Menge schon existiert
+            self.supabase.table('dim_date').upsert(list(missing.values()), on_conflict='date_key', ignore_duplicates=True).execute()
+            with self._dim_lock:
+                self._date_keys.update(missing)
+        return len(missing)
+    
+    def ensure_season_dates(self, start=None, end=None):
+        """
+        Füllt dim_date für einen Zeitraum (Standard: laufende Saison aus season_config) in einem Upsert
+        
+        Returns:
+            int: Anzahl neu angelegter Tage
+        """
+        self._ensure_connected()
+        if not self.connected:
+            return 0
+        
+        season_start, season_end = season_date_range()
+        self._load_dimension_maps()
+        added = self._upsert_dim_dates(build_dim_date_rows(start or season_start, end or season_end))
+        if start is None and end is None:
+            self._season_dates_ready = True
+        return added
     
+    @instrumented
+    @cached_query(CACHE_TTL_PLAYERS, "players")
     def get_birthdays(self):
         """Lade alle Geburtstage aus Supabase (neue Tabellenstruktur: dim_player)"""
         self._ensure_connected()
@@ -98,10 +776,11 @@ class DatabaseHelper:
         
         try:
             # Neue Tabelle: "dim_player" - nur aktive Spieler mit Geburtstag
-            response = self.supabase.table('dim_player').select('name, birthday, "Rolle"').eq('active_flag', True).execute()
+            rows = self.read_table('dim_player', 'player_key, name, birthday, "Rolle"', ['player_key'],
+                                   filters=lambda query: query.eq('active_flag', True))
             
-            if response.data:
-                df = pd.DataFrame(response.data)
+            if rows:
+                df = pd.DataFrame(rows)
                 
                 # Prüfe ob Daten vorhanden sind und birthday-Spalte existiert
                 if len(df) > 0 and 'birthday' in df.columns:
@@ -129,10 +808,13 @@ class DatabaseHelper:
                 
         except Exception as e:
             print(f"Fehler beim Laden der Geburtstage aus Supabase (dim_player): {e}")
+            self._mark_uncacheable()
             return pd.DataFrame(columns=['Name', 'Geburtstag', 'Geburtstag_parsed', 'Rolle'])
     
 
     
+    @instrumented
+    @cached_query(CACHE_TTL_PLAYERS, "players")
     def get_player_names(self):
         """Hole alle Spielernamen (sortiert) aus dim_player"""
         self._ensure_connected()
@@ -144,10 +826,11 @@ class DatabaseHelper:
         
         try:
             # Direkt aus dim_player Tabelle - alle aktiven Spieler
-            response = self.supabase.table('dim_player').select('name').eq('active_flag', True).order('name').execute()
+            rows = self.read_table('dim_player', 'player_key, name', ['player_key'],
+                                   filters=lambda query: query.eq('active_flag', True))
             
-            if response.data:
-                player_names = [row['name'] for row in response.data if row.get('name')]
+            if rows:
+                player_names = [row['name'] for row in rows if row.get('name')]
                 return sorted(player_names)
             else:
                 # Fallback zu Geburtstagsdaten wenn dim_player leer ist
@@ -156,10 +839,13 @@ class DatabaseHelper:
                 
         except Exception as e:
             print(f"Fehler beim Laden der Spielernamen aus dim_player: {e}")
+            self._mark_uncacheable()
             # Fallback zu Geburtstagsdaten bei Fehlern
             df = self.get_birthdays()
             return sorted(df['Name'].tolist())
     
+    @instrumented
+    @cached_query(CACHE_TTL_PLAYERS, "players")
     def get_players_by_role(self, role="Spieler"):
         """Hole alle Spieler mit einer bestimmten Rolle aus dim_player"""
         self._ensure_connected()
@@ -170,10 +856,11 @@ class DatabaseHelper:
         
         try:
             # Filtere nach aktiven Spielern mit spezifischer Rolle
-            response = self.supabase.table('dim_player').select('name').eq('active_flag', True).eq('Rolle', role).execute()
+            rows = self.read_table('dim_player', 'player_key, name', ['player_key'],
+                                   filters=lambda query: query.eq('active_flag', True).eq('Rolle', role))
             
-            if response.data:
-                player_names = [row['name'] for row in response.data if row.get('name')]
+            if rows:
+                player_names = [row['name'] for row in rows if row.get('name')]
                 # Sortiere alphabetisch, case-insensitive
                 return sorted(player_names, key=str.lower)
             else:
@@ -182,6 +869,7 @@ class DatabaseHelper:
                 
         except Exception as e:
             print(f"Fehler beim Laden der Spieler nach Rolle '{role}': {e}")
+            self._mark_uncacheable()
             # Fallback zur bisherigen Methode
             return self.get_player_names()
     
@@ -248,153 +936,311 @@ class DatabaseHelper:
                 "error": str(e)
             }
 
-    def get_penalties(self):
-        """Lade alle Strafen aus Supabase (neue Tabellenstruktur mit JOINs)"""
+    @instrumented
+    @cached_query(CACHE_TTL_PENALTIES, "penalties", "players", "penalty_types")
+    def get_penalties(self, start=None, end=None, players=None, columns=PENALTY_COLUMNS):
+        """
+        Lade Strafen aus Supabase (neue Tabellenstruktur mit JOINs)
+        
+        Zeitraum und Spieler werden direkt in der Abfrage gefiltert und nur die
+        benötigten Spalten geladen.
+        
+        Args:
+            start: frühestes Datum (inklusive), None = unbegrenzt
+            end: spätestes Datum (inklusive), None = unbegrenzt
+            players: Spielernamen, None = alle
+            columns: Spalten aus PENALTY_COLUMNS
+        """
         self._ensure_connected()
+        columns = [column for column in PENALTY_COLUMNS if column in columns]
         
         if not self.connected:
-            return self._fallback_penalties()
+            return self._fallback_penalties(start=start, end=end, players=players, columns=columns)
         
         try:
-            # Komplexe Abfrage mit JOINs über fact_penalty, dim_player, dim_penalty_type, dim_date
-            response = self.supabase.table('fact_penalty').select('''
-                *,
-                dim_player(name),
-                dim_penalty_type(description),
-                dim_date(full_date)
-            ''').order('penalty_id', desc=True).execute()
-            
-            if response.data:
-                # Verarbeite die verschachtelten Daten
-                processed_data = []
-                for row in response.data:
-                    try:
-                        # Extrahiere Daten aus den JOINs
-                        player_name = row.get('dim_player', {}).get('name', 'Unbekannt') if row.get('dim_player') else 'Unbekannt'
-                        penalty_desc = row.get('dim_penalty_type', {}).get('description', 'Unbekannte Strafe') if row.get('dim_penalty_type') else 'Unbekannte Strafe'
-                        penalty_date = row.get('dim_date', {}).get('full_date', None) if row.get('dim_date') else None
-                        
-                        processed_data.append({
-                            'penalty_id': row.get('penalty_id'),  # Wichtig für Löschen!
-                            'Spieler': player_name,
-                            'Strafe': penalty_desc,
-                            'Betrag': float(row.get('amount_eur', 0)),
-                            'Zusatzinfo': row.get('note', ''),
-                            'Datum': penalty_date
-                        })
-                    except Exception as e:
-                        print(f"Fehler bei der Verarbeitung einer Strafe: {e}")
-                        continue
-                
-                if processed_data:
-                    df = pd.DataFrame(processed_data)
-                    
-                    df = filter_training_victories_for_season(df, season_start=season_start)
-                    return df.sort_values('Datum', ascending=False)
+            reader = self._analytics_reader(PENALTY_TABLES) if players is None else None
+            if reader is not None:
+                df = reader.read_frame(
+                    'penalties',
+                    to_date_key(start) if start is not None else None,
+                    to_date_key(end) if end is not None else None,
+                )
+                return self._finish_penalty_frame(df, columns)
+            
+            replica = self._replica_for(PENALTY_TABLES)
+            if replica is not None:
+                rows = replica.penalty_rows(
+                    to_date_key(start) if start is not None else None,
+                    to_date_key(end) if end is not None else None,
+                    players
+                )
+                return self._penalty_frame(rows, columns)
+            
+            pg = self._get_pg()
+            if pg is not None:
+                rows = pg.penalty_rows(
+                    to_date_key(start) if start is not None else None,
+                    to_date_key(end) if end is not None else None,
+                    players
+                )
+                return self._penalty_frame(rows, columns)
+            
+            filters = []
+            if start is not None:
+                filters.append(lambda query: query.gte('date_key', to_date_key(start)))
+            if end is not None:
+                filters.append(lambda query: query.lte('date_key', to_date_key(end)))
+            if players is not None:
+                player_keys = list(self._get_player_keys(list(players)).values())
+                if not player_keys:
+                    return pd.DataFrame(columns=columns)
+                filters.append(lambda query: query.in_('player_key', player_keys))
+            
+            # Datum kommt aus dem date_key (YYYYMMDD), ein Join auf dim_date ist nicht nötig
+            select = ', '.join(['penalty_id'] + [
+                PENALTY_SELECT[column] for column in columns if column != 'penalty_id'
+            ])
+            
+            def apply_filters(query):
+                for apply in filters:
+                    query = apply(query)
+                return query
+            
+            # Keyset-Pagination über penalty_id, damit auch ältere Strafen vollständig geladen werden
+            rows = self.read_table('fact_penalty', select, ['penalty_id'],
+                                   filters=apply_filters, descending=True)
+            return self._penalty_frame(rows, columns)
                 
         except Exception as e:
             print(f"Fehler beim Laden der Strafen aus Supabase (neue Struktur): {e}")
-            return self._fallback_penalties()
-        
-        # Fallback wenn Tabelle leer ist
-        return self._fallback_penalties()
+            return self._fallback_penalties(start=start, end=end, players=players, columns=columns)
     
-    def add_penalty(self, penalty_data):
-        """Füge eine neue Strafe hinzu (neue Tabellenstruktur mit Lookups)"""
+    @instrumented
+    @cached_query(CACHE_TTL_PENALTIES, "penalties")
+    def count_penalties(self):
+        """Anzahl aller Strafen (count='exact', ohne die Zeilen zu laden)"""
         self._ensure_connected()
         
         if not self.connected:
-            return self._fallback_save_penalty(penalty_data)
+            return len(self._fallback_penalties(columns=['penalty_id']))
         
         try:
-            # 1. Player Key finden
-            player_name = penalty_data.get('Spieler')
-            player_response = self.supabase.table('dim_player').select('player_key').eq('name', player_name).execute()
+            replica = self._replica_for(PENALTY_TABLES)
+            if replica is not None:
+                return replica.query("SELECT COUNT(*) AS total FROM fact_penalty")[0]['total']
             
-            if not player_response.data:
-                print(f"Spieler '{player_name}' nicht in dim_player gefunden")
-                return self._fallback_save_penalty(penalty_data)
-            
-            player_key = player_response.data[0]['player_key']
+            pg = self._get_pg()
+            if pg is not None:
+                return pg.fetch_all("SELECT count(*) AS total FROM fact_penalty")[0]['total']
             
-            # 2. Penalty Type Key finden oder erstellen
-            penalty_desc = penalty_data.get('Strafe')
-            penalty_amount = penalty_data.get('Betrag')
-            
-            penalty_type_response = self.supabase.table('dim_penalty_type').select('penalty_type_key').eq('description', penalty_desc).execute()
+            response = (self.supabase.table('fact_penalty')
+                       .select('penalty_id', count='exact')
+                       .limit(1)
+                       .execute())
+            return response.count or 0
+        
+        except Exception as e:
+            print(f"Fehler beim Zählen der Strafen: {e}")
+            return len(self._fallback_penalties(columns=['penalty_id']))
+    
+    @staticmethod
+    def _penalty_frame(rows, columns):
+        """Strafen-Zeilen (Supabase oder lokale Replik) als DataFrame, neueste zuerst"""
+        if not rows:
+            return pd.DataFrame(columns=columns)
+        
+        result = flatten_rows(rows, {column: PENALTY_FIELDS[column] for column in columns})
+        return DatabaseHelper._finish_penalty_frame(result, columns)
+    
+    @staticmethod
+    def _finish_penalty_frame(df, columns):
+        """Gemeinsame Nachbearbeitung für JSON- und Arrow-Weg: Spaltenauswahl, neueste zuerst"""
+        result = df[columns]
+        if 'Datum' in result.columns:
+            result = result.sort_values('Datum', ascending=False, kind='stable')
+        return result.reset_index(drop=True)
+    
+    @instrumented
+    @invalidates("penalties", "penalty_types")
+    def add_penalty(self, penalty_data):
+        """Füge eine neue Strafe hinzu (dünne Hülle um den Batch-Weg von add_penalties)"""
+        try:
+            saved, problems = self._save_penalties([penalty_data])
+        except Exception as e:
+            print(f"Fehler beim Speichern der Strafe in Supabase (neue Struktur): {e}")
+            return self._fallback_save_penalty(penalty_data)
+        
+        if saved:
+            return True
+        for problem in problems.values():
+            print(f"Strafe nicht gespeichert: {problem}")
+        return False
+    
+    @instrumented
+    @invalidates("penalties", "penalty_types")
+    def add_penalties(self, records):
+        """
+        Füge mehrere Strafen auf einmal hinzu
+        
+        Alle Dimensions-Keys werden gesammelt aufgelöst, fehlende Strafenarten und
+        Tage in je einem Request angelegt und alle Strafen mit einem Insert gespeichert.
+        Datensätze mit 'request_id' (Write-Journal) werden idempotent gespeichert.
+        
+        Args:
+            records: Liste von Dicts mit Datum, Spieler, Strafe, Betrag, Zusatzinfo
             
-            if penalty_type_response.data:
-                penalty_type_key = penalty_type_response.data[0]['penalty_type_key']
+        Returns:
+            tuple: (Anzahl gespeicherter Strafen, Fehler-Liste je Datensatz)
+        """
+        records = list(records)
+        problems = {}
+        try:
+            saved, problems = self._save_penalties(records, problems)
+        except Exception as e:
+            print(f"Fehler beim Speichern der Strafen in Supabase: {e}")
+            # Schon erkannte Probleme (z.B. unbekannter Spieler) behalten, die übrigen scheitern am Fehler
+            saved = 0
+            for index in range(1, len(records) + 1):
+                problems.setdefault(index, str(e))
+        return saved, [f"Datensatz {index}: {problem}" for index, problem in sorted(problems.items())]
+    
+    def _save_penalties(self, records, problems=None):
+        """
+        Speichert Strafen; liefert (Anzahl, {Position: Fehler}) für dauerhafte Fehler
+        
+        Netzwerk- und Datenbankfehler werden als Exception weitergegeben. Ein
+        übergebenes problems-Dict wird laufend befüllt und enthält die bis dahin
+        erkannten Fehler auch nach einer Exception.
+        """
+        self._ensure_connected()
+        
+        records = list(records)
+        problems = {} if problems is None else problems
+        if not records:
+            return 0, problems
+        
+        # 1. Datensätze prüfen
+        valid = []
+        for index, record in enumerate(records, start=1):
+            problem, parsed = self._validate_penalty_record(record)
+            if problem:
+                problems[index] = problem
             else:
-                # Neuen Penalty Type erstellen
-                new_penalty_type = {
-                    'description': penalty_desc,
-                    'default_amount_eur': penalty_amount
-                }
-                new_penalty_response = self.supabase.table('dim_penalty_type').insert(new_penalty_type).execute()
-                
-                if not new_penalty_response.data:
-                    print(f"Fehler beim Erstellen von Penalty Type '{penalty_desc}'")
-                    return self._fallback_save_penalty(penalty_data)
-                
-                penalty_type_key = new_penalty_response.data[0]['penalty_type_key']
-            
-            # 3. Date Key finden oder erstellen
-            penalty_date = penalty_data.get('Datum')
-            if isinstance(penalty_date, str):
-                # Konvertiere String-Datum zu Date-Objekt
-                from datetime import date, datetime
-                penalty_date_obj = datetime.strptime(penalty_date, '%d.%m.%Y').date()
+                valid.append((index, record, parsed))
+        
+        if not self.connected:
+            saved = 0
+            for index, record, _ in valid:
+                if self._fallback_save_penalty(record):
+                    saved += 1
+                else:
+                    problems[index] = "CSV-Fallback fehlgeschlagen"
+            return saved, problems
+        
+        if not valid:
+            return 0, problems
+        
+        # 2. Spieler auflösen (ein Request, falls Namen unbekannt sind)
+        player_keys = self._get_player_keys({record['Spieler'] for _, record, _ in valid})
+        resolved = []
+        for index, record, parsed in valid:
+            if record['Spieler'] in player_keys:
+                resolved.append((index, record, parsed))
             else:
-                penalty_date_obj = penalty_date
-            
-            # Datum zu Integer-Key konvertieren (YYYYMMDD Format)
-            date_key = int(penalty_date_obj.strftime('%Y%m%d'))
-            
-            # Prüfe ob Date-Eintrag existiert
-            date_response = self.supabase.table('dim_date').select('date_key').eq('date_key', date_key).execute()
-            
-            if not date_response.data:
-                # Neuen Date-Eintrag erstellen
-                new_date = {
-                    'date_key': date_key,
-                    'full_date': penalty_date_obj.isoformat(),
-                    'year': penalty_date_obj.year,
-                    'month_nr': penalty_date_obj.month,
-                    'month_name': penalty_date_obj.strftime('%B')[:10],
-                    'quarter': (penalty_date_obj.month - 1) // 3 + 1,
-                    'week_nr': penalty_date_obj.isocalendar()[1],
-                    'weekday_nr': penalty_date_obj.weekday() + 1,
-                    'weekday_name': penalty_date_obj.strftime('%A')[:10],
-                    'is_weekend': penalty_date_obj.weekday() >= 5
-                }
-                date_insert_response = self.supabase.table('dim_date').insert(new_date).execute()
-                
-                if not date_insert_response.data:
-                    print(f"Fehler beim Erstellen von Date-Eintrag für {penalty_date_obj}")
-                    return self._fallback_save_penalty(penalty_data)
-            
-            # 4. Fact Penalty erstellen
-            fact_penalty_data = {
+                problems[index] = f"Spieler '{record['Spieler']}' nicht in dim_player gefunden"
+        
+        if not resolved:
+            return 0, problems
+        
+        # 3. Fehlende Strafenarten und Tage gesammelt anlegen
+        default_amounts = {}
+        for _, record, parsed in resolved:
+            default_amounts.setdefault(record['Strafe'], parsed['amount'])
+        penalty_type_keys = self._get_or_create_penalty_type_keys(default_amounts)
+        date_keys = self._ensure_date_keys([parsed['date'] for _, _, parsed in resolved])
+        
+        # 4. Alle Strafen in einem Insert speichern
+        fact_rows = []
+        for (index, record, parsed), date_key in zip(resolved, date_keys):
+            penalty_type_key = penalty_type_keys.get(record['Strafe'])
+            if penalty_type_key is None:
+                problems[index] = f"Strafenart '{record['Strafe']}' konnte nicht angelegt werden"
+                continue
+            fact_row = {
                 'date_key': date_key,
-                'player_key': player_key,
+                'player_key': player_keys[record['Spieler']],
                 'penalty_type_key': penalty_type_key,
-                'amount_eur': penalty_amount,
+                'amount_eur': parsed['amount'],
                 'penalty_cnt': 1,
-                'note': penalty_data.get('Zusatzinfo', '')
+                'note': record.get('Zusatzinfo', '')
             }
-            
-            # Daten in fact_penalty speichern
-            response = self.supabase.table('fact_penalty').insert(fact_penalty_data).execute()
-            
-            if response.data:
-                return True
-            else:
-                return self._fallback_save_penalty(penalty_data)
-                
+            if record.get('request_id'):
+                fact_row['request_id'] = record['request_id']
+            fact_rows.append(fact_row)
+        
+        if not fact_rows:
+            return 0, problems
+        
+        try:
+            return self._insert_penalty_rows(fact_rows), problems
         except Exception as e:
-            print(f"Fehler beim Speichern der Strafe in Supabase (neue Struktur): {e}")
-            return self._fallback_save_penalty(penalty_data)
+            if not any('request_id' in row for row in fact_rows) or not is_missing_request_id(e):
+                raise
+            # Ohne Migration lieber ohne Idempotenz speichern als jede Strafe zu verlieren
+            print(f"request_id fehlt in fact_penalty (supabase_write_journal.sql einspielen), speichere ohne: {e}")
+            self._idempotent_writes = False
+            return self._insert_penalty_rows(fact_rows), problems
+    
+    def _insert_penalty_rows(self, fact_rows):
+        """Speichert fertige fact_penalty-Zeilen (idempotent, wenn request_id vorhanden und unterstützt)"""
+        if not self._idempotent_writes:
+            fact_rows = [{key: value for key, value in row.items() if key != 'request_id'} for row in fact_rows]
+        
+        pg = self._get_pg()
+        if pg is not None:
+            return len(pg.insert_penalties(fact_rows))
+        
+        if any('request_id' in row for row in fact_rows):
+            # Bereits gespeicherte request_ids (Wiederholung nach Timeout) werden übersprungen
+            response = (self.supabase.table('fact_penalty')
+                       .upsert(fact_rows, on_conflict='request_id', ignore_duplicates=True)
+                       .execute())
+        else:
+            response = self.supabase.table('fact_penalty').insert(fact_rows).execute()
+        return len(response.data or [])
+    
+    def _validate_penalty_record(self, record):
+        """Prüft einen Strafen-Datensatz; liefert (Fehlertext, geparste Werte)"""
+        if not isinstance(record, dict):
+            return "kein gültiger Datensatz", None
+        if not record.get('Spieler'):
+            return "Spieler fehlt", None
+        if not record.get('Strafe'):
+            return "Strafe fehlt", None
+        
+        try:
+            amount = float(record.get('Betrag'))
+        except (TypeError, ValueError):
+            return f"ungültiger Betrag: {record.get('Betrag')!r}", None
+        if not math.isfinite(amount):
+            return f"ungültiger Betrag: {record.get('Betrag')!r}", None
+        if amount < 0:
+            return f"negativer Betrag: {amount:.2f}", None
+        
+        penalty_date = record.get('Datum')
+        if isinstance(penalty_date, datetime):
+            penalty_date = penalty_date.date()
+        elif isinstance(penalty_date, str):
+            for date_format in ('%d.%m.%Y', '%Y-%m-%d'):
+                try:
+                    penalty_date = datetime.strptime(penalty_date, date_format).date()
+                    break
+                except ValueError:
+                    continue
+        if not isinstance(penalty_date, date):
+            return f"ungültiges Datum: {record.get('Datum')!r}", None
+        
+        return None, {'amount': amount, 'date': penalty_date}
     
     def _fallback_save_penalty(self, penalty_data):
         """Fallback: Speichere Strafe in CSV"""
@@ -416,6 +1262,7 @@ class DatabaseHelper:
         except Exception as e:
             return False
     
+    @invalidates("penalties", deletes=True)
     def delete_penalty(self, penalty_id):
         """Lösche eine Strafe anhand der penalty_id"""
         self._ensure_connected()
@@ -434,6 +1281,48 @@ class DatabaseHelper:
         except Exception as e:
             return False, f"❌ Fehler beim Löschen der Strafe: {str(e)}"
     
+    @instrumented
+    @invalidates("penalties", deletes=True)
+    def delete_penalties_bulk(self, penalty_ids, chunk_size=DELETE_CHUNK_SIZE):
+        """
+        Lösche mehrere Strafen mit einem Request pro Chunk (in_-Filter)
+        
+        Returns:
+            tuple: (gelöschte IDs, Fehler-Liste)
+        """
+        self._ensure_connected()
+        
+        if not self.connected:
+            return [], ["Keine Datenbankverbindung"]
+        
+        ids = list(dict.fromkeys(penalty_ids))
+        deleted_ids = []
+        errors = []
+        
+        pg = self._get_pg()
+        if pg is not None:
+            # Ein Statement für alle IDs, keine URL-Längengrenze
+            try:
+                deleted = set(pg.delete_penalties(ids))
+            except Exception as e:
+                return [], [f"ID {penalty_id}: {str(e)}" for penalty_id in ids]
+            deleted_ids = [penalty_id for penalty_id in ids if penalty_id in deleted]
+            errors = [f"ID {penalty_id}: nicht gefunden" for penalty_id in ids if penalty_id not in deleted]
+            return deleted_ids, errors
+        
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            try:
+                # delete() liefert die gelöschten Zeilen zurück
+                response = self.supabase.table('fact_penalty').delete().in_('penalty_id', chunk).execute()
+                chunk_deleted = {row.get('penalty_id') for row in response.data or []}
+                deleted_ids.extend(penalty_id for penalty_id in chunk if penalty_id in chunk_deleted)
+                errors.extend(f"ID {penalty_id}: nicht gefunden" for penalty_id in chunk if penalty_id not in chunk_deleted)
+            except Exception as e:
+                errors.extend(f"ID {penalty_id}: {str(e)}" for penalty_id in chunk)
+        
+        return deleted_ids, errors
+    
     def delete_multiple_penalties(self, penalty_ids):
         """Lösche mehrere Strafen anhand ihrer penalty_ids"""
         self._ensure_connected()
@@ -444,16 +1333,12 @@ class DatabaseHelper:
         if not penalty_ids:
             return False, "Keine Strafen-IDs angegeben"
         
+        # Doppelt ausgewählte IDs zählen nur einmal (wie in delete_penalties_bulk)
+        penalty_ids = list(dict.fromkeys(penalty_ids))
+        
         try:
-            deleted_count = 0
-            errors = []
-            
-            for penalty_id in penalty_ids:
-                success, message = self.delete_penalty(penalty_id)
-                if success:
-                    deleted_count += 1
-                else:
-                    errors.append(f"ID {penalty_id}: {message}")
+            deleted_ids, errors = self.delete_penalties_bulk(penalty_ids)
+            deleted_count = len(deleted_ids)
             
             if deleted_count == len(penalty_ids):
                 return True, f"✅ Alle {deleted_count} Strafen erfolgreich gelöscht"
@@ -465,15 +1350,38 @@ class DatabaseHelper:
         except Exception as e:
             return False, f"❌ Fehler beim Löschen der Strafen: {str(e)}"
     
-    def _fallback_penalties(self):
-        """Fallback: Lade Strafen aus CSV"""
+    def _fallback_penalties(self, start=None, end=None, players=None, columns=PENALTY_COLUMNS):
+        """Fallback: Lade Strafen aus der lokalen Replik, sonst aus CSV"""
+        self._mark_uncacheable()
+        replica = self._replica_for(PENALTY_TABLES, sync=False)
+        if replica is not None:
+            try:
+                rows = replica.penalty_rows(
+                    to_date_key(start) if start is not None else None,
+                    to_date_key(end) if end is not None else None,
+                    players
+                )
+                return self._penalty_frame(rows, [column for column in PENALTY_COLUMNS if column in columns])
+            except Exception as e:
+                print(f"Fehler beim Lesen der Strafen aus der lokalen Replik: {e}")
+        
         try:
             df = pd.read_csv("VB_Strafen.csv", sep=";", encoding="utf-8")
             df['Datum'] = pd.to_datetime(df['Datum'], format='%d.%m.%Y', errors='coerce')
-            return df.dropna(subset=['Datum']).sort_values('Datum', ascending=False)
+            df = df.dropna(subset=['Datum'])
+            if start is not None:
+                df = df[df['Datum'] >= pd.Timestamp(start).normalize()]
+            if end is not None:
+                df = df[df['Datum'] <= pd.Timestamp(end).normalize()]
+            if players is not None:
+                df = df[df['Spieler'].isin(list(players))]
+            df = df.sort_values('Datum', ascending=False)
+            return df[[column for column in columns if column in df.columns]]
         except Exception as e:
             return pd.DataFrame(columns=['Datum', 'Spieler', 'Strafe', 'Betrag', 'Zusatzinfo'])
     
+    @instrumented
+    @cached_query(CACHE_TTL_PLAYERS, "penalty_types")
     def get_penalty_types(self):
         """Lade alle Strafenarten aus der dim_penalty_type Tabelle"""
         self._ensure_connected()
@@ -483,12 +1391,11 @@ class DatabaseHelper:
         
         try:
             # Lade alle aktiven Strafenarten aus der Datenbank
-            response = self.supabase.table('dim_penalty_type').select(
-                'penalty_type_key, description, default_amount_eur'
-            ).order('description').execute()
+            rows = self.read_table('dim_penalty_type', 'penalty_type_key, description, default_amount_eur',
+                                   ['penalty_type_key'])
             
-            if response.data:
-                return response.data
+            if rows:
+                return sorted(rows, key=lambda row: row.get('description') or '')
             else:
                 print("Keine Strafenarten in der Datenbank gefunden, verwende Fallback")
                 return self._fallback_penalty_types()
@@ -499,6 +1406,7 @@ class DatabaseHelper:
     
     def _fallback_penalty_types(self):
         """Fallback: Hardcodierte Strafenarten wenn Datenbank nicht verfügbar"""
+        self._mark_uncacheable()
         # Fallback zu den ursprünglich hardcodierten Werten
         fallback_penalties = [
             {"description": "18. oder 19. Kontakt in der Ecke vergeigt", "default_amount_eur": 0.50},
@@ -539,6 +1447,8 @@ class DatabaseHelper:
         ]
         return fallback_penalties
     
+    @instrumented
+    @cached_query(CACHE_TTL_TRAINING, "training", "players")
     def get_training_victories(self, season_start=TRAINING_SEASON_START):
         """Lade Trainingsspielsiege aus Supabase, standardmäßig für die aktuelle Saison."""
         self._ensure_connected()
@@ -548,59 +1458,40 @@ class DatabaseHelper:
         
         try:
             season_start_key = int(season_start.strftime('%Y%m%d')) if season_start else None
+            reader = self._analytics_reader(TRAINING_TABLES)
+            if reader is not None:
+                df = reader.read_frame('training_victories', season_start_key)
+                if not df.empty:
+                    return self._finish_training_frame(df, season_start)
+                return self._fallback_training_victories(season_start=season_start)
+            
+            replica = self._replica_for(TRAINING_TABLES)
+            if replica is not None:
+                all_rows = replica.training_rows(season_start_key)
+                if all_rows:
+                    return self._training_frame(all_rows, season_start)
+                return self._fallback_training_victories(season_start=season_start)
+            
+            pg = self._get_pg()
+            if pg is not None:
+                all_rows = pg.training_rows(season_start_key)
+                if all_rows:
+                    return self._training_frame(all_rows, season_start)
+                return self._fallback_training_victories(season_start=season_start)
+            
             # Komplexe Abfrage mit JOINs über fact_training_win, dim_player, dim_date
-            # Supabase/PostgREST liefert max. 1000 Zeilen pro Request -> paginieren
-            all_rows = []
-            page_size = 1000
-            offset = 0
-            while True:
-                query = self.supabase.table('fact_training_win').select('''
-                    *,
-                    dim_player(name),
-                    dim_date(full_date)
-                ''')
-                if season_start_key is not None:
-                    query = query.gte('date_key', season_start_key)
-                response = query.order('date_key', desc=True).range(offset, offset + page_size - 1).execute()
-                
-                batch = response.data or []
-                if not batch:
-                    break
-                
-                all_rows.extend(batch)
-                
-                # Weniger als page_size zurückbekommen -> letzte Seite
-                if len(batch) < page_size:
-                    break
-                
-                offset += page_size
+            # Keyset-Pagination über (date_key, player_key), Kalenderjahre parallel
+            # Datum kommt aus dem date_key (YYYYMMDD), ein Join auf dim_date ist nicht nötig
+            select = 'date_key, player_key, win_cnt, dim_player(name)'
+            partitions = None
+            if season_start_key is not None:
+                # Neueste Jahre zuerst, passend zur absteigenden Sortierung
+                partitions = date_key_partitions(season_start, get_german_now().date())[::-1]
+            all_rows = self.read_table('fact_training_win', select, ['date_key', 'player_key'],
+                                       descending=True, partitions=partitions)
             
             if all_rows:
-                # Verarbeite die verschachtelten Daten
-                processed_data = []
-                for row in all_rows:
-                    try:
-                        # Extrahiere Daten aus den JOINs
-                        player_name = row.get('dim_player', {}).get('name', 'Unbekannt') if row.get('dim_player') else 'Unbekannt'
-                        training_date = row.get('dim_date', {}).get('full_date', None) if row.get('dim_date') else None
-                        
-                        # win_cnt > 0 bedeutet Sieg
-                        hat_gewonnen = row.get('win_cnt', 0) > 0
-                        
-                        processed_data.append({
-                            'Spieler': player_name,
-                            'Datum': training_date,
-                            'Sieg': hat_gewonnen
-                        })
-                    except Exception as e:
-                        print(f"Fehler bei der Verarbeitung eines Trainingseintrags: {e}")
-                        continue
-                
-                if processed_data:
-                    df = pd.DataFrame(processed_data)
-                    
-                    df = filter_training_victories_for_season(df, season_start=season_start)
-                    return df.sort_values('Datum', ascending=False)
+                return self._training_frame(all_rows, season_start)
                 
         except Exception as e:
             print(f"Fehler beim Laden der Trainingsspielsiege aus Supabase (neue Struktur): {e}")
@@ -609,6 +1500,19 @@ class DatabaseHelper:
         # Fallback wenn Tabelle leer ist
         return self._fallback_training_victories(season_start=season_start)
     
+    @staticmethod
+    def _training_frame(rows, season_start):
+        """Trainings-Zeilen (Supabase oder lokale Replik) als DataFrame, neueste zuerst"""
+        # Spaltenweise flach machen: Datum als datetime64, Sieg (win_cnt > 0) als bool
+        return DatabaseHelper._finish_training_frame(flatten_rows(rows, TRAINING_FIELDS), season_start)
+    
+    @staticmethod
+    def _finish_training_frame(df, season_start):
+        """Gemeinsame Nachbearbeitung für JSON- und Arrow-Weg: Saisonfilter, neueste zuerst"""
+        df = filter_training_victories_for_season(df[list(TRAINING_FIELDS)], season_start=season_start)
+        return df.sort_values('Datum', ascending=False, kind='stable').reset_index(drop=True)
+    
+    @invalidates("training")
     def add_training_victory(self, victory_data):
         """Füge einen neuen Trainingssieg hinzu (neue Tabellenstruktur mit Lookups)"""
         self._ensure_connected()
@@ -617,49 +1521,23 @@ class DatabaseHelper:
             return self._fallback_save_training_victory(victory_data)
         
         try:
-            # 1. Player Key finden
+            # 1. Player Key aus der Dimensions-Map
             player_name = victory_data.get('Spieler')
-            player_response = self.supabase.table('dim_player').select('player_key').eq('name', player_name).execute()
+            player_key = self._get_player_key(player_name)
             
-            if not player_response.data:
+            if player_key is None:
                 print(f"Spieler '{player_name}' nicht in dim_player gefunden")
                 return self._fallback_save_training_victory(victory_data)
             
-            player_key = player_response.data[0]['player_key']
-            
             # 2. Date Key erstellen/finden
             training_date = victory_data.get('Datum')
             if isinstance(training_date, str):
-                from datetime import date, datetime
                 training_date_obj = datetime.strptime(training_date, '%Y-%m-%d').date()
             else:
                 training_date_obj = training_date
             
-            # Datum zu Integer-Key konvertieren (YYYYMMDD Format)
-            date_key = int(training_date_obj.strftime('%Y%m%d'))
-            
-            # Prüfe ob Date-Eintrag existiert, falls nicht erstelle ihn
-            date_response = self.supabase.table('dim_date').select('date_key').eq('date_key', date_key).execute()
-            
-            if not date_response.data:
-                # Neuen Date-Eintrag erstellen
-                new_date = {
-                    'date_key': date_key,
-                    'full_date': training_date_obj.isoformat(),
-                    'year': training_date_obj.year,
-                    'month_nr': training_date_obj.month,
-                    'month_name': training_date_obj.strftime('%B')[:10],
-                    'quarter': (training_date_obj.month - 1) // 3 + 1,
-                    'week_nr': training_date_obj.isocalendar()[1],
-                    'weekday_nr': training_date_obj.weekday() + 1,
-                    'weekday_name': training_date_obj.strftime('%A')[:10],
-                    'is_weekend': training_date_obj.weekday() >= 5
-                }
-                date_insert_response = self.supabase.table('dim_date').insert(new_date).execute()
-                
-                if not date_insert_response.data:
-                    print(f"Fehler beim Erstellen von Date-Eintrag für {training_date_obj}")
-                    return self._fallback_save_training_victory(victory_data)
+            date_key = self._ensure_date_key(training_date_obj)
+            self._replica_changed_since("training", date_key)
             
             # 3. Fact Training Win erstellen/aktualisieren
             hat_gewonnen = victory_data.get('Sieg', False)
@@ -684,6 +1562,8 @@ class DatabaseHelper:
             print(f"Fehler beim Speichern des Trainingssiegs (neue Struktur): {e}")
             return self._fallback_save_training_victory(victory_data)
 
+    @instrumented
+    @invalidates("training")
     def add_training_day_entries(self, datum, spieler_mit_sieg, alle_spieler):
         """Füge Einträge für einen kompletten Trainingstag hinzu (neue Tabellenstruktur)"""
         self._ensure_connected()
@@ -692,86 +1572,82 @@ class DatabaseHelper:
             return False, "Keine Datenbankverbindung"
         
         try:
-            # 1. Datum zu date_key konvertieren und dim_date sicherstellen
-            if isinstance(datum, str):
-                from datetime import date, datetime
-                # Versuche verschiedene Datumsformate
-                try:
-                    date_obj = datetime.strptime(datum, '%Y-%m-%d').date()
-                except:
-                    try:
-                        date_obj = datetime.strptime(datum, '%d.%m.%Y').date()
-                    except:
-                        return False, f"❌ Ungültiges Datumsformat: {datum}"
-            else:
-                date_obj = datum
-            
-            date_key = int(date_obj.strftime('%Y%m%d'))
-            
-            # Sicherstellen, dass dim_date Eintrag existiert
-            date_response = self.supabase.table('dim_date').select('date_key').eq('date_key', date_key).execute()
-            
-            if not date_response.data:
-                # Neuen Date-Eintrag erstellen
-                new_date = {
-                    'date_key': date_key,
-                    'full_date': date_obj.isoformat(),
-                    'year': date_obj.year,
-                    'month_nr': date_obj.month,
-                    'month_name': date_obj.strftime('%B')[:10],
-                    'quarter': (date_obj.month - 1) // 3 + 1,
-                    'week_nr': date_obj.isocalendar()[1],
-                    'weekday_nr': date_obj.weekday() + 1,
-                    'weekday_name': date_obj.strftime('%A')[:10],
-                    'is_weekend': date_obj.weekday() >= 5
-                }
-                date_insert_response = self.supabase.table('dim_date').insert(new_date).execute()
-                
-                if not date_insert_response.data:
-                    return False, f"❌ Fehler beim Erstellen von Date-Eintrag für {date_obj}"
-            
-            # 2. Alle Spieler zu player_keys umwandeln
-            player_keys = {}
-            for spieler in alle_spieler:
-                player_response = self.supabase.table('dim_player').select('player_key').eq('name', spieler).execute()
-                if player_response.data:
-                    player_keys[spieler] = player_response.data[0]['player_key']
-                else:
-                    print(f"Warnung: Spieler '{spieler}' nicht in dim_player gefunden, wird übersprungen")
-            
-            if not player_keys:
-                return False, "❌ Keine gültigen Spieler gefunden"
-            
-            # 3. Erst alle bestehenden Einträge für diesen Tag löschen
-            delete_response = self.supabase.table('fact_training_win').delete().eq('date_key', date_key).execute()
-            
-            # 4. Neue Einträge für alle Spieler hinzufügen
-            neue_eintraege = []
-            for spieler, player_key in player_keys.items():
-                hat_gewonnen = spieler in spieler_mit_sieg
-                win_cnt = 1 if hat_gewonnen else 0
-                
-                neue_eintraege.append({
-                    'date_key': date_key,
-                    'player_key': player_key,
-                    'played_cnt': 1,
-                    'win_cnt': win_cnt
-                })
-            
-            # Alle Einträge in einem Batch hinzufügen
-            if neue_eintraege:
-                response = self.supabase.table('fact_training_win').insert(neue_eintraege).execute()
-                
-                if response.data:
-                    return True, f"✅ {len(neue_eintraege)} Einträge erfolgreich gespeichert (date_key: {date_key})"
-                else:
-                    return False, "❌ Fehler beim Speichern in der Datenbank"
-            else:
-                return False, "❌ Keine Einträge zum Speichern"
-                
+            return self._save_training_day(datum, spieler_mit_sieg, alle_spieler)
         except Exception as e:
             return False, f"❌ Fehler: {str(e)}"
+    
+    def _save_training_day(self, datum, spieler_mit_sieg, alle_spieler):
+        """
+        Speichert einen Trainingstag; liefert (Erfolg, Nachricht) bei ungültigen Eingaben
+        
+        Netzwerk- und Datenbankfehler werden als Exception weitergegeben.
+        """
+        # 1. Datum zu date_key konvertieren und dim_date sicherstellen
+        if isinstance(datum, str):
+            # Versuche verschiedene Datumsformate
+            try:
+                date_obj = datetime.strptime(datum, '%Y-%m-%d').date()
+            except ValueError:
+                try:
+                    date_obj = datetime.strptime(datum, '%d.%m.%Y').date()
+                except ValueError:
+                    return False, f"❌ Ungültiges Datumsformat: {datum}"
+        else:
+            date_obj = datum
+        
+        pg = self._get_pg()
+        
+        # Sicherstellen, dass dim_date Eintrag existiert (ohne Request, wenn bekannt;
+        # beim Postgres-Backend innerhalb der Transaktion unten)
+        date_key = int(date_obj.strftime('%Y%m%d')) if pg is not None else self._ensure_date_key(date_obj)
+        self._replica_changed_since("training", date_key)
+        
+        # 2. Alle Spieler zu player_keys umwandeln (aus der Dimensions-Map)
+        player_keys = self._get_player_keys(alle_spieler)
+        for spieler in alle_spieler:
+            if spieler not in player_keys:
+                print(f"Warnung: Spieler '{spieler}' nicht in dim_player gefunden, wird übersprungen")
+        
+        if not player_keys:
+            return False, "❌ Keine gültigen Spieler gefunden"
+        
+        neue_eintraege = [
+            {'player_key': player_key, 'played_cnt': 1, 'win_cnt': 1 if spieler in spieler_mit_sieg else 0}
+            for spieler, player_key in player_keys.items()
+        ]
+        
+        if pg is not None:
+            # dim_date und Abgleich des Tages in einer Transaktion: alles oder nichts
+            changed = pg.replace_training_day(build_dim_date_row(date_obj), neue_eintraege)
+            with self._dim_lock:
+                self._date_keys.add(date_key)
+            return True, f"✅ {len(neue_eintraege)} Einträge erfolgreich gespeichert, {changed} geändert (date_key: {date_key})"
+        
+        # 3. Abgleich per RPC (supabase_training_day_function.sql): eine Transaktion, nur Änderungen
+        try:
+            rows = self.call_rpc('replace_training_day', {'p_date_key': date_key, 'p_entries': neue_eintraege})
+            changed = sum((rows[0].get('deleted') or 0, rows[0].get('upserted') or 0)) if rows else 0
+            return True, f"✅ {len(neue_eintraege)} Einträge erfolgreich gespeichert, {changed} geändert (date_key: {date_key})"
+        except Exception as e:
+            # Nur eine fehlende Funktion (PGRST202) fällt zurück, echte Fehler nicht
+            if getattr(e, 'code', None) != 'PGRST202' and 'Could not find the function' not in str(e):
+                raise
+            print(f"Trainingstag-RPC nicht verfügbar, lösche und schreibe neu: {e}")
+        
+        # 4. Ohne RPC: erst alle bestehenden Einträge für diesen Tag löschen
+        self.supabase.table('fact_training_win').delete().eq('date_key', date_key).execute()
+        
+        # 5. Neue Einträge für alle Spieler in einem Batch hinzufügen
+        response = self.supabase.table('fact_training_win').insert(
+            [dict(eintrag, date_key=date_key) for eintrag in neue_eintraege]
+        ).execute()
+        
+        if response.data:
+            return True, f"✅ {len(neue_eintraege)} Einträge erfolgreich gespeichert (date_key: {date_key})"
+        return False, "❌ Fehler beim Speichern in der Datenbank"
 
+    @instrumented
+    @cached_query(CACHE_TTL_TRAINING, "training", "players")
     def get_training_day_entries(self, datum):
         """Lade alle Einträge für einen bestimmten Trainingstag (neue Tabellenstruktur)"""
         self._ensure_connected()
@@ -805,33 +1681,26 @@ class DatabaseHelper:
             
             if response.data:
                 # Konvertiere zurück zum erwarteten Format für Kompatibilität
-                converted_data = []
-                for row in response.data:
-                    try:
-                        player_name = row.get('dim_player', {}).get('name', 'Unbekannt') if row.get('dim_player') else 'Unbekannt'
-                        hat_gewonnen = row.get('win_cnt', 0) > 0
-                        
-                        converted_data.append({
-                            'spielername': player_name,
-                            'datum': date_obj.isoformat(),
-                            'hat_gewonnen': hat_gewonnen,
-                            'date_key': date_key,
-                            'player_key': row.get('player_key'),
-                            'played_cnt': row.get('played_cnt', 1),
-                            'win_cnt': row.get('win_cnt', 0)
-                        })
-                    except Exception as e:
-                        print(f"Fehler bei der Verarbeitung eines Trainingseintrags: {e}")
-                        continue
-                
-                return converted_data
+                df = flatten_rows(response.data, {
+                    'spielername': ('dim_player.name', 'str', 'Unbekannt'),
+                    'hat_gewonnen': ('win_cnt', 'flag', False),
+                    'player_key': ('player_key', 'int', 0),
+                    'played_cnt': ('played_cnt', 'int', 1),
+                    'win_cnt': ('win_cnt', 'int', 0),
+                })
+                df.insert(1, 'datum', date_obj.isoformat())
+                df.insert(3, 'date_key', date_key)
+                return df.to_dict('records')
             else:
                 return []
                 
         except Exception as e:
             print(f"Fehler beim Laden der Trainingseinträge (neue Struktur): {e}")
+            self._mark_uncacheable()
             return []
 
+    @instrumented
+    @invalidates("training")
     def delete_training_day(self, datum):
         """Lösche alle Einträge für einen Trainingstag (neue Tabellenstruktur)"""
         self._ensure_connected()
@@ -855,6 +1724,7 @@ class DatabaseHelper:
                 date_obj = datum
             
             date_key = int(date_obj.strftime('%Y%m%d'))
+            self._replica_changed_since("training", date_key)
             
             # Lösche alle fact_training_win Einträge für diesen date_key
             response = self.supabase.table('fact_training_win').delete().eq('date_key', date_key).execute()
@@ -863,63 +1733,61 @@ class DatabaseHelper:
         except Exception as e:
             return False, f"❌ Fehler beim Löschen: {str(e)}"
     
+    @instrumented
+    @cached_query(CACHE_TTL_TRAINING, "training")
     def get_training_statistics(self, season_start=TRAINING_SEASON_START):
-        """Hole Trainingsstatistiken aus der Datenbank für die aktuelle Saison."""
-        df = self.get_training_victories(season_start=season_start)
-        
-        if df is None or len(df) == 0:
-            return {
-                'total_trainings': 0,
-                'total_victories': 0,
-                'latest_training_participants': 0,
-                'training_delta': 0,
-                'training_delta_text': "Keine Daten"
-            }
+        """Hole Trainingsstatistiken für die aktuelle Saison (aggregiert per RPC in der Datenbank)."""
+        self._ensure_connected()
         
-        # Statistiken berechnen
-        total_trainings = len(df['Datum'].unique())
-        total_victories = len(df[df['Sieg'] == True])
+        if self.connected:
+            try:
+                rows = self.call_rpc('training_statistics', {
+                    'p_season_start': season_start.isoformat() if season_start else None
+                })
+                # Leere Tabelle → wie bisher auf die lokale Berechnung (inkl. CSV-Fallback) ausweichen
+                if rows and rows[0].get('total_trainings'):
+                    row = rows[0]
+                    return build_training_statistics(
+                        row['total_trainings'], row['total_victories'],
+                        row.get('latest_participants'), row.get('previous_participants')
+                    )
+            except Exception as e:
+                print(f"Trainingsstatistik-RPC nicht verfügbar, berechne lokal: {e}")
         
-        # Letzte zwei Trainings für Delta-Berechnung
-        latest_dates = df['Datum'].unique()
-        latest_dates = sorted(latest_dates, reverse=True)
+        return self._compute_training_statistics(season_start=season_start)
+    
+    def _compute_training_statistics(self, season_start=TRAINING_SEASON_START):
+        """Berechnet die Trainingsstatistiken aus allen Trainingszeilen der Saison."""
+        df = self.get_training_victories(season_start=season_start)
         
-        latest_training_participants = 0
-        training_delta = 0
-        training_delta_text = "Keine Daten"
+        if df is None or len(df) == 0:
+            return build_training_statistics(0, 0)
         
-        if len(latest_dates) > 0:
-            # Teilnehmer des letzten Trainings (2 × Anzahl Siege)
-            latest_training = df[df['Datum'] == latest_dates[0]]
-            latest_victories = len(latest_training[latest_training['Sieg'] == True])
-            latest_training_participants = latest_victories * 2
-            
-            if len(latest_dates) > 1:
-                # Teilnehmer des vorletzten Trainings (2 × Anzahl Siege)
-                previous_training = df[df['Datum'] == latest_dates[1]]
-                previous_victories = len(previous_training[previous_training['Sieg'] == True])
-                previous_participants = previous_victories * 2
-                
-                training_delta = latest_training_participants - previous_participants
-                if training_delta > 0:
-                    training_delta_text = f"+ {training_delta}"
-                elif training_delta < 0:
-                    training_delta_text = f"{training_delta}"
-                else:
-                    training_delta_text = "±0"
-            else:
-                training_delta_text = "Erstes Training"
+        # Siege pro Trainingstag, neuester Tag zuerst
+        victories_per_day = df.groupby('Datum')['Sieg'].sum().sort_index(ascending=False)
+        # Teilnehmer eines Trainings = 2 × Anzahl Siege
+        participants = [int(victories) * 2 for victories in victories_per_day.iloc[:2]]
         
-        return {
-            'total_trainings': total_trainings,
-            'total_victories': total_victories,
-            'latest_training_participants': latest_training_participants,
-            'training_delta': training_delta,
-            'training_delta_text': training_delta_text
-        }
+        return build_training_statistics(
+            len(victories_per_day),
+            int(df['Sieg'].sum()),
+            participants[0] if len(participants) > 0 else None,
+            participants[1] if len(participants) > 1 else None
+        )
     
     def _fallback_training_victories(self, season_start=TRAINING_SEASON_START):
-        """Fallback: Lade Trainingsspielsiege aus CSV."""
+        """Fallback: Lade Trainingsspielsiege aus der lokalen Replik, sonst aus CSV."""
+        self._mark_uncacheable()
+        replica = self._replica_for(TRAINING_TABLES, sync=False)
+        if replica is not None:
+            try:
+                season_start_key = int(season_start.strftime('%Y%m%d')) if season_start else None
+                rows = replica.training_rows(season_start_key)
+                if rows:
+                    return self._training_frame(rows, season_start)
+            except Exception as e:
+                print(f"Fehler beim Lesen der Trainingsspielsiege aus der lokalen Replik: {e}")
+        
         try:
             df = pd.read_csv("VB_Trainingsspielsiege.csv", sep=";")
             
@@ -993,13 +1861,29 @@ class DatabaseHelper:
         except Exception as e:
             return False, f"❌ Verbindungstest fehlgeschlagen: {str(e)}"
     
+    def get_cache_stats(self):
+        """Hit/Miss-Zähler des Abfrage-Caches"""
+        return self.cache.get_stats()
+    
+    def get_query_metrics(self, recent=100):
+        """Kennzahlen pro Methode und die letzten Aufrufe (für die Diagnose-Seite)"""
+        return {
+            'methods': self.metrics.get_stats(),
+            'recent': self.metrics.recent(recent),
+        }
+    
     def get_connection_info(self):
         """Debug-Informationen über die Verbindung"""
         info = {
             'dotenv_available': DOTENV_AVAILABLE,
             'supabase_available': SUPABASE_AVAILABLE,
             'connection_attempted': self._connection_attempted,
-            'connected': self.connected
+            'connected': self.connected,
+            'health': self.get_connection_health(),
+            'cache': self.get_cache_stats(),
+            'replica': self.replica.get_status() if self.replica is not None else None,
+            'backend': 'postgres' if self.pg is not None else 'postgrest',
+            'journal': self.get_journal_status()
         }
         
         # Verfügbare Umgebungsvariablen prüfen
@@ -1010,6 +1894,7 @@ class DatabaseHelper:
         info['env_sources']['SUPABASE_ANON_KEY_env'] = bool(os.getenv("SUPABASE_ANON_KEY"))
         
         # Streamlit secrets
+        st = get_streamlit()
         try:
             info['env_sources']['SUPABASE_URL_secrets'] = bool(st.secrets.get("SUPABASE_URL"))
             info['env_sources']['SUPABASE_ANON_KEY_secrets'] = bool(st.secrets.get("SUPABASE_ANON_KEY"))
@@ -1028,8 +1913,10 @@ class DatabaseHelper:
         
         return info
 
+    @instrumented
+    @cached_query(CACHE_TTL_PENALTIES, "penalties", "players")
     def get_last_week_donkey(self):
-        """Ermittelt den Esel der letzten Woche basierend auf week_nr aus dim_date"""
+        """Ermittelt den Esel der letzten Kalenderwoche (Montag bis Sonntag)"""
         self._ensure_connected()
         
         if not self.connected:
@@ -1037,101 +1924,45 @@ class DatabaseHelper:
             return self._get_last_week_donkey_fallback()
         
         try:
-            # Aktuelle Kalenderwoche ermitteln
-            current_week = get_german_now().isocalendar()[1]  # ISO Kalenderwoche
-            current_year = get_german_now().year
-            last_week = current_week - 1
-            
-            # Behandle Jahreswechsel (Woche 1 des neuen Jahres -> letzte Woche des vorherigen Jahres)
-            if last_week <= 0:
-                last_week = 52  # oder 53, abhängig vom Jahr
-                current_year -= 1
-            
-            # Lade alle Strafen und filtere dann nach Woche
-            df_penalties = self.get_penalties()
-            
-            if df_penalties is None or len(df_penalties) == 0:
-                return None, 0, 0
-            
-            # Filtere nach letzter Woche
-            last_week_penalties = []
-            for _, row in df_penalties.iterrows():
-                penalty_date = row['Datum']
-                if hasattr(penalty_date, 'isocalendar'):
-                    penalty_week = penalty_date.isocalendar()[1]
-                    penalty_year = penalty_date.year
-                    
-                    if penalty_week == last_week and penalty_year == current_year:
-                        last_week_penalties.append(row)
-            
-            if not last_week_penalties:
-                return None, 0, 0
-            
-            # Konvertiere zu DataFrame für Aggregation
-            df_last_week = pd.DataFrame(last_week_penalties)
-            
-            # Berechne Spieler-Statistiken
-            player_stats = df_last_week.groupby('Spieler').agg({
-                'Betrag': ['sum', 'count']
-            }).round(2)
-            player_stats.columns = ['total_amount', 'count']
-            player_stats = player_stats.reset_index()
-            
-            if len(player_stats) > 0:
-                # Finde den Spieler mit der höchsten Strafen-Summe
-                top_player = player_stats.loc[player_stats['total_amount'].idxmax()]
-                donkey_name = top_player['Spieler']
-                donkey_amount = top_player['total_amount']
-                donkey_count = int(top_player['count'])
-                
-                return donkey_name, donkey_amount, donkey_count
+            # Montag bis Sonntag der letzten ISO-Kalenderwoche (auch über den Jahreswechsel)
+            today = get_german_now().date()
+            last_week_monday = today - timedelta(days=today.weekday() + 7)
+            last_week_sunday = last_week_monday + timedelta(days=6)
+
+            # Bevorzugt serverseitig aggregieren: eine Zeile statt aller Strafen der Woche
+            try:
+                rows = self.call_rpc('weekly_donkey', {
+                    'p_week_start': last_week_monday.isoformat(),
+                    'p_week_end': last_week_sunday.isoformat()
+                })
+                if not rows:
+                    return None, 0, 0
+                top = rows[0]
+                return top['player_name'], round(float(top['total_amount']), 2), int(top['penalty_count'])
+            except Exception as e:
+                print(f"Esel-RPC nicht verfügbar, berechne lokal: {e}")
+
+            # Nur die Strafen dieser Woche laden
+            df_last_week = self.get_penalties(
+                start=last_week_monday, end=last_week_sunday, columns=('Datum', 'Spieler', 'Betrag')
+            )
+            return get_week_donkey(compute_weekly_donkeys(df_last_week), last_week_monday)
                 
         except Exception as e:
             print(f"Fehler beim Laden des Esels der letzten Woche: {e}")
             # Fallback zur alten Methode
             return self._get_last_week_donkey_fallback()
-        
-        return None, 0, 0
     
     def _get_last_week_donkey_fallback(self):
         """Fallback-Methode für Esel der letzten Woche ohne DB-Verbindung"""
+        self._mark_uncacheable()
         try:
             # Lade Strafen aus CSV als Fallback
-            df_penalties = self._fallback_penalties()
-            
-            if df_penalties is None or len(df_penalties) == 0:
-                return None, 0, 0
-            
-            # Berechne letzte Woche mit datetime
-            from datetime import timedelta
-            today = get_german_now_naive()
-            days_since_monday = today.weekday()
+            df_penalties = self._fallback_penalties(columns=('Datum', 'Spieler', 'Betrag'))
             
-            # Letzte Woche Montag bis Sonntag
-            last_week_monday = today - timedelta(days=days_since_monday + 7)
-            last_week_sunday = last_week_monday + timedelta(days=6)
-            
-            # Filtere Strafen der letzten Woche
-            last_week_penalties = df_penalties[
-                (df_penalties['Datum'] >= last_week_monday) & 
-                (df_penalties['Datum'] <= last_week_sunday)
-            ]
-            
-            if len(last_week_penalties) > 0:
-                # Berechne Spieler-Statistiken
-                penalty_stats = last_week_penalties.groupby('Spieler').agg({
-                    'Betrag': ['sum', 'count']
-                }).round(2)
-                penalty_stats.columns = ['total_amount', 'count']
-                penalty_stats = penalty_stats.reset_index().sort_values('total_amount', ascending=False)
-                
-                if len(penalty_stats) > 0:
-                    top_player = penalty_stats.iloc[0]
-                    donkey_name = top_player['Spieler']
-                    donkey_amount = top_player['total_amount']
-                    donkey_count = int(top_player['count'])
-                    
-                    return donkey_name, donkey_amount, donkey_count
+            today = get_german_now().date()
+            last_week_monday = today - timedelta(days=today.weekday() + 7)
+            return get_week_donkey(compute_weekly_donkeys(df_penalties), last_week_monday)
             
         except Exception as e:
             print(f"Fehler beim Fallback für Esel der letzten Woche: {e}")
@@ -1146,6 +1977,17 @@ class DatabaseHelper:
             standings_data: List von Dictionaries mit Teamdaten
             season: Saison-String (z.B. "2425")
         """
+        return self.save_team_standings_batch([(season, standings_data)])
+
+    @instrumented
+    @invalidates("standings")
+    def save_team_standings_batch(self, season_standings):
+        """
+        Speichert mehrere Tabellen (z.B. mehrere Saisons oder Teams) in einem Insert
+        
+        Args:
+            season_standings: Liste von (season, standings_data)-Tupeln
+        """
         self._ensure_connected()
         
         if not self.connected:
@@ -1156,25 +1998,30 @@ class DatabaseHelper:
             
             # Bereite Daten für Einfügung vor
             insert_data = []
-            for team_data in standings_data:
-                insert_data.append({
-                    'team_name': team_data.get('team_name', ''),
-                    'season': season,
-                    'match_day': team_data.get('match_day'),
-                    'position': int(team_data.get('position', 0)),
-                    'games_played': int(team_data.get('games_played', 0)),
-                    'wins': int(team_data.get('wins', 0)),
-                    'draws': int(team_data.get('draws', 0)),
-                    'losses': int(team_data.get('losses', 0)),
-                    'goals_for': int(team_data.get('goals_for', 0)),
-                    'goals_against': int(team_data.get('goals_against', 0)),
-                    'goal_difference': int(team_data.get('goal_difference', 0)),
-                    'points': int(team_data.get('points', 0)),
-                    'scraped_at': current_time.isoformat()
-                })
+            for season, standings_data in season_standings:
+                for team_data in standings_data:
+                    insert_data.append({
+                        'team_name': team_data.get('team_name', ''),
+                        'team_key': resolve_team_key(team_data.get('team_name', '')),
+                        'season': season,
+                        'match_day': team_data.get('match_day'),
+                        'position': int(team_data.get('position', 0)),
+                        'games_played': int(team_data.get('games_played', 0)),
+                        'wins': int(team_data.get('wins', 0)),
+                        'draws': int(team_data.get('draws', 0)),
+                        'losses': int(team_data.get('losses', 0)),
+                        'goals_for': int(team_data.get('goals_for', 0)),
+                        'goals_against': int(team_data.get('goals_against', 0)),
+                        'goal_difference': int(team_data.get('goal_difference', 0)),
+                        'points': int(team_data.get('points', 0)),
+                        'scraped_at': current_time.isoformat()
+                    })
+            
+            if not insert_data:
+                return False, "❌ Keine Teamdaten zum Speichern"
             
             # Daten in Supabase einfügen
-            response = self.supabase.table('team_standings').insert(insert_data).execute()
+            response = self._insert_standings_rows(insert_data)
             
             if response.data:
                 return True, f"✅ {len(insert_data)} Teams erfolgreich gespeichert"
@@ -1184,54 +2031,109 @@ class DatabaseHelper:
         except Exception as e:
             return False, f"❌ Fehler beim Speichern: {str(e)}"
 
-    def get_latest_viktoria_data(self, season=CURRENT_STANDINGS_SEASON):
+    def _insert_standings_rows(self, rows):
+        """Fügt team_standings-Zeilen ein (ohne team_key, solange supabase_team_keys.sql fehlt)"""
+        if not self._team_key_columns:
+            rows = [{key: value for key, value in row.items() if key != 'team_key'} for row in rows]
+        try:
+            return self.supabase.table('team_standings').insert(rows).execute()
+        except Exception as e:
+            if not self._team_key_columns or not is_missing_column(e, 'team_key'):
+                raise
+            # Ohne Migration lieber ohne Schlüssel speichern als den Scrape zu verlieren
+            print(f"team_key fehlt in team_standings (supabase_team_keys.sql einspielen), speichere ohne: {e}")
+            self._team_key_columns = False
+            return self._insert_standings_rows(rows)
+
+    @instrumented
+    @cached_query(CACHE_TTL_STANDINGS_AGE, "standings")
+    def _load_standings_snapshot(self, season=CURRENT_STANDINGS_SEASON):
+        """Neueste Viktoria-Zeile und Zeitpunkt ihres Scrapes (meist eine Abfrage)"""
+        # Nur der Scrape mit Viktorias Gruppe zählt; Scrapes anderer Gruppen (z.B. Vorsaison-Abgleich)
+        # liegen in derselben Tabelle und wären sonst die "neueste" Zeile
+        row = None
+        if self._team_key_columns:
+            try:
+                row = self._latest_standing(season, lambda query: query.eq('team_key', VIKTORIA_TEAM_KEY))
+            except Exception as e:
+                if not is_missing_column(e, 'team_key'):
+                    raise
+                print(f"team_key fehlt in team_standings (supabase_team_keys.sql einspielen), suche per Name: {e}")
+                self._team_key_columns = False
+        if row is None:
+            # Fallback für Altdaten ohne team_key
+            row = self._latest_standing(season, lambda query: query.ilike('team_name', '%viktoria buchholz%'))
+        if row is None:
+            return None
+        
+        last_update = datetime.fromisoformat(row['scraped_at'].replace('Z', '+00:00'))
+        return {'row': row, 'last_update': convert_to_german_tz(last_update)}
+    
+    def _latest_standing(self, season, team_filter):
+        """Neueste team_standings-Zeile der Saison, die team_filter erfüllt (oder None)"""
+        query = self.supabase.table('team_standings').select('*').eq('season', season)
+        response = team_filter(query).order('scraped_at', desc=True).limit(1).execute()
+        return response.data[0] if response.data else None
+    
+    def get_standings_snapshot(self, season=CURRENT_STANDINGS_SEASON, max_age_hours=24):
         """
-        Lädt die neuesten Daten von TuS Viktoria Buchholz aus der Datenbank
+        Tabellenstand von Viktoria, letzte Aktualisierung, Alter und Aktualität in einem Aufruf
         
         Args:
             season: Saison-String (z.B. "2425")
+            max_age_hours: Maximales Alter in Stunden, bis die Daten als veraltet gelten
             
         Returns:
-            dict: Viktoria-Daten oder None bei Fehler
+            dict: viktoria (Frontend-Format oder None), last_update (datetime oder None),
+                  age_hours (float oder None), is_current (bool)
         """
+        snapshot = {'viktoria': None, 'last_update': None, 'age_hours': None, 'is_current': False}
         self._ensure_connected()
         
         if not self.connected:
-            return None
+            return snapshot
         
         try:
-            # Neueste Daten für Viktoria Buchholz laden
-            response = (self.supabase.table('team_standings')
-                       .select('*')
-                       .eq('season', season)
-                       .ilike('team_name', '%viktoria buchholz%')
-                       .order('scraped_at', desc=True)
-                       .limit(1)
-                       .execute())
-            
-            if response.data and len(response.data) > 0:
-                data = response.data[0]
-                
-                # Konvertiere zu dem Format, das das Frontend erwartet
-                viktoria_info = {
-                    'platz': f"{data['position']}.",
-                    'punkte': str(data['points']),
-                    'spiele': str(data['games_played']),
-                    'siege': str(data['wins']),
-                    'unentschieden': str(data['draws']),
-                    'niederlagen': str(data['losses']),
-                    'tore_geschossen': str(data['goals_for']),
-                    'tore_erhalten': str(data['goals_against']),
-                    'tordifferenz': str(data['goal_difference'])
-                }
-                
-                return viktoria_info
-                
-            return None
-            
+            loaded = self._load_standings_snapshot(season)
         except Exception as e:
-            print(f"Fehler beim Laden der Viktoria-Daten: {e}")
-            return None
+            print(f"Fehler beim Laden des Tabellenstands: {e}")
+            return snapshot
+        
+        if not loaded:
+            return snapshot
+        
+        data = loaded['row']
+        if data:
+            # Konvertiere zu dem Format, das das Frontend erwartet
+            snapshot['viktoria'] = {
+                'platz': f"{data['position']}.",
+                'punkte': str(data['points']),
+                'spiele': str(data['games_played']),
+                'siege': str(data['wins']),
+                'unentschieden': str(data['draws']),
+                'niederlagen': str(data['losses']),
+                'tore_geschossen': str(data['goals_for']),
+                'tore_erhalten': str(data['goals_against']),
+                'tordifferenz': str(data['goal_difference'])
+            }
+        
+        # Alter bei jedem Aufruf neu berechnen, nur die Abfrage wird gecacht
+        snapshot['last_update'] = loaded['last_update']
+        snapshot['age_hours'] = (get_german_now() - loaded['last_update']).total_seconds() / 3600
+        snapshot['is_current'] = snapshot['age_hours'] < max_age_hours
+        return snapshot
+
+    def get_latest_viktoria_data(self, season=CURRENT_STANDINGS_SEASON):
+        """
+        Lädt die neuesten Daten von TuS Viktoria Buchholz aus der Datenbank
+        
+        Args:
+            season: Saison-String (z.B. "2425")
+            
+        Returns:
+            dict: Viktoria-Daten oder None bei Fehler
+        """
+        return self.get_standings_snapshot(season)['viktoria']
 
     def is_standings_data_current(self, season=CURRENT_STANDINGS_SEASON, max_age_hours=24):
         """
@@ -1244,34 +2146,7 @@ class DatabaseHelper:
         Returns:
             bool: True wenn Daten aktuell sind
         """
-        self._ensure_connected()
-        
-        if not self.connected:
-            return False
-        
-        try:
-            # Neueste Daten laden
-            response = (self.supabase.table('team_standings')
-                       .select('scraped_at')
-                       .eq('season', season)
-                       .order('scraped_at', desc=True)
-                       .limit(1)
-                       .execute())
-            
-            if response.data and len(response.data) > 0:
-                last_update_str = response.data[0]['scraped_at']
-                last_update = datetime.fromisoformat(last_update_str.replace('Z', '+00:00'))
-                last_update_german = convert_to_german_tz(last_update)
-                now = get_german_now()
-                
-                age_hours = (now - last_update_german).total_seconds() / 3600
-                return age_hours < max_age_hours
-                
-            return False
-            
-        except Exception as e:
-            print(f"Fehler beim Prüfen der Datenaktualität: {e}")
-            return False
+        return self.get_standings_snapshot(season, max_age_hours)['is_current']
 
     def get_standings_last_update(self, season=CURRENT_STANDINGS_SEASON):
         """
@@ -1283,31 +2158,11 @@ class DatabaseHelper:
         Returns:
             datetime oder None: Zeitpunkt der letzten Aktualisierung
         """
-        self._ensure_connected()
-        
-        if not self.connected:
-            return None
-        
-        try:
-            response = (self.supabase.table('team_standings')
-                       .select('scraped_at')
-                       .eq('season', season)
-                       .order('scraped_at', desc=True)
-                       .limit(1)
-                       .execute())
-            
-            if response.data and len(response.data) > 0:
-                last_update_str = response.data[0]['scraped_at']
-                last_update = datetime.fromisoformat(last_update_str.replace('Z', '+00:00'))
-                return convert_to_german_tz(last_update)
-                
-            return None
-            
-        except Exception as e:
-            print(f"Fehler beim Laden des letzten Updates: {e}")
-            return None
+        return self.get_standings_snapshot(season)['last_update']
 
 
+    @instrumented
+    @cached_query(CACHE_TTL_STANDINGS, "standings")
     def get_team_standings_history(self, season=CURRENT_STANDINGS_SEASON, team_name="Viktoria Buchholz"):
         """
         Liefert den zeitlichen Verlauf der Tabellenplatzierungen aus Supabase
@@ -1318,17 +2173,12 @@ class DatabaseHelper:
             return pd.DataFrame(columns=['match_day', 'games_played', 'position', 'points', 'scraped_at'])
 
         try:
-            response = (self.supabase.table('team_standings')
-                       .select('match_day, games_played, position, points, scraped_at, team_name')
-                       .eq('season', season)
-                       .ilike('team_name', f'%{team_name}%')
-                       .order('scraped_at')
-                       .execute())
+            rows = self._read_team_standings(season, team_name)
 
-            if not response.data:
+            if not rows:
                 return pd.DataFrame(columns=['match_day', 'games_played', 'position', 'points', 'scraped_at'])
 
-            df = pd.DataFrame(response.data)
+            df = pd.DataFrame(rows)
             df['scraped_at'] = pd.to_datetime(df['scraped_at'], errors='coerce')
 
             for column in ['match_day', 'games_played', 'position', 'points']:
@@ -1347,8 +2197,68 @@ class DatabaseHelper:
 
         except Exception as e:
             print(f"Fehler beim Laden der Standings-Historie: {e}")
+            self._mark_uncacheable()
             return pd.DataFrame(columns=['match_day', 'games_played', 'position', 'points', 'scraped_at'])
 
+    def _read_team_standings(self, season, team_name):
+        """Alle Standings-Zeilen eines Teams: exakt über team_key, ohne Migration per ILIKE auf den Namen"""
+        columns = 'standing_id, match_day, games_played, position, points, scraped_at, team_name'
+        if self._team_key_columns:
+            team_key = resolve_team_key(team_name)
+            try:
+                return self.read_table(
+                    'team_standings', columns, ['standing_id'],
+                    filters=lambda query: query.eq('season', season).eq('team_key', team_key),
+                )
+            except Exception as e:
+                if not is_missing_column(e, 'team_key'):
+                    raise
+                print(f"team_key fehlt in team_standings (supabase_team_keys.sql einspielen), suche per Name: {e}")
+                self._team_key_columns = False
+        return self.read_table(
+            'team_standings', columns, ['standing_id'],
+            filters=lambda query: query.eq('season', season).ilike('team_name', f'%{team_name}%'),
+        )
+
+    @invalidates("standings")
+    def backfill_team_keys(self, page_size=PAGE_SIZE):
+        """
+        Trägt fehlende Team-Keys in Bestandszeilen nach (einmalig nach supabase_team_keys.sql)
+        
+        Die Keys kommen aus resolve_team_key, damit Bestandszeilen und neue Zeilen
+        garantiert denselben Schlüssel bekommen. Es wird je Teamname ein Update
+        geschickt, nicht je Zeile.
+        
+        Returns:
+            dict: "tabelle.spalte" → Anzahl aktualisierter Zeilen
+        """
+        self._ensure_connected()
+        
+        if not self.connected:
+            return {}
+        
+        updated = {}
+        for table, name_column, key_column in TEAM_KEY_COLUMNS:
+            count = 0
+            done = set()
+            while True:
+                rows = (self.supabase.table(table).select(name_column)
+                        .is_(key_column, 'null').not_.is_(name_column, 'null')
+                        .limit(page_size).execute().data or [])
+                names = {row[name_column] for row in rows} - done
+                if not names:
+                    break
+                for name in sorted(names):
+                    response = (self.supabase.table(table)
+                                .update({key_column: resolve_team_key(name)})
+                                .eq(name_column, name).is_(key_column, 'null')
+                                .execute())
+                    count += len(response.data or [])
+                # Schutz vor Endlosschleife, falls ein Update keine Zeilen trifft
+                done |= names
+            updated[f"{table}.{key_column}"] = count
+        return updated
+
 
 
 # Globale Instanz
@@ -0,0 +1,53 @@
+"""date_key (YYYYMMDD) und dim_date-Zeilen des Sternschemas.
+
+Ein Tag wird in fact_penalty/fact_training_win nur als date_key gespeichert;
+dim_date enthält die Zeile dazu (Woche, Monat, Wochentag).
+"""
+
+from datetime import datetime, timedelta
+
+
+def build_dim_date_row(date_obj):
+    """Zeile für dim_date zu einem Datum (date_key im Format YYYYMMDD)"""
+    return {
+        'date_key': int(date_obj.strftime('%Y%m%d')),
+        'full_date': date_obj.isoformat(),
+        'year': date_obj.year,
+        'month_nr': date_obj.month,
+        'month_name': date_obj.strftime('%B')[:10],
+        'quarter': (date_obj.month - 1) // 3 + 1,
+        'week_nr': date_obj.isocalendar()[1],
+        'weekday_nr': date_obj.weekday() + 1,
+        'weekday_name': date_obj.strftime('%A')[:10],
+        'is_weekend': date_obj.weekday() >= 5
+    }
+
+
+def build_dim_date_rows(start, end):
+    """dim_date-Zeilen für alle Tage von start bis end (jeweils inklusive)"""
+    return [build_dim_date_row(start + timedelta(days=offset)) for offset in range((end - start).days + 1)]
+
+
+def to_date_key(value):
+    """date/datetime/ISO-String → date_key (YYYYMMDD)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return int(value.strftime('%Y%m%d'))
+
+
+def date_key_partitions(start_date, end_date):
+    """
+    Disjunkte date_key-Bereiche je Kalenderjahr für parallele Lesezugriffe
+    
+    end_date bestimmt nur die Anzahl der Bereiche: der letzte ist nach oben offen,
+    damit auch Zeilen nach end_date (z.B. vorab eingetragene Tage) gelesen werden.
+    """
+    partitions = []
+    for year in range(start_date.year, end_date.year + 1):
+        lower = max(int(start_date.strftime('%Y%m%d')), year * 10000 + 101)
+        if year == end_date.year:
+            partitions.append(lambda query, lower=lower: query.gte('date_key', lower))
+        else:
+            upper = year * 10000 + 1231
+            partitions.append(lambda query, lower=lower, upper=upper: query.gte('date_key', lower).lte('date_key', upper))
+    return partitions
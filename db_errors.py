@@ -0,0 +1,52 @@
+"""Einordnung von Datenbankfehlern (PostgREST, psycopg) für Fallbacks und Wiederholungen.
+
+Die Fehlerklassen von supabase-py/postgrest und psycopg werden nicht importiert
+(optionale Abhängigkeiten); entschieden wird über ``code``/``sqlstate`` und den
+Modulnamen der Exception.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+# PostgREST: Spalte nicht im Schema-Cache; Postgres: undefined_column
+MISSING_COLUMN_CODES = ("PGRST204", "42703")
+
+
+def error_code(error: Any) -> str:
+    """PostgREST-Code bzw. SQLSTATE einer Exception ('' ohne Code)."""
+    return str(getattr(error, "code", None) or getattr(error, "sqlstate", None) or "")
+
+
+def is_missing_column(error: Any, *columns: str) -> bool:
+    """Eine der Spalten fehlt in der Tabelle (zugehörige supabase_*.sql noch nicht eingespielt)."""
+    message = str(error)
+    return error_code(error) in MISSING_COLUMN_CODES and any(column in message for column in columns)
+
+# Fehlercodes, bei denen die Datenbank nicht erreichbar/überlastet ist (nicht die Anfrage falsch)
+CONNECTION_ERROR_CODES = {"PGRST000", "PGRST001", "PGRST002", "PGRST003"}
+CONNECTION_SQLSTATE_CLASSES = ("08", "53", "57")
+
+
+def is_missing_request_id(error: Any) -> bool:
+    """request_id-Spalte oder ihr Unique-Index fehlt (supabase_write_journal.sql nicht eingespielt)."""
+    if error_code(error) == "42P10":
+        # ON CONFLICT (request_id) ohne passenden Unique-Index
+        return True
+    return is_missing_column(error, "request_id")
+
+
+def is_connection_error(error: Any) -> bool:
+    """Netzwerk-, Timeout- oder Verfügbarkeitsfehler (vorübergehend) statt einer abgelehnten Anfrage."""
+    if isinstance(error, (ConnectionError, TimeoutError, OSError)):
+        return True
+    module = type(error).__module__.split(".")[0]
+    if module in ("httpx", "httpcore", "psycopg_pool"):
+        return True
+    if module == "psycopg" and type(error).__name__ in ("OperationalError", "InterfaceError"):
+        return True
+    code = error_code(error)
+    if code in CONNECTION_ERROR_CODES or (len(code) == 5 and code[:2] in CONNECTION_SQLSTATE_CLASSES):
+        return True
+    # HTML-Fehlerseiten von Gateway/Pooler (502/503/504) meldet postgrest-py mit dem HTTP-Status als Code
+    return code in ("502", "503", "504")
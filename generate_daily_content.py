@@ -266,7 +266,7 @@ def store_daily_content(
     ).execute()
 
 
-def main() -> None:
+def main(supabase: Optional[Client] = None) -> None:
     schema_overview = get_schema_overview()
     example_questions = generate_example_questions(schema_overview)
     fact_questions = generate_fact_questions(schema_overview)
@@ -274,7 +274,8 @@ def main() -> None:
     agent = build_agent()
     facts = generate_facts(agent, fact_questions)
 
-    supabase = _create_supabase_client()
+    if supabase is None:
+        supabase = _create_supabase_client()
     generation_timestamp = datetime.now(tz=GERMAN_TZ)
 
     store_daily_content(
@@ -0,0 +1,148 @@
+"""Gemeinsamer HTTP-Client für Scraper und Dashboard.
+
+Alle ausgehenden Requests (fussball.de, Fonts, Wetter-API) laufen über eine
+Session mit Keep-Alive-Pools, damit Verbindungen und TLS-Sessions
+wiederverwendet werden. Zusätzlich gibt es Standard-Timeouts, eine
+Größenbegrenzung für Antworten und einfache Request-Metriken je Host.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+DEFAULT_TIMEOUT = (5, 15)  # (Verbindungsaufbau, Lesen) in Sekunden
+DEFAULT_MAX_RESPONSE_BYTES = 5 * 1024 * 1024
+DEFAULT_PER_HOST_CONNECTIONS = 4
+DEFAULT_HOST_POOLS = 10
+
+
+class ResponseTooLargeError(requests.RequestException):
+    """Antwort überschreitet die konfigurierte Maximalgröße."""
+
+
+class HttpClient:
+    """Thread-sicherer HTTP-Client mit Connection-Pooling und Metriken."""
+
+    def __init__(
+        self,
+        timeout=DEFAULT_TIMEOUT,
+        max_response_bytes: int = DEFAULT_MAX_RESPONSE_BYTES,
+        per_host_connections: int = DEFAULT_PER_HOST_CONNECTIONS,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.timeout = timeout
+        self.max_response_bytes = max_response_bytes
+        self.per_host_connections = per_host_connections
+        self.headers = dict(DEFAULT_HEADERS if headers is None else headers)
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        session.headers.update(self.headers)
+        # pool_block=True: pool_maxsize wirkt als Verbindungslimit pro Host
+        adapter = HTTPAdapter(
+            pool_connections=DEFAULT_HOST_POOLS,
+            pool_maxsize=self.per_host_connections,
+            pool_block=True,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        timeout=None,
+        max_bytes: Optional[int] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """Führt einen Request aus und liest die Antwort mit Größenlimit vollständig ein."""
+        host = urlsplit(url).netloc
+        limit = self.max_response_bytes if max_bytes is None else max_bytes
+        started = time.perf_counter()
+        size = 0
+        status = None
+        try:
+            with self.session.request(
+                method, url, timeout=timeout or self.timeout, stream=True, **kwargs
+            ) as response:
+                status = response.status_code
+                declared = response.headers.get("Content-Length")
+                if limit and declared and declared.isdigit() and int(declared) > limit:
+                    raise ResponseTooLargeError(f"Antwort von {host} zu groß: {declared} Bytes")
+
+                chunks = []
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    size += len(chunk)
+                    if limit and size > limit:
+                        raise ResponseTooLargeError(f"Antwort von {host} überschreitet {limit} Bytes")
+                    chunks.append(chunk)
+                response._content = b"".join(chunks)
+            self._record(host, time.perf_counter() - started, size, status, error=False)
+            return response
+        except Exception:
+            self._record(host, time.perf_counter() - started, size, status, error=True)
+            raise
+
+    def _record(self, host: str, seconds: float, size: int, status, error: bool) -> None:
+        with self._metrics_lock:
+            entry = self._metrics.setdefault(
+                host,
+                {"requests": 0, "errors": 0, "bytes": 0, "total_seconds": 0.0, "max_seconds": 0.0, "status_codes": {}},
+            )
+            entry["requests"] += 1
+            entry["bytes"] += size
+            entry["total_seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+            if error:
+                entry["errors"] += 1
+            if status is not None:
+                entry["status_codes"][status] = entry["status_codes"].get(status, 0) + 1
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Liefert eine Kopie der Request-Metriken pro Host."""
+        with self._metrics_lock:
+            snapshot = {}
+            for host, entry in self._metrics.items():
+                copied = dict(entry, status_codes=dict(entry["status_codes"]))
+                copied["avg_seconds"] = entry["total_seconds"] / entry["requests"] if entry["requests"] else 0.0
+                snapshot[host] = copied
+            return snapshot
+
+    def reset_metrics(self) -> None:
+        with self._metrics_lock:
+            self._metrics.clear()
+
+    def close(self) -> None:
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+# Globale Instanz
+http_client = HttpClient()
@@ -0,0 +1,365 @@
+"""Lokale SQLite-Kopie des Sternschemas für schnelle Lesezugriffe und Offline-Betrieb.
+
+Die Replik wird inkrementell über Wasserstände (höchster bekannter Schlüssel)
+aus Supabase nachgezogen. Kleine oder schlüssellose Tabellen werden komplett
+ersetzt. Schreibende DatabaseHelper-Methoden markieren ihre Tabellen über die
+Cache-Tags als veraltet, damit lokale Änderungen beim nächsten Lesen per
+Wasserstand nachgezogen werden. Gelöschte Zeilen werden über einen Abgleich der
+Schlüssel erkannt – nach lokalen Löschungen sofort, sonst nur alle
+reconcile_interval Sekunden. Änderungen anderer Prozesse erscheinen spätestens
+nach dem Sync-Intervall.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class ReplicaTable:
+    """Sync-Strategie einer Tabelle.
+
+    mode "watermark": nur Zeilen mit watermark-Spalte >= / > dem lokalen Höchstwert laden,
+    mode "full": Tabelle bei jedem Sync komplett ersetzen.
+    """
+
+    name: str
+    key_columns: Tuple[str, ...] = ()
+    mode: str = "full"
+    watermark: Optional[str] = None
+    # Letzten Wasserstand erneut laden (z.B. Trainingstag, der noch Zeilen bekommt)
+    inclusive: bool = False
+    # Gelöschte Zeilen über einen Abgleich der Schlüssel erkennen (alle reconcile_interval Sekunden)
+    reconcile: bool = False
+    reconcile_interval: float = 3600.0
+    interval: float = 60.0
+    tags: Tuple[str, ...] = ()
+
+
+REPLICA_TABLES = (
+    ReplicaTable("dim_player", ("player_key",), interval=600, tags=("players",)),
+    ReplicaTable("dim_penalty_type", ("penalty_type_key",), interval=600, tags=("penalty_types",)),
+    # Klein, und neue Tage können vor dem höchsten date_key liegen → kein Wasserstand
+    ReplicaTable("dim_date", ("date_key",), interval=600),
+    ReplicaTable("fact_penalty", ("penalty_id",), mode="watermark", watermark="penalty_id",
+                 reconcile=True, tags=("penalties",)),
+    ReplicaTable("fact_training_win", ("date_key", "player_key"), mode="watermark", watermark="date_key",
+                 inclusive=True, reconcile=True, tags=("training",)),
+    ReplicaTable("team_standings", ("standing_id",), mode="watermark", watermark="standing_id",
+                 interval=300, tags=("standings",)),
+    ReplicaTable("matches", interval=3600),
+    ReplicaTable("events", interval=3600),
+    ReplicaTable("lineups", interval=3600),
+)
+
+# Tabellen, die get_penalties bzw. get_training_victories aus der Replik benötigen
+PENALTY_TABLES = ("fact_penalty", "dim_player", "dim_penalty_type")
+TRAINING_TABLES = ("fact_training_win", "dim_player")
+
+# fetch(table, columns, key_columns, filters) → Liste von Zeilen (DatabaseHelper.read_table)
+Fetch = Callable[..., List[Dict[str, Any]]]
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _to_sqlite(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+class LocalReplica:
+    """SQLite-Replik ausgewählter Supabase-Tabellen (thread-sicher, eine Verbindung pro Prozess)."""
+
+    def __init__(
+        self,
+        path: str,
+        tables: Sequence[ReplicaTable] = REPLICA_TABLES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.tables = {table.name: table for table in tables}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._stale: set = set()
+        self._deleted: set = set()
+        # Tabelle → kleinster geänderter Wasserstand (z.B. nachgetragener Trainingstag)
+        self._changed_since: Dict[str, Any] = {}
+        self._reconciled_at: Dict[str, float] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("pragma journal_mode=wal")
+            self._conn.execute(
+                "create table if not exists _replica_meta ("
+                "table_name text primary key, watermark, synced_at real, row_count integer)"
+            )
+
+    # --- Sync -------------------------------------------------------------
+
+    def mark_stale(self, *tags: str, deleted: bool = False, since: Any = None) -> None:
+        """Tabellen mit diesen Cache-Tags beim nächsten Zugriff nachziehen.
+
+        deleted: es wurden Zeilen gelöscht → Schlüssel beim nächsten Sync abgleichen.
+        since: Änderungen ab diesem Wasserstand (auch unterhalb des lokalen Höchstwerts)
+        → diesen Bereich neu laden und ersetzen.
+        """
+        wanted = set(tags)
+        with self._lock:
+            names = [name for name, table in self.tables.items() if wanted & set(table.tags)]
+            self._stale.update(names)
+            if deleted:
+                self._deleted.update(names)
+            if since is not None:
+                for name in names:
+                    if self.tables[name].watermark:
+                        current = self._changed_since.get(name)
+                        self._changed_since[name] = since if current is None else min(current, since)
+
+    def due_tables(self, tables: Optional[Iterable[str]] = None) -> List[str]:
+        """Tabellen, deren Sync-Intervall abgelaufen ist oder die als veraltet markiert sind."""
+        now = self._clock()
+        meta = self._meta()
+        due = []
+        for name in tables or self.tables:
+            synced_at = meta.get(name, {}).get("synced_at")
+            if name in self._stale or synced_at is None or now - synced_at >= self.tables[name].interval:
+                due.append(name)
+        return due
+
+    def sync(self, fetch: Fetch, tables: Optional[Iterable[str]] = None, force: bool = False) -> Dict[str, int]:
+        """
+        Zieht fällige Tabellen nach und liefert die Anzahl geladener Zeilen pro Tabelle
+
+        Fehler (z.B. offline) werden an den Aufrufer weitergegeben; bereits
+        synchronisierte Tabellen bleiben erhalten.
+        """
+        with self._sync_lock:
+            names = list(tables or self.tables) if force else self.due_tables(tables)
+            loaded = {}
+            for name in names:
+                table = self.tables[name]
+                with self._lock:
+                    deleted = name in self._deleted
+                    since = self._changed_since.get(name)
+                last_reconcile = self._reconciled_at.get(name)
+                reconcile = table.reconcile and (
+                    deleted or last_reconcile is None or self._clock() - last_reconcile >= table.reconcile_interval
+                )
+                loaded[name] = self._sync_table(fetch, table, full=force, reconcile=reconcile, since=since)
+                with self._lock:
+                    self._stale.discard(name)
+                    self._deleted.discard(name)
+                    if self._changed_since.get(name) == since:
+                        self._changed_since.pop(name, None)
+            return loaded
+
+    def _sync_table(self, fetch: Fetch, table: ReplicaTable, full: bool, reconcile: bool = False,
+                    since: Any = None) -> int:
+        meta = self._meta().get(table.name, {})
+        watermark = meta.get("watermark")
+        incremental = table.mode == "watermark" and not full and watermark is not None
+        live_keys = None
+        resync_from = None
+
+        if incremental:
+            op, lower = ("gte" if table.inclusive else "gt"), watermark
+            if since is not None and since <= watermark:
+                # Geänderter Bereich unterhalb des Wasserstands: ab dort neu laden und ersetzen
+                op, lower = "gte", since
+                resync_from = since
+            rows = fetch(table.name, "*", list(table.key_columns),
+                         filters=lambda query: getattr(query, op)(table.watermark, lower))
+            if reconcile:
+                live_keys = fetch(table.name, ", ".join(table.key_columns), list(table.key_columns))
+        else:
+            rows = fetch(table.name, "*", list(table.key_columns))
+
+        with self._lock:
+            self._conn.execute("begin")
+            try:
+                self._ensure_columns(table, rows)
+                if not incremental and self._table_exists(table.name):
+                    self._conn.execute(f"delete from {_quote(table.name)}")
+                self._upsert(table, rows)
+                if live_keys is not None:
+                    self._delete_missing(table, live_keys)
+                elif resync_from is not None:
+                    self._delete_missing(table, rows, since=resync_from)
+                self._write_meta(table)
+                self._conn.execute("commit")
+            except Exception:
+                self._conn.execute("rollback")
+                raise
+        if live_keys is not None or not incremental:
+            self._reconciled_at[table.name] = self._clock()
+        return len(rows)
+
+    def _ensure_columns(self, table: ReplicaTable, rows: List[Dict[str, Any]]) -> None:
+        columns = list(dict.fromkeys([*table.key_columns, *(column for row in rows for column in row)]))
+        name = _quote(table.name)
+        existing = [row["name"] for row in self._conn.execute(f"pragma table_info({name})")]
+        if not existing:
+            if not columns:
+                return
+            self._conn.execute(f"create table {name} ({', '.join(_quote(column) for column in columns)})")
+            if table.key_columns:
+                key_list = ", ".join(_quote(column) for column in table.key_columns)
+                self._conn.execute(f"create unique index {_quote(table.name + '_pkey')} on {name} ({key_list})")
+            return
+        for column in columns:
+            if column not in existing:
+                self._conn.execute(f"alter table {name} add column {_quote(column)}")
+
+    def _upsert(self, table: ReplicaTable, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        columns = list(dict.fromkeys(column for row in rows for column in row))
+        verb = "insert or replace" if table.key_columns else "insert"
+        sql = (f"{verb} into {_quote(table.name)} ({', '.join(_quote(column) for column in columns)}) "
+               f"values ({', '.join('?' for _ in columns)})")
+        self._conn.executemany(sql, [tuple(_to_sqlite(row.get(column)) for column in columns) for row in rows])
+
+    def _delete_missing(self, table: ReplicaTable, live_keys: List[Dict[str, Any]], since: Any = None) -> None:
+        """Löscht lokale Zeilen, deren Schlüssel nicht in live_keys ist (mit since nur ab diesem Wasserstand)."""
+        keys = table.key_columns
+        if not keys or not self._table_exists(table.name):
+            return
+        live = {tuple(row[column] for column in keys) for row in live_keys}
+        key_list = ", ".join(_quote(column) for column in keys)
+        where, params = "", ()
+        if since is not None:
+            where, params = f" where {_quote(table.watermark)} >= ?", (since,)
+        local = self._conn.execute(f"select {key_list} from {_quote(table.name)}{where}", params).fetchall()
+        missing = [tuple(row) for row in local if tuple(row) not in live]
+        if missing:
+            condition = " and ".join(f"{_quote(column)} = ?" for column in keys)
+            self._conn.executemany(f"delete from {_quote(table.name)} where {condition}", missing)
+
+    def _write_meta(self, table: ReplicaTable) -> None:
+        name = _quote(table.name)
+        if not self._table_exists(table.name):
+            watermark, count = None, 0
+        else:
+            count = self._conn.execute(f"select count(*) from {name}").fetchone()[0]
+            watermark = None
+            if table.watermark:
+                watermark = self._conn.execute(f"select max({_quote(table.watermark)}) from {name}").fetchone()[0]
+        self._conn.execute(
+            "insert or replace into _replica_meta (table_name, watermark, synced_at, row_count) values (?, ?, ?, ?)",
+            (table.name, watermark, self._clock(), count),
+        )
+
+    # --- Lesen ------------------------------------------------------------
+
+    def _table_exists(self, name: str) -> bool:
+        return self._conn.execute(
+            "select 1 from sqlite_master where type = 'table' and name = ?", (name,)
+        ).fetchone() is not None
+
+    def _has_table(self, name: str) -> bool:
+        with self._lock:
+            return self._table_exists(name)
+
+    def _meta(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("select * from _replica_meta").fetchall()
+        return {row["table_name"]: dict(row) for row in rows}
+
+    def is_synced(self, tables: Iterable[str]) -> bool:
+        """True, wenn alle Tabellen mindestens einmal synchronisiert wurden."""
+        meta = self._meta()
+        return all(meta.get(name, {}).get("synced_at") is not None for name in tables)
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+    def query_tuples(self, sql: str, params: Sequence[Any] = (), table: Optional[str] = None) -> List[Tuple[Any, ...]]:
+        """Ergebnis als Zeilentupel ohne Dict pro Zeile (für analytics_reader); [] ohne die Tabelle."""
+        with self._lock:
+            if table is not None and not self._table_exists(table):
+                return []
+            cursor = self._conn.cursor()
+            cursor.row_factory = None
+            return cursor.execute(sql, params).fetchall()
+
+    def penalty_rows(
+        self,
+        start_key: Optional[int] = None,
+        end_key: Optional[int] = None,
+        players: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Strafen im Zeilenformat der PostgREST-Abfrage von get_penalties (neueste zuerst)."""
+        if not self._has_table("fact_penalty"):
+            return []
+        conditions, params = [], []
+        if start_key is not None:
+            conditions.append("f.date_key >= ?")
+            params.append(start_key)
+        if end_key is not None:
+            conditions.append("f.date_key <= ?")
+            params.append(end_key)
+        if players is not None:
+            names = list(players)
+            conditions.append(f"p.name in ({', '.join('?' for _ in names)})")
+            params.extend(names)
+        where = f"where {' and '.join(conditions)}" if conditions else ""
+        rows = self.query(
+            "select f.penalty_id, f.date_key, f.amount_eur, f.note, p.name as player_name, "
+            "t.description as penalty_description "
+            "from fact_penalty f "
+            "left join dim_player p on p.player_key = f.player_key "
+            "left join dim_penalty_type t on t.penalty_type_key = f.penalty_type_key "
+            f"{where} order by f.penalty_id desc",
+            params,
+        )
+        for row in rows:
+            name, description = row.pop("player_name"), row.pop("penalty_description")
+            row["dim_player"] = {"name": name} if name is not None else None
+            row["dim_penalty_type"] = {"description": description} if description is not None else None
+        return rows
+
+    def training_rows(self, start_key: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Trainingssiege im Zeilenformat der PostgREST-Abfrage von get_training_victories."""
+        if not self._has_table("fact_training_win"):
+            return []
+        where, params = ("where w.date_key >= ?", [start_key]) if start_key is not None else ("", [])
+        rows = self.query(
+            "select w.date_key, w.player_key, w.win_cnt, p.name as player_name "
+            "from fact_training_win w left join dim_player p on p.player_key = w.player_key "
+            f"{where} order by w.date_key desc, w.player_key desc",
+            params,
+        )
+        for row in rows:
+            name = row.pop("player_name")
+            row["dim_player"] = {"name": name} if name is not None else None
+        return rows
+
+    def get_status(self) -> Dict[str, Any]:
+        """Wasserstand, Zeilenzahl und Alter pro Tabelle (für get_connection_info)."""
+        now = self._clock()
+        return {
+            "path": self.path,
+            "tables": {
+                name: {
+                    "watermark": meta.get("watermark"),
+                    "rows": meta.get("row_count"),
+                    "age_seconds": round(now - meta["synced_at"], 1) if meta.get("synced_at") else None,
+                }
+                for name, meta in self._meta().items()
+            },
+            "stale": sorted(self._stale),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -3,16 +3,17 @@ from streamlit_option_menu import option_menu
 import sys
 import os
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 
 # Add the pages directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'pages'))
 
-from pages import startseite, teamkalender, trainingsstatistiken, esel_der_woche
+from pages import startseite, teamkalender, trainingsstatistiken, esel_der_woche, diagnose
 import pages.buchholz_ki as buchholz_ki
 from database_helper import db
 from season_config import TRAINING_SEASON_START
 from timezone_helper import get_german_date_now
+from streamlit_helper import get_secret
 
 # Page configuration
 st.set_page_config(
@@ -224,7 +225,7 @@ def show_token_training_wins_input():
             else:
                 try:
                     # Save to database
-                    success, message = db.add_training_day_entries(
+                    success, message = db.enqueue_training_day(
                         datum=date_str,
                         spieler_mit_sieg=selected_players,
                         alle_spieler=alle_verfuegbare_spieler
@@ -444,16 +445,16 @@ def show_token_penalty_input():
                 }
 
                 # Save to database
-                success = db.add_penalty(new_penalty)
+                success, message = db.enqueue_penalty(new_penalty)
 
                 if success:
-                    st.success("💾 Strafe wurde in der Datenbank gespeichert!")
+                    st.success(message)
 
                     # Refresh the page to show updated data
                     st.info("🔄 Seite wird aktualisiert...")
                     st.rerun()
                 else:
-                    st.error("❌ Fehler beim Speichern in der Datenbank!")
+                    st.error(message)
                     st.info("💡 Die Strafe konnte nicht gespeichert werden, bitte versuchen Sie es erneut.")
 
             except Exception as e:
@@ -494,14 +495,14 @@ def show_token_penalty_input():
                 }
 
                 # Save to database
-                success = db.add_penalty(new_penalty)
+                success, message = db.enqueue_penalty(new_penalty)
 
                 if success:
                     st.success(f"✅ Schnell-Strafe für **{spieler}** hinzugefügt: {strafe_typ} (€{betrag:.2f})")
                     st.info("🔄 Seite wird aktualisiert...")
                     st.rerun()
                 else:
-                    st.error("❌ Fehler beim Speichern in der Datenbank!")
+                    st.error(message)
 
             except Exception as e:
                 st.error(f"❌ Fehler beim Speichern: {str(e)}")
@@ -560,13 +561,14 @@ def show_token_penalty_input():
         
         # Load penalties from database
         try:
-            df_strafen = db.get_penalties()
+            # Zähler per count-Abfrage, Spieler aus dim_player; die Liste wird gefiltert geladen
+            penalty_count = db.count_penalties()
             
-            if df_strafen is None or len(df_strafen) == 0:
+            if not penalty_count:
                 st.info("📋 Keine Strafen in der Datenbank gefunden.")
             else:
                 # Display current penalty count
-                st.metric("📊 Strafen in der Datenbank", len(df_strafen))
+                st.metric("📊 Strafen in der Datenbank", penalty_count)
                 
                 # Filters for better management
                 st.markdown("#### 🔍 Filter")
@@ -574,7 +576,7 @@ def show_token_penalty_input():
                 
                 with col1:
                     # Player filter
-                    unique_players = sorted(df_strafen['Spieler'].unique())
+                    unique_players = db.get_player_names()
                     player_filter = st.selectbox("👤 Spieler", ["Alle"] + [p.capitalize() for p in unique_players], key="manage_player_filter")
                 
                 with col2:
@@ -586,27 +588,22 @@ def show_token_penalty_input():
                     # Number of entries to show
                     show_count = st.selectbox("📄 Anzeigen", [20, 50, 100, "Alle"], key="manage_show_count")
                 
-                # Apply filters
-                filtered_df = df_strafen.copy()
-                
-                # Player filter
+                # Apply filters (direkt in der Datenbankabfrage)
+                player_names = None
                 if player_filter != "Alle":
                     original_name = unique_players[[p.capitalize() for p in unique_players].index(player_filter)]
-                    filtered_df = filtered_df[filtered_df['Spieler'] == original_name]
+                    player_names = (original_name,)
                 
-                # Date filter
+                start_date = None
+                today = get_german_date_now()
                 if date_filter == "Letzte 7 Tage":
-                    from datetime import datetime, timedelta
-                    cutoff_date = datetime.now() - timedelta(days=7)
-                    filtered_df = filtered_df[filtered_df['Datum'] >= cutoff_date]
+                    start_date = today - timedelta(days=7)
                 elif date_filter == "Letzte 30 Tage":
-                    from datetime import datetime, timedelta
-                    cutoff_date = datetime.now() - timedelta(days=30)
-                    filtered_df = filtered_df[filtered_df['Datum'] >= cutoff_date]
+                    start_date = today - timedelta(days=30)
                 elif date_filter == "Diesen Monat":
-                    from datetime import datetime, timedelta
-                    current_month = datetime.now().replace(day=1)
-                    filtered_df = filtered_df[filtered_df['Datum'] >= current_month]
+                    start_date = today.replace(day=1)
+                
+                filtered_df = db.get_penalties(start=start_date, players=player_names)
                 
                 # Limit number of entries
                 if show_count != "Alle":
@@ -790,6 +787,18 @@ def main():
         show_token_training_wins_input()
         return
     
+    # Admin-only diagnostics (query metrics, cache, connection info)
+    if mode == "diagnostics":
+        SECRET_TOKEN = get_secret("DIAGNOSTICS_TOKEN", section=None)
+        
+        if not SECRET_TOKEN or token != SECRET_TOKEN:
+            st.error("❌ Zugriff verweigert")
+            st.warning("🔒 Ungültiger Token für die Diagnose-Seite")
+            st.stop()
+        
+        diagnose.show()
+        return
+    
     # Normal application flow
     # Header
     st.markdown("""
@@ -839,6 +848,29 @@ def main():
             }
         )
     
+        # Hinweis, solange die Datenbank nicht erreichbar ist (Circuit Breaker offen)
+        health = db.get_connection_health()
+        if health['state'] in ('open', 'half_open'):
+            retry = health['retry_in_seconds']
+            st.warning("⚠️ Datenbank nicht erreichbar – es werden lokale Daten angezeigt."
+                       + (f" Neuer Versuch in {retry:.0f} s." if retry else ""))
+        
+        # Bereits bestätigte, aber endgültig nicht gespeicherte Einträge (Write-Journal)
+        failed_writes = db.get_failed_writes()
+        if failed_writes:
+            st.error(f"❌ {len(failed_writes)} Eintrag/Einträge konnten nicht gespeichert werden – bitte erneut erfassen.")
+            with st.expander("Nicht gespeicherte Einträge"):
+                for entry in failed_writes:
+                    payload = entry['payload']
+                    if entry['kind'] == 'penalty':
+                        st.write(f"🤡 {payload.get('Datum')} · {payload.get('Spieler')}: {payload.get('Strafe')} "
+                                 f"({payload.get('Betrag')} €) – {entry['error']}")
+                    else:
+                        st.write(f"🏃 Trainingstag {payload.get('datum')} – {entry['error']}")
+                if st.button("✅ Zur Kenntnis genommen", key="ack_failed_writes"):
+                    db.acknowledge_failed_writes([entry['id'] for entry in failed_writes])
+                    st.rerun()
+    
     # Page routing
     if selected == "Startseite":
         startseite.show()
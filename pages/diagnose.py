@@ -0,0 +1,71 @@
+import streamlit as st
+import pandas as pd
+from dataclasses import asdict
+from database_helper import db
+
+
+def show():
+    st.title("🩺 Diagnose")
+    st.subheader("Datenbank-Abfragen, Cache und Verbindung")
+
+    metrics = db.get_query_metrics(recent=200)
+    methods = metrics['methods']
+    cache = db.get_cache_stats()
+
+    # Kennzahlen
+    calls = sum(values['calls'] for values in methods.values())
+    errors = sum(values['errors'] for values in methods.values())
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("📞 Aufrufe", calls)
+    with col2:
+        st.metric("❌ Fehler", errors)
+    with col3:
+        st.metric("🎯 Cache-Trefferquote", f"{cache['hit_rate']:.0%}")
+    with col4:
+        st.metric("🗂️ Cache-Einträge", cache['entries'])
+
+    st.markdown("### ⏱️ Methoden (langsamste zuerst)")
+    if methods:
+        overview = pd.DataFrame([
+            {
+                'Methode': name,
+                'Aufrufe': values['calls'],
+                'Cache-Treffer': values['cache_hits'],
+                'Fehler': values['errors'],
+                'Ø ms': values['avg_ms'],
+                'p50 ms': values['p50_ms'],
+                'p95 ms': values['p95_ms'],
+                'max ms': round(values['max_ms'], 1),
+                'Zeilen': values['rows'],
+                'KB': round(values['bytes'] / 1024, 1),
+            }
+            for name, values in methods.items()
+        ])
+        st.dataframe(overview, use_container_width=True, hide_index=True)
+
+        selected = st.selectbox("Latenz-Histogramm", list(methods.keys()))
+        histogram = pd.Series(methods[selected]['histogram'], name="Aufrufe")
+        st.bar_chart(histogram)
+    else:
+        st.info("📋 Noch keine Abfragen in diesem Prozess")
+
+    st.markdown("### 🕒 Letzte Aufrufe")
+    if metrics['recent']:
+        st.dataframe(pd.DataFrame([asdict(event) for event in metrics['recent']]),
+                     use_container_width=True, hide_index=True)
+
+    if st.button("🔄 Zähler zurücksetzen"):
+        db.metrics.reset()
+        db.cache.reset_stats()
+        st.rerun()
+
+    st.markdown("### 🔌 Verbindung")
+    health = db.get_connection_health()
+    st.write(f"Circuit Breaker: **{health['state']}**")
+    if st.button("🩺 Verbindung jetzt prüfen"):
+        if db.check_connection():
+            st.success("✅ Datenbank erreichbar")
+        else:
+            st.error(f"❌ Datenbank nicht erreichbar: {db.get_connection_health()['last_error']}")
+    st.json(db.get_connection_info())
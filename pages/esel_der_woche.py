@@ -11,6 +11,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from auth import require_auth, show_logout, show_user_management
 from database_helper import db
+from dashboard_stats import compute_weekly_donkeys, get_week_donkey
 from timezone_helper import get_german_now, get_german_now_naive
 
 def show():
@@ -325,50 +326,22 @@ def show():
     with tab3:
         st.subheader("🏆 Esel der Woche - Historie")
         
-        # Generate weekly donkey history based on actual calendar weeks
+        # Esel aller ISO-Kalenderwochen in einem Durchlauf berechnen
+        weekly_donkeys = compute_weekly_donkeys(df_strafen)
+        
         all_weeks = []
-        current_date = get_german_now_naive()
-        current_week = current_date.isocalendar()[1]
-        current_year = current_date.year
+        current_date = get_german_now_naive().date()
+        current_monday = current_date - timedelta(days=current_date.weekday())
         
         for i in range(8):  # Last 8 completed calendar weeks
-            # Calculate the week number for i weeks ago (starting with last week)
-            target_week = current_week - (i + 1)
-            target_year = current_year
-            
-            # Handle year transition
-            if target_week <= 0:
-                target_year -= 1
-                # Get the last week of the previous year (52 or 53)
-                last_week_prev_year = datetime(target_year, 12, 28).isocalendar()[1]
-                target_week = last_week_prev_year + target_week
-            
-            # Filter penalties for this specific calendar week
-            week_penalties = df_strafen[
-                (df_strafen['Datum'].dt.isocalendar().week == target_week) &
-                (df_strafen['Datum'].dt.year == target_year)
-            ]
+            # Montag der Woche vor i+1 Wochen (ISO-Jahr und -Woche ergeben sich daraus, auch bei 53 Wochen)
+            target_monday = current_monday - timedelta(weeks=i + 1)
+            target_sunday = target_monday + timedelta(days=6)
+            target_year, target_week, _ = target_monday.isocalendar()
             
-            if len(week_penalties) > 0:
-                week_stats = week_penalties.groupby('Spieler')['Betrag'].sum()
-                week_donkey = week_stats.idxmax()
-                donkey_amount = week_stats.max()
-                
-                # Calculate the actual start and end dates of this calendar week
-                # Find first day of this week (Monday)
-                jan4 = datetime(target_year, 1, 4)  # January 4th is always in week 1
-                week1_monday = jan4 - timedelta(days=jan4.weekday())
-                target_monday = week1_monday + timedelta(weeks=target_week - 1)
-                target_sunday = target_monday + timedelta(days=6)
-            else:
+            week_donkey, donkey_amount, _ = get_week_donkey(weekly_donkeys, target_monday)
+            if not week_donkey:
                 week_donkey = "Niemand"
-                donkey_amount = 0
-                
-                # Calculate week dates even if no penalties
-                jan4 = datetime(target_year, 1, 4)
-                week1_monday = jan4 - timedelta(days=jan4.weekday())
-                target_monday = week1_monday + timedelta(weeks=target_week - 1)
-                target_sunday = target_monday + timedelta(days=6)
             
             all_weeks.append({
                 "Woche": f"KW {target_week}/{str(target_year)[-2:]}",
@@ -4,7 +4,6 @@ import plotly.express as px
 from datetime import datetime, timedelta
 import os
 import sys
-import requests
 
 from dotenv import load_dotenv
 
@@ -24,6 +23,8 @@ from timezone_helper import get_german_now, get_german_now_naive, make_naive_ger
 
 import team_scraper
 
+from http_client import http_client
+
 
 
 @st.cache_data(ttl=600)  # Cache für 10 Minuten
@@ -64,7 +65,7 @@ def get_weather_data(city="Buchholz", api_key=None):
 
         
 
-        response = requests.get(url, params=params, timeout=5)
+        response = http_client.get(url, params=params, timeout=5)
 
         
 
@@ -142,6 +143,22 @@ def show():
 
     
 
+    # Alle unabhängigen Datenbankabfragen der Seite parallel starten
+
+    page_data = db.gather({
+
+        'birthdays': db.get_birthdays,
+
+        'training_stats': db.get_training_statistics,
+
+        'donkey': db.get_last_week_donkey,
+
+        'standings_history': db.get_team_standings_history,
+
+    })
+
+    
+
     # Load real birthday data from database
 
     next_birthday_name = "Niemand"
@@ -154,7 +171,7 @@ def show():
 
         # Lade Geburtstage aus der Datenbank
 
-        df_geburtstage_raw = db.get_birthdays()
+        df_geburtstage_raw = page_data['birthdays'].get()
 
         
 
@@ -254,7 +271,7 @@ def show():
 
     try:
 
-        training_stats = db.get_training_statistics()
+        training_stats = page_data['training_stats'].get()
 
         training_participants = training_stats['latest_training_participants']
 
@@ -288,7 +305,7 @@ def show():
 
         # Get donkey of last week from database using week_nr
 
-        donkey_name, donkey_amount, donkey_count = db.get_last_week_donkey()
+        donkey_name, donkey_amount, donkey_count = page_data['donkey'].get()
 
         
 
@@ -424,7 +441,7 @@ def show():
 
         try:
 
-            standings_history = db.get_team_standings_history()
+            standings_history = page_data['standings_history'].get()
 
             if standings_history is None or standings_history.empty:
 
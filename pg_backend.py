@@ -0,0 +1,228 @@
+"""Direkter Postgres-Zugriff für DatabaseHelper über einen psycopg-Verbindungspool.
+
+Alternative zum PostgREST-Weg (supabase-py über HTTPS): Verbindungen werden
+wiederverwendet, Statements serverseitig vorbereitet und Schreibvorgänge mit
+mehreren Statements laufen in einer echten Transaktion. Aktivierung über
+DB_BACKEND=postgres und SUPABASE_DB_URL (wie run_sql_tool).
+
+Hinweis: Der Supabase-Pooler im Transaction-Mode (Port 6543) unterstützt keine
+vorbereiteten Statements → dort DB_PREPARE=0 setzen oder Port 5432 verwenden.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+try:  # pragma: no cover - optionale Abhängigkeit
+    import psycopg
+    from psycopg.rows import dict_row
+    from psycopg_pool import ConnectionPool
+except ImportError:  # pragma: no cover
+    psycopg = None  # type: ignore[assignment]
+    dict_row = None  # type: ignore[assignment]
+    ConnectionPool = None  # type: ignore[assignment,misc]
+
+from streamlit_helper import get_secret
+
+CONNECTION_ENV_VARS = (
+    "SUPABASE_DB_URL",
+    "SUPABASE_CONNECTION_STRING",
+    "DATABASE_URL",
+    "SUPABASE_DB_CONNECTION",
+)
+
+PENALTY_ROWS_SQL = """
+    select f.penalty_id, f.date_key, f.amount_eur::float8 as amount_eur, f.note,
+           p.name as player_name, t.description as penalty_description
+    from fact_penalty f
+    left join dim_player p on p.player_key = f.player_key
+    left join dim_penalty_type t on t.penalty_type_key = f.penalty_type_key
+    where (%(start_key)s::int is null or f.date_key >= %(start_key)s::int)
+      and (%(end_key)s::int is null or f.date_key <= %(end_key)s::int)
+      and (%(players)s::text[] is null or p.name = any(%(players)s::text[]))
+    order by f.penalty_id desc
+"""
+
+TRAINING_ROWS_SQL = """
+    select w.date_key, w.player_key, w.win_cnt, p.name as player_name
+    from fact_training_win w
+    left join dim_player p on p.player_key = w.player_key
+    where %(start_key)s::int is null or w.date_key >= %(start_key)s::int
+    order by w.date_key desc, w.player_key desc
+"""
+
+INSERT_DIM_DATE_SQL = """
+    insert into dim_date (date_key, full_date, year, month_nr, month_name, quarter,
+                          week_nr, weekday_nr, weekday_name, is_weekend)
+    values (%(date_key)s, %(full_date)s, %(year)s, %(month_nr)s, %(month_name)s, %(quarter)s,
+            %(week_nr)s, %(weekday_nr)s, %(weekday_name)s, %(is_weekend)s)
+    on conflict (date_key) do nothing
+"""
+
+# Trainingstag abgleichen (wie replace_training_day in supabase_training_day_function.sql):
+# nicht mehr gemeldete Spieler löschen, nur neue oder geänderte Zeilen schreiben
+DELETE_TRAINING_ABSENT_SQL = "delete from fact_training_win where date_key = %s and player_key <> all(%s::int[])"
+
+UPSERT_TRAINING_ROWS_SQL = """
+    insert into fact_training_win as f (date_key, player_key, played_cnt, win_cnt)
+    select %s, * from unnest(%s::int[], %s::smallint[], %s::smallint[])
+    on conflict (date_key, player_key) do update
+        set played_cnt = excluded.played_cnt, win_cnt = excluded.win_cnt
+        where (f.played_cnt, f.win_cnt) is distinct from (excluded.played_cnt, excluded.win_cnt)
+"""
+
+INSERT_PENALTIES_SQL = """
+    insert into fact_penalty (date_key, player_key, penalty_type_key, amount_eur, penalty_cnt, note)
+    select * from unnest(%s::int[], %s::int[], %s::int[], %s::numeric[], %s::smallint[], %s::text[])
+    returning penalty_id
+"""
+
+# Mit Idempotenz-ID (Write-Journal, supabase_write_journal.sql): Wiederholungen werden übersprungen
+INSERT_PENALTIES_IDEMPOTENT_SQL = """
+    insert into fact_penalty (date_key, player_key, penalty_type_key, amount_eur, penalty_cnt, note, request_id)
+    select * from unnest(%s::int[], %s::int[], %s::int[], %s::numeric[], %s::smallint[], %s::text[], %s::uuid[])
+    on conflict (request_id) do nothing
+    returning penalty_id
+"""
+
+DELETE_PENALTIES_SQL = "delete from fact_penalty where penalty_id = any(%s::int[]) returning penalty_id"
+
+
+def postgres_available() -> bool:
+    return psycopg is not None and ConnectionPool is not None
+
+
+def get_database_url() -> Optional[str]:
+    """Verbindungs-URL aus Umgebung/.env oder st.secrets (erste gesetzte Variable)."""
+    for name in CONNECTION_ENV_VARS:
+        value = get_secret(name)
+        if value:
+            return value
+    return None
+
+
+class PostgresBackend:
+    """Verbindungspool mit vorbereiteten Statements und Transaktionen."""
+
+    def __init__(
+        self,
+        conninfo: str,
+        min_size: int = 1,
+        max_size: int = 4,
+        prepare: bool = True,
+        timeout_ms: int = 15000,
+    ) -> None:
+        if not postgres_available():
+            raise ImportError(
+                "Das Paket 'psycopg[pool]' wird benötigt, ist aber nicht installiert. "
+                "Bitte 'pip install \"psycopg[binary,pool]\"' ausführen."
+            )
+        self.pool = ConnectionPool(
+            conninfo,
+            min_size=min_size,
+            max_size=max_size,
+            kwargs={
+                "row_factory": dict_row,
+                # 0 = jedes Statement beim ersten Aufruf vorbereiten, None = nie
+                "prepare_threshold": 0 if prepare else None,
+                "options": f"-c statement_timeout={int(timeout_ms)}",
+            },
+            name="viktoria-db",
+            open=True,
+        )
+
+    @contextmanager
+    def transaction(self) -> Iterator[Any]:
+        """Cursor in einer Transaktion: Commit am Ende, Rollback bei Fehler."""
+        with self.pool.connection() as conn:
+            with conn.cursor() as cursor:
+                yield cursor
+
+    def fetch_all(self, sql: str, params: Any = None) -> List[Dict[str, Any]]:
+        with self.transaction() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    # --- Lesen (Zeilenformat wie PostgREST mit eingebetteten Joins) --------
+
+    def penalty_rows(
+        self,
+        start_key: Optional[int] = None,
+        end_key: Optional[int] = None,
+        players: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        rows = self.fetch_all(PENALTY_ROWS_SQL, {
+            "start_key": start_key,
+            "end_key": end_key,
+            "players": list(players) if players is not None else None,
+        })
+        for row in rows:
+            name, description = row.pop("player_name"), row.pop("penalty_description")
+            row["dim_player"] = {"name": name} if name is not None else None
+            row["dim_penalty_type"] = {"description": description} if description is not None else None
+        return rows
+
+    def training_rows(self, start_key: Optional[int] = None) -> List[Dict[str, Any]]:
+        rows = self.fetch_all(TRAINING_ROWS_SQL, {"start_key": start_key})
+        for row in rows:
+            name = row.pop("player_name")
+            row["dim_player"] = {"name": name} if name is not None else None
+        return rows
+
+    def copy_csv(self, sql: str) -> bytes:
+        """Ergebnis einer Abfrage als CSV über COPY TO STDOUT (für analytics_reader, ohne Zeilenobjekte)."""
+        buffer = bytearray()
+        with self.transaction() as cursor:
+            with cursor.copy(f"copy ({sql}) to stdout with (format csv, header true)") as copy:
+                for block in copy:
+                    buffer += block
+        return bytes(buffer)
+
+    # --- Schreiben --------------------------------------------------------
+
+    def replace_training_day(self, date_row: Dict[str, Any], entries: Sequence[Dict[str, Any]]) -> int:
+        """dim_date sicherstellen und den Tag mit dem Kader abgleichen – alles oder nichts.
+
+        Liefert die Anzahl gelöschter plus neuer/geänderter Zeilen.
+        """
+        player_keys = [entry["player_key"] for entry in entries]
+        with self.transaction() as cursor:
+            cursor.execute(INSERT_DIM_DATE_SQL, date_row)
+            cursor.execute(DELETE_TRAINING_ABSENT_SQL, (date_row["date_key"], player_keys))
+            changed = cursor.rowcount
+            cursor.execute(UPSERT_TRAINING_ROWS_SQL, (
+                date_row["date_key"],
+                player_keys,
+                [entry.get("played_cnt", 1) for entry in entries],
+                [entry["win_cnt"] for entry in entries],
+            ))
+            return changed + cursor.rowcount
+
+    def insert_penalties(self, rows: Sequence[Dict[str, Any]]) -> List[int]:
+        """Alle Strafen mit einem Statement speichern, liefert die neuen penalty_ids."""
+        # int()/float(): Werte aus DataFrames sind numpy-Skalare, die psycopg nicht adaptiert
+        params = [
+            [int(row["date_key"]) for row in rows],
+            [int(row["player_key"]) for row in rows],
+            [int(row["penalty_type_key"]) for row in rows],
+            [float(row["amount_eur"]) for row in rows],
+            [int(row.get("penalty_cnt", 1)) for row in rows],
+            [row.get("note") for row in rows],
+        ]
+        sql = INSERT_PENALTIES_SQL
+        if any(row.get("request_id") for row in rows):
+            sql = INSERT_PENALTIES_IDEMPOTENT_SQL
+            params.append([row.get("request_id") for row in rows])
+        with self.transaction() as cursor:
+            cursor.execute(sql, params)
+            return [row["penalty_id"] for row in cursor.fetchall()]
+
+    def delete_penalties(self, penalty_ids: Sequence[int]) -> List[int]:
+        """Löscht alle IDs mit einem Statement, liefert die tatsächlich gelöschten."""
+        with self.transaction() as cursor:
+            cursor.execute(DELETE_PENALTIES_SQL, ([int(penalty_id) for penalty_id in penalty_ids],))
+            return [row["penalty_id"] for row in cursor.fetchall()]
+
+    def close(self) -> None:
+        self.pool.close()
@@ -0,0 +1,80 @@
+"""Hilfen für PostgREST-Antworten: Keyset-Filter und spaltenweises Flachklopfen.
+
+Antworten mit eingebetteten Joins (z.B. dim_player(name)) kommen als Liste
+verschachtelter Dicts; flatten_rows macht daraus einen typisierten DataFrame.
+"""
+
+import pandas as pd
+
+
+def _extract_column(rows, path, default=None):
+    keys = path.split('.')
+    if len(keys) == 1:
+        key = keys[0]
+        values = [row.get(key) for row in rows]
+    else:
+        outer, inner = keys
+        values = [(row.get(outer) or {}).get(inner) for row in rows]
+    if default is not None:
+        values = [default if value is None else value for value in values]
+    return values
+
+
+def _to_float_series(values):
+    try:
+        # Schneller C-Pfad, versteht auch numerische Strings wie "5.00"
+        return pd.Series(values, dtype='float64')
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce')
+
+
+def _date_keys_to_datetime(values):
+    # Wenige verschiedene Tage pro Saison: nur die eindeutigen Keys parsen und zuordnen
+    keys = _to_float_series(values)
+    uniques = pd.Series(pd.unique(keys.dropna()))
+    parsed = pd.to_datetime(uniques.astype('int64').astype(str), format='%Y%m%d', errors='coerce')
+    return keys.map(dict(zip(uniques, parsed))).astype('datetime64[ns]')
+
+
+def flatten_rows(rows, fields):
+    """
+    Baut aus PostgREST-Zeilen mit eingebetteten Joins spaltenweise einen typisierten DataFrame
+    
+    Args:
+        rows: Liste von Dicts, z.B. {'date_key': 20261019, 'dim_player': {'name': 'Ben'}}
+        fields: dict Zielspalte → (Pfad, Typ, Default); Pfad "dim_player.name",
+            Typ "str", "int", "float", "flag" (Wert > 0), "date_key" (YYYYMMDD) oder "date"
+    """
+    columns = {}
+    for column, (path, kind, default) in fields.items():
+        if kind == 'str':
+            columns[column] = pd.Series(_extract_column(rows, path, default), dtype=object)
+        elif kind in ('int', 'float', 'flag'):
+            numbers = _to_float_series(_extract_column(rows, path))
+            if kind == 'flag':
+                columns[column] = numbers.fillna(0) > 0
+            else:
+                columns[column] = numbers.fillna(default).astype('int64' if kind == 'int' else float)
+        elif kind == 'date_key':
+            columns[column] = _date_keys_to_datetime(_extract_column(rows, path))
+        elif kind == 'date':
+            columns[column] = pd.to_datetime(pd.Series(_extract_column(rows, path), dtype=object), errors='coerce')
+        else:
+            raise ValueError(f"Unbekannter Spaltentyp: {kind}")
+    return pd.DataFrame(columns, columns=list(fields))
+
+
+def _postgrest_value(value):
+    if isinstance(value, str):
+        return '"' + value.replace('"', '\\"') + '"'
+    return str(value)
+
+
+def keyset_condition(key_columns, last_values, descending):
+    """PostgREST-Filter für "Schlüssel nach last_values" (auch zusammengesetzte Schlüssel)"""
+    op = 'lt' if descending else 'gt'
+    column, value = key_columns[0], _postgrest_value(last_values[0])
+    if len(key_columns) == 1:
+        return f"{column}.{op}.{value}"
+    rest = keyset_condition(key_columns[1:], last_values[1:], descending)
+    return f"{column}.{op}.{value},and({column}.eq.{value},or({rest}))"
@@ -0,0 +1,111 @@
+"""Prozessweiter Read-Through-Cache für Datenbankabfragen.
+
+Der Cache hängt an der globalen DatabaseHelper-Instanz und wird daher von
+allen Streamlit-Sessions eines Prozesses geteilt. Einträge haben eine TTL und
+Tags (z.B. "penalties"); schreibende Methoden invalidieren gezielt ihre Tags.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+
+def _copy_value(value: Any) -> Any:
+    # Aufrufer dürfen Ergebnisse verändern, ohne den Cache zu beschädigen
+    if hasattr(value, "copy") and hasattr(value, "columns"):
+        return value.copy()
+    if isinstance(value, (dict, list, set, tuple)):
+        return copy.deepcopy(value)
+    return value
+
+
+class Uncacheable(Exception):
+    """Vom Loader geworfen: value zurückgeben, aber nicht cachen (z.B. CSV-Fallback, Fehlerpfad)."""
+
+    def __init__(self, value: Any) -> None:
+        super().__init__("Ergebnis nicht cachebar")
+        self.value = value
+
+
+class QueryCache:
+    """Thread-sicherer TTL-Cache mit Tag-basierter Invalidierung und Zählern."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, Tuple[str, ...], Any]] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._invalidations: Dict[str, int] = {}
+        self._generation = 0
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: float,
+        tags: Iterable[str] = (),
+        name: Optional[str] = None,
+    ) -> Any:
+        name = name or str(key)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._count(name, "hits")
+                return _copy_value(entry[2])
+            self._count(name, "misses")
+            generation = self._generation
+
+        try:
+            value = loader()
+        except Uncacheable as uncacheable:
+            return uncacheable.value
+        with self._lock:
+            # Während des Ladens invalidiert → Ergebnis nicht cachen, es könnte veraltet sein
+            if generation == self._generation:
+                self._entries[key] = (now + ttl, tuple(tags), value)
+        return _copy_value(value)
+
+    def invalidate(self, *tags: str) -> int:
+        """Entfernt alle Einträge mit einem der Tags und liefert deren Anzahl."""
+        wanted = set(tags)
+        with self._lock:
+            self._generation += 1
+            stale = [key for key, entry in self._entries.items() if wanted & set(entry[1])]
+            for key in stale:
+                del self._entries[key]
+            for tag in wanted:
+                self._invalidations[tag] = self._invalidations.get(tag, 0) + 1
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def _count(self, name: str, field: str) -> None:
+        entry = self._stats.setdefault(name, {"hits": 0, "misses": 0})
+        entry[field] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Zähler pro Methode sowie Gesamtwerte."""
+        with self._lock:
+            per_method = {name: dict(values) for name, values in self._stats.items()}
+            hits = sum(values["hits"] for values in per_method.values())
+            misses = sum(values["misses"] for values in per_method.values())
+            return {
+                "entries": len(self._entries),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "per_method": per_method,
+                "invalidations": dict(self._invalidations),
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._invalidations.clear()
@@ -0,0 +1,102 @@
+"""Decorators für die Abfrage-Methoden von DatabaseHelper.
+
+Sie erwarten die Attribute der Instanz (cache, metrics, connection, replica,
+_query_state) und bündeln Cache, Metriken, Circuit Breaker und Replik-Abgleich,
+damit die Methoden selbst nur die Abfrage enthalten.
+"""
+
+from functools import wraps
+
+from db_errors import is_connection_error
+from query_cache import Uncacheable
+
+
+def _cache_key_part(value):
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(value))
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+def cached_query(ttl, *tags):
+    """Cacht das Ergebnis einer Lesemethode prozessweit (nur bei aktiver DB-Verbindung)."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            self._ensure_connected()
+            if not self.connected:
+                return func(self, *args, **kwargs)
+            key = (
+                func.__name__,
+                tuple(_cache_key_part(arg) for arg in args),
+                tuple(sorted((name, _cache_key_part(value)) for name, value in kwargs.items())),
+            )
+            try:
+                hash(key)
+            except TypeError:
+                return func(self, *args, **kwargs)
+            loaded = []
+
+            def load():
+                loaded.append(True)
+                state = self._query_state
+                outer = getattr(state, 'uncacheable', False)
+                state.uncacheable = False
+                try:
+                    value = func(self, *args, **kwargs)
+                    if state.uncacheable:
+                        raise Uncacheable(value)
+                    return value
+                finally:
+                    # Ein Fallback in einer inneren Abfrage macht auch die äußere ungültig
+                    state.uncacheable = outer or state.uncacheable
+
+            value = self.cache.get_or_load(key, load, ttl, tags, name=func.__name__)
+            self.metrics.note_cache_hit(not loaded)
+            return value
+        return wrapper
+    return decorator
+
+
+def reports_health(func):
+    """Meldet Erfolg und Verbindungsfehler einer Abfrage an den Circuit Breaker (self.connection)."""
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            result = func(self, *args, **kwargs)
+        except Exception as e:
+            if is_connection_error(e):
+                self.connection.record_failure(e)
+                self._sync_connection()
+            raise
+        self.connection.record_success()
+        return result
+    return wrapper
+
+
+def instrumented(func):
+    """Erfasst Dauer, Zeilen, Bytes, Cache-Treffer und Fehler jedes Aufrufs in self.metrics."""
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self.metrics.track(func.__name__) as call:
+            return call.result(func(self, *args, **kwargs))
+    return wrapper
+
+
+def invalidates(*tags, deletes=False):
+    """Invalidiert nach einer schreibenden Methode alle Cache-Einträge mit diesen Tags.
+
+    deletes=True: die Methode löscht Zeilen, die Replik gleicht dann ihre Schlüssel ab.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                self.cache.invalidate(*tags)
+                if self.replica is not None:
+                    self.replica.mark_stale(*tags, deleted=deletes)
+        return wrapper
+    return decorator
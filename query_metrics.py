@@ -0,0 +1,193 @@
+"""Laufzeit- und Nutzlast-Messung für DatabaseHelper-Methoden.
+
+Jeder instrumentierte Aufruf erzeugt ein QueryEvent (Dauer, Zeilen, Bytes,
+Cache-Treffer, Fehler). QueryMetrics aggregiert die Events pro Methode zu
+Zählern und einem Latenz-Histogramm und reicht sie an austauschbare Sinks
+weiter (Ringpuffer im Speicher, JSON-Logdatei).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Obergrenzen der Histogramm-Klassen in Millisekunden; alles darüber landet in "inf"
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+# Bis zu so vielen Zeilen wird die Nutzlast exakt gemessen, darüber hochgerechnet
+PAYLOAD_SAMPLE_ROWS = 100
+
+
+@dataclass
+class QueryEvent:
+    method: str
+    started_at: str
+    ms: float
+    rows: Optional[int] = None
+    bytes: Optional[int] = None
+    cache_hit: Optional[bool] = None
+    error: Optional[str] = None
+
+
+def payload_size(value: Any) -> tuple:
+    """(Zeilen, geschätzte Bytes) eines Rückgabewerts; (None, None) für Skalare und Tupel."""
+    if value is None:
+        return None, None
+    if hasattr(value, "memory_usage") and hasattr(value, "columns"):
+        return len(value), int(value.memory_usage(index=False, deep=True).sum())
+    if isinstance(value, list):
+        sample = value[:PAYLOAD_SAMPLE_ROWS]
+        if not sample:
+            return 0, 0
+        size = len(json.dumps(sample, ensure_ascii=False, default=str).encode("utf-8"))
+        return len(value), int(size * len(value) / len(sample))
+    if isinstance(value, dict):
+        return None, len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+    return None, None
+
+
+class RingBufferSink:
+    """Hält die letzten Events im Speicher (für die Diagnose-Seite)."""
+
+    def __init__(self, maxlen: int = 500) -> None:
+        self._events: deque = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def write(self, event: QueryEvent) -> None:
+        with self._lock:
+            self._events.append(event)
+
+    def events(self) -> List[QueryEvent]:
+        with self._lock:
+            return list(self._events)
+
+
+class JsonLogSink:
+    """Hängt jedes Event als JSON-Zeile an eine Logdatei an."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def write(self, event: QueryEvent) -> None:
+        line = json.dumps(asdict(event), ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(line)
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.value: Any = None
+        self.cache_hit: Optional[bool] = None
+
+    def result(self, value: Any) -> Any:
+        self.value = value
+        return value
+
+
+class QueryMetrics:
+    """Thread-sichere Aggregation pro Methode plus Weitergabe an Sinks."""
+
+    def __init__(self, sinks: Optional[List[Any]] = None, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._local = threading.local()
+        self.sinks: List[Any] = list(sinks or [])
+
+    def add_sink(self, sink: Any) -> None:
+        self.sinks.append(sink)
+
+    @contextmanager
+    def track(self, method: str) -> Iterator[_Call]:
+        """Misst den umschlossenen Aufruf; call.result(wert) übergibt den Rückgabewert."""
+        stack = self._local.__dict__.setdefault("stack", [])
+        call = _Call()
+        stack.append(call)
+        started_at = datetime.now().isoformat(timespec="milliseconds")
+        started = self._clock()
+        error = None
+        try:
+            yield call
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            ms = (self._clock() - started) * 1000
+            stack.pop()
+            rows, size = payload_size(call.value) if error is None else (None, None)
+            self.record(QueryEvent(method, started_at, round(ms, 3), rows, size, call.cache_hit, error))
+
+    def note_cache_hit(self, hit: bool) -> None:
+        """Vom Cache-Decorator aufgerufen: markiert den laufenden Aufruf als Treffer/Fehlschlag."""
+        stack = getattr(self._local, "stack", None)
+        if stack:
+            stack[-1].cache_hit = hit
+
+    def record(self, event: QueryEvent) -> None:
+        with self._lock:
+            entry = self._stats.setdefault(event.method, {
+                "calls": 0, "errors": 0, "cache_hits": 0, "rows": 0, "bytes": 0,
+                "total_ms": 0.0, "max_ms": 0.0, "histogram": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+            })
+            entry["calls"] += 1
+            entry["errors"] += event.error is not None
+            entry["cache_hits"] += bool(event.cache_hit)
+            entry["rows"] += event.rows or 0
+            entry["bytes"] += event.bytes or 0
+            entry["total_ms"] += event.ms
+            entry["max_ms"] = max(entry["max_ms"], event.ms)
+            entry["histogram"][_bucket(event.ms)] += 1
+        for sink in self.sinks:
+            try:
+                sink.write(event)
+            except Exception as e:
+                print(f"Fehler beim Schreiben der Abfrage-Metriken: {e}")
+
+    def recent(self, limit: int = 100) -> List[QueryEvent]:
+        """Neueste Events aus dem ersten Ringpuffer-Sink (neueste zuerst)."""
+        for sink in self.sinks:
+            if isinstance(sink, RingBufferSink):
+                return sink.events()[::-1][:limit]
+        return []
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Kennzahlen pro Methode, langsamste (p95) zuerst."""
+        with self._lock:
+            stats = {name: dict(values, histogram=list(values["histogram"])) for name, values in self._stats.items()}
+        for values in stats.values():
+            values["avg_ms"] = round(values["total_ms"] / values["calls"], 3)
+            values["p50_ms"] = _percentile(values["histogram"], 0.5, values["max_ms"])
+            values["p95_ms"] = _percentile(values["histogram"], 0.95, values["max_ms"])
+            values["histogram"] = dict(zip([f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + ["inf"],
+                                           values["histogram"]))
+        return dict(sorted(stats.items(), key=lambda item: item[1]["p95_ms"], reverse=True))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+def _bucket(ms: float) -> int:
+    for index, bound in enumerate(LATENCY_BUCKETS_MS):
+        if ms <= bound:
+            return index
+    return len(LATENCY_BUCKETS_MS)
+
+
+def _percentile(histogram: List[int], quantile: float, max_ms: float) -> float:
+    # Obergrenze der Klasse, in der das Quantil liegt (letzte Klasse: gemessenes Maximum)
+    total = sum(histogram)
+    seen = 0
+    for index, count in enumerate(histogram):
+        seen += count
+        if total and seen >= quantile * total:
+            bound = LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else max_ms
+            return round(min(bound, max_ms), 3)
+    return 0.0
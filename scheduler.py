@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+ViktoriaInsights - Job-Scheduler
+Führt alle Automatisierungs-Skripte als Jobs in einem langlebigen asyncio-Prozess aus.
+
+Die Skripte werden einmal importiert und teilen sich warme Clients
+(Supabase über DatabaseHelper, HTTP über http_client). Jobs können von
+anderen Jobs abhängen (z.B. Spielberichte → Tabelle → Tagesinhalte),
+laufen nie doppelt und jeder Lauf landet mit Dauer in der Tabelle job_runs.
+
+Verwendung:
+- python scheduler.py                        # Dauerbetrieb
+- python scheduler.py --run match_reports    # Einen Job (inkl. Folge-Jobs) sofort ausführen
+- python scheduler.py --list                 # Jobs anzeigen
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import logging
+import sys
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, time as dt_time
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from database_helper import db
+from timezone_helper import get_german_now
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+TICK_SECONDS = 30
+HISTORY_TABLE = "job_runs"
+HISTORY_MEMORY_SIZE = 200
+
+
+class JobExit(Exception):
+    """sys.exit() eines Skripts, umgewandelt damit es den Event-Loop nicht beendet."""
+
+    def __init__(self, code) -> None:
+        super().__init__(f"exit code {code}")
+        self.code = code
+
+
+def _call_sync(func: Callable[[], Any]) -> Any:
+    try:
+        return func()
+    except SystemExit as e:
+        if e.code in (None, 0):
+            return None
+        raise JobExit(e.code) from None
+
+
+@dataclass
+class Job:
+    """Ein geplanter Job.
+
+    daily_at: Uhrzeit "HH:MM" in deutscher Zeit, interval_minutes: festes Intervall.
+    after: Jobs, nach deren erfolgreichem Lauf dieser Job automatisch startet.
+    """
+
+    name: str
+    func: Callable[[], Any]
+    daily_at: Optional[str] = None
+    interval_minutes: Optional[int] = None
+    after: Tuple[str, ...] = ()
+    timeout_seconds: int = 30 * 60
+    description: str = ""
+
+
+@dataclass
+class JobRun:
+    job_name: str
+    trigger: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    status: str = "running"
+    message: str = ""
+
+    @property
+    def duration_ms(self) -> Optional[int]:
+        if self.finished_at is None:
+            return None
+        return int((self.finished_at - self.started_at).total_seconds() * 1000)
+
+    def as_payload(self) -> Dict[str, Any]:
+        return {
+            "job_name": self.job_name,
+            "trigger": self.trigger,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "message": self.message[:2000],
+        }
+
+
+class JobHistory:
+    """Hält die letzten Läufe im Speicher und schreibt sie nach Supabase (job_runs)."""
+
+    def __init__(self, database=db, table: str = HISTORY_TABLE, size: int = HISTORY_MEMORY_SIZE) -> None:
+        self._db = database
+        self._table = table
+        self.runs: Deque[JobRun] = deque(maxlen=size)
+
+    def record(self, run: JobRun) -> None:
+        self.runs.append(run)
+        if self._db is None:
+            return
+        self._db._ensure_connected()
+        if not self._db.connected:
+            return
+        try:
+            self._db.supabase.table(self._table).insert(run.as_payload()).execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Job-Historie konnte nicht gespeichert werden: {e}")
+
+
+class JobScheduler:
+    """Asynchroner Scheduler mit Abhängigkeiten und Überlappungsschutz."""
+
+    def __init__(self, jobs: List[Job], history: Optional[JobHistory] = None, clock=get_german_now) -> None:
+        self.jobs: Dict[str, Job] = {job.name: job for job in jobs}
+        for job in jobs:
+            missing = [name for name in job.after if name not in self.jobs]
+            if missing:
+                raise ValueError(f"Job '{job.name}' hängt von unbekannten Jobs ab: {', '.join(missing)}")
+        self.history = history if history is not None else JobHistory()
+        self._clock = clock
+        self._locks: Dict[str, asyncio.Lock] = {name: asyncio.Lock() for name in self.jobs}
+        self._last_run: Dict[str, datetime] = {}
+        self._last_daily: Dict[str, Any] = {}
+        # Threads von Jobs, die ihr Timeout überschritten haben und noch laufen
+        self._overrunning: Dict[str, asyncio.Future] = {}
+        self._stopping = False
+
+    def dependents_of(self, name: str) -> List[Job]:
+        return [job for job in self.jobs.values() if name in job.after]
+
+    def is_running(self, name: str) -> bool:
+        return self._locks[name].locked() or name in self._overrunning
+
+    async def run_job(self, name: str, trigger: str = "manual") -> bool:
+        """Führt einen Job aus und startet danach seine Folge-Jobs. Liefert True bei Erfolg."""
+        job = self.jobs[name]
+        lock = self._locks[name]
+        if self.is_running(name):
+            logger.info(f"⏭️ {name} läuft bereits - Start ({trigger}) übersprungen")
+            return False
+
+        async with lock:
+            run = JobRun(job_name=name, trigger=trigger, started_at=self._clock())
+            logger.info(f"▶️ {name} gestartet ({trigger})")
+            try:
+                result = await self._invoke(job)
+                run.status = "success"
+                run.message = "" if result is None else str(result)
+            except asyncio.TimeoutError:
+                run.status = "timeout"
+                run.message = f"Timeout nach {job.timeout_seconds}s"
+            except JobExit as e:
+                # Die Skripte beenden sich bei Fehlern mit sys.exit(1)
+                run.status = "failed"
+                run.message = str(e)
+            except Exception as e:
+                run.status = "failed"
+                run.message = str(e)
+            run.finished_at = self._clock()
+            self._last_run[name] = run.finished_at
+            await asyncio.to_thread(self.history.record, run)
+
+        icon = "✅" if run.status == "success" else "❌"
+        logger.info(f"{icon} {name}: {run.status} in {run.duration_ms} ms {run.message}".rstrip())
+
+        if run.status != "success":
+            return False
+        for dependent in self.dependents_of(name):
+            await self.run_job(dependent.name, trigger=f"after:{name}")
+        return True
+
+    async def _invoke(self, job: Job) -> Any:
+        if inspect.iscoroutinefunction(job.func):
+            return await asyncio.wait_for(job.func(), timeout=job.timeout_seconds)
+        # Ein Thread lässt sich nicht abbrechen: bei Timeout läuft er weiter und
+        # der Job gilt bis zu seinem Ende als laufend (kein zweiter Start).
+        future = asyncio.ensure_future(asyncio.to_thread(_call_sync, job.func))
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=job.timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"⏳ {job.name} läuft nach dem Timeout von {job.timeout_seconds}s weiter - "
+                f"kein neuer Start bis zum Ende"
+            )
+            self._overrunning[job.name] = future
+            future.add_done_callback(lambda done, name=job.name: self._overrun_finished(name, done))
+            raise
+
+    def _overrun_finished(self, name: str, future: asyncio.Future) -> None:
+        self._overrunning.pop(name, None)
+        error = None if future.cancelled() else future.exception()
+        outcome = f"mit Fehler beendet: {error}" if error else "beendet"
+        logger.warning(f"⌛ {name} nach Timeout {outcome}")
+
+    def _is_due(self, job: Job, now: datetime) -> bool:
+        if job.daily_at:
+            at = dt_time.fromisoformat(job.daily_at)
+            if now.time() >= at and self._last_daily.get(job.name) != now.date():
+                return True
+        if job.interval_minutes:
+            last = self._last_run.get(job.name)
+            if last is None or (now - last).total_seconds() >= job.interval_minutes * 60:
+                return True
+        return False
+
+    def _mark_scheduled(self, job: Job, now: datetime) -> None:
+        if job.daily_at:
+            self._last_daily[job.name] = now.date()
+        if job.interval_minutes:
+            self._last_run[job.name] = now
+
+    def _skip_past_slots(self, now: datetime) -> None:
+        # Beim Start keine bereits verstrichenen Tagestermine nachholen (wie cron)
+        for job in self.jobs.values():
+            if job.daily_at and now.time() >= dt_time.fromisoformat(job.daily_at):
+                self._last_daily[job.name] = now.date()
+
+    async def run_forever(self, tick_seconds: int = TICK_SECONDS) -> None:
+        logger.info(f"🚀 Scheduler gestartet mit {len(self.jobs)} Jobs")
+        self._skip_past_slots(self._clock())
+        tasks = set()
+        while not self._stopping:
+            now = self._clock()
+            for job in self.jobs.values():
+                if self._is_due(job, now) and not self.is_running(job.name):
+                    self._mark_scheduled(job, now)
+                    task = asyncio.create_task(self.run_job(job.name, trigger="schedule"))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            await asyncio.sleep(tick_seconds)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if self._overrunning:
+            await asyncio.gather(*self._overrunning.values(), return_exceptions=True)
+
+    def stop(self) -> None:
+        self._stopping = True
+
+
+# ---------------------------------------------------------------------------
+# Job-Definitionen: die Skripte werden erst beim ersten Lauf importiert und
+# bleiben danach im Prozess geladen.
+# ---------------------------------------------------------------------------
+
+def _shared_supabase():
+    db._ensure_connected()
+    if not db.connected:
+        raise RuntimeError("Keine Supabase-Verbindung")
+    return db.supabase
+
+
+async def job_match_reports():
+    import scrape_match_reports
+
+    # Gemeinsamen Supabase-Client statt eines eigenen verwenden
+    scrape_match_reports.SUPABASE_CLIENT = _shared_supabase()
+    args = argparse.Namespace(file="match_urls.txt", urls=None)
+    await scrape_match_reports.main_async(args)
+
+
+def job_smart_standings():
+    import smart_standings_updater
+
+    smart_standings_updater.main()
+
+
+def job_standings():
+    import standings_updater
+
+    standings_updater.main()
+
+
+def job_daily_content():
+    import generate_daily_content
+
+    generate_daily_content.main(supabase=_shared_supabase())
+
+
+def job_backup():
+    import backup_script
+
+    backup_script.create_backup(supabase=_shared_supabase())
+
+
+def job_season_dates():
+    _shared_supabase()
+    added = db.ensure_season_dates()
+    logger.info(f"dim_date: {added} Tage der Saison neu angelegt")
+
+
+DEFAULT_JOBS = [
+    Job("backup", job_backup, daily_at="03:00",
+        description="Excel-Backup der Kern-Tabellen"),
+    Job("season_dates", job_season_dates, daily_at="03:15",
+        description="dim_date für die laufende Saison vorab anlegen"),
+    Job("match_reports", job_match_reports, daily_at="07:00", timeout_seconds=60 * 60,
+        description="Spielberichte von fussball.de synchronisieren"),
+    Job("smart_standings", job_smart_standings, after=("match_reports",),
+        description="Tabelle bei Änderungen aktualisieren"),
+    Job("daily_content", job_daily_content, after=("smart_standings",),
+        description="Fakten und Beispiel-Fragen des Tages erzeugen"),
+    Job("standings", job_standings,
+        description="Tabelle unbedingt aktualisieren (nur manuell)"),
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="ViktoriaInsights Job-Scheduler")
+    parser.add_argument("--run", metavar="JOB", help="Job sofort ausführen (inkl. Folge-Jobs) und beenden")
+    parser.add_argument("--list", action="store_true", help="Konfigurierte Jobs anzeigen")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    scheduler = JobScheduler(DEFAULT_JOBS)
+
+    if args.list:
+        for job in DEFAULT_JOBS:
+            plan = job.daily_at or (f"alle {job.interval_minutes} min" if job.interval_minutes else "")
+            if job.after:
+                plan = f"nach {', '.join(job.after)}"
+            print(f"{job.name:16} {plan or 'manuell':22} {job.description}")
+        return
+
+    if args.run:
+        if args.run not in scheduler.jobs:
+            logger.error(f"❌ Unbekannter Job: {args.run}")
+            sys.exit(1)
+        ok = asyncio.run(scheduler.run_job(args.run))
+        sys.exit(0 if ok else 1)
+
+    try:
+        asyncio.run(scheduler.run_forever())
+    except KeyboardInterrupt:
+        logger.info("🛑 Scheduler beendet")
+
+
+if __name__ == "__main__":
+    main()
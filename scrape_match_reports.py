@@ -12,6 +12,7 @@ python scrape_match_reports.py --file match_urls.txt
 import argparse
 import asyncio
 import ast
+import importlib.util
 import io
 import logging
 import os
@@ -19,9 +20,12 @@ import random
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
-from season_config import CURRENT_MATCH_SEASON
+from db_errors import is_missing_column
+from http_client import http_client
+from season_config import CURRENT_MATCH_SEASON, VIKTORIA_TEAM_KEY, resolve_team_key
+from streamlit_helper import get_secret
 
 import unicodedata
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
@@ -36,19 +40,11 @@ try:
 except ImportError:
     pass
 
-try:
-    import streamlit as st  # type: ignore
-except ImportError:  # noqa: F401
-    st = None
-
-try:
-    from supabase import Client, create_client
+if TYPE_CHECKING:
+    from supabase import Client
 
-    SUPABASE_AVAILABLE = True
-except ImportError:  # noqa: F401
-    Client = None  # type: ignore
-    create_client = None  # type: ignore
-    SUPABASE_AVAILABLE = False
+# Supabase erst beim ersten Client-Aufbau importieren (schneller Start)
+SUPABASE_AVAILABLE = importlib.util.find_spec("supabase") is not None
 
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
@@ -70,7 +66,16 @@ MATCHES_HEADERS = [
     "away_team",
     "score_home",
     "score_away",
+    "home_team_key",
+    "away_team_key",
 ]
+# Written only once supabase_team_keys.sql has been applied; dropped per table otherwise
+TEAM_KEY_COLUMNS = {
+    "matches": ("home_team_key", "away_team_key"),
+    "lineups": ("team_key",),
+}
+_tables_without_team_keys: set = set()
+
 EVENTS_HEADERS = [
     "match_id",
     "source_url",
@@ -94,6 +99,7 @@ LINEUPS_HEADERS = [
     "source_url",
     "team_side",
     "team_name",
+    "team_key",
     "role",
     "number",
     "name",
@@ -111,31 +117,11 @@ NUMERIC_FIELDS = {
 
 
 def _resolve_supabase_credentials() -> Tuple[Optional[str], Optional[str]]:
-    supabase_url = os.getenv("SUPABASE_URL")
-    supabase_key = os.getenv("SUPABASE_ANON_KEY")
-
-    if st is not None:
-        try:
-            supabase_url = supabase_url or st.secrets.get("SUPABASE_URL")
-        except Exception:  # noqa: BLE001
-            pass
-        try:
-            supabase_key = supabase_key or st.secrets.get("SUPABASE_ANON_KEY")
-        except Exception:  # noqa: BLE001
-            pass
-        try:
-            nested = st.secrets.get("supabase", {})
-            if isinstance(nested, dict):
-                supabase_url = supabase_url or nested.get("SUPABASE_URL")
-                supabase_key = supabase_key or nested.get("SUPABASE_ANON_KEY")
-        except Exception:  # noqa: BLE001
-            pass
-
-    return supabase_url, supabase_key
+    return get_secret("SUPABASE_URL"), get_secret("SUPABASE_ANON_KEY")
 
 
 def get_supabase_client() -> "Client":
-    if not SUPABASE_AVAILABLE or create_client is None:
+    if not SUPABASE_AVAILABLE:
         raise RuntimeError(
             "Supabase-Client ist nicht installiert. Bitte 'pip install supabase' ausführen."
         )
@@ -150,6 +136,8 @@ def get_supabase_client() -> "Client":
             "Supabase-Zugangsdaten fehlen. Bitte SUPABASE_URL und SUPABASE_ANON_KEY setzen."
         )
 
+    from supabase import create_client
+
     SUPABASE_CLIENT = create_client(supabase_url, supabase_key)
     return SUPABASE_CLIENT
 
@@ -189,8 +177,8 @@ def clean_text(value: str) -> str:
 
 
 class ObfuscationDecoder:
-    def __init__(self, request_context) -> None:
-        self._request = request_context
+    def __init__(self, client=http_client) -> None:
+        self._client = client
         self._cache: Dict[str, Dict[str, str]] = {}
 
     async def decode_text(self, text: str, font_id: Optional[str]) -> str:
@@ -216,16 +204,16 @@ class ObfuscationDecoder:
             return self._cache[font_id]
         url = FONT_URL_TEMPLATE.format(font_id)
         try:
-            response = await self._request.get(url, headers=REFERER_HEADER)
+            response = await asyncio.to_thread(self._client.get, url, headers=REFERER_HEADER)
         except Exception as exc:  # noqa: BLE001
             logging.warning("Failed to download font %s: %s", font_id, exc)
             self._cache[font_id] = {}
             return {}
-        if response.status != 200:
-            logging.warning("Font request for %s returned status %s", font_id, response.status)
+        if response.status_code != 200:
+            logging.warning("Font request for %s returned status %s", font_id, response.status_code)
             self._cache[font_id] = {}
             return {}
-        data = await response.body()
+        data = response.content
         try:
             font = TTFont(io.BytesIO(data))
         except Exception as exc:  # noqa: BLE001
@@ -601,6 +589,8 @@ async def extract_match_core(page, decoder: ObfuscationDecoder, url: str) -> Dic
         score_home, score_away = parse_score(page_title)
 
     season_formatted = format_season_code(data_vars.get("season", ""))
+    home_team = clean_text(home_team)
+    away_team = clean_text(away_team)
 
     return {
         "match_id": extract_match_id(url),
@@ -608,10 +598,12 @@ async def extract_match_core(page, decoder: ObfuscationDecoder, url: str) -> Dic
         "competition": competition,
         "season": season_formatted,
         "match_date": match_date,
-        "home_team": clean_text(home_team),
-        "away_team": clean_text(away_team),
+        "home_team": home_team,
+        "away_team": away_team,
         "score_home": score_home,
         "score_away": score_away,
+        "home_team_key": resolve_team_key(home_team) if home_team else "",
+        "away_team_key": resolve_team_key(away_team) if away_team else "",
         "_filter_competition": competition.lower(),
         "_filter_season": (season_formatted or data_vars.get("season", "")).lower(),
     }
@@ -837,6 +829,7 @@ async def extract_lineups(page, decoder: ObfuscationDecoder, url: str, match_inf
                         "source_url": url,
                         "team_side": team_side,
                         "team_name": team_name,
+                        "team_key": resolve_team_key(team_name) if team_name else "",
                         "role": role,
                         "number": number,
                         "name": name,
@@ -863,11 +856,11 @@ def passes_filters(match_info: Dict[str, str]) -> bool:
     target = SEASON_KEYWORD.replace("/", "").lower()
     if target not in normalized:
         return False
+    if VIKTORIA_TEAM_KEY in (match_info.get("home_team_key"), match_info.get("away_team_key")):
+        return True
     home = (match_info.get("home_team") or "").lower()
     away = (match_info.get("away_team") or "").lower()
-    if TARGET_TEAM not in home and TARGET_TEAM not in away:
-        return False
-    return True
+    return TARGET_TEAM in home or TARGET_TEAM in away
 
 
 async def process_match(context, decoder: ObfuscationDecoder, url: str) -> Tuple[Optional[Dict[str, str]], List[Dict[str, str]], List[Dict[str, str]]]:
@@ -924,11 +917,23 @@ def persist_records(
     if not rows:
         return
 
+    key_columns = TEAM_KEY_COLUMNS.get(table, ())
+    if table in _tables_without_team_keys:
+        headers = [header for header in headers if header not in key_columns]
     numeric_fields = set(NUMERIC_FIELDS.get(table, set()))
     payload = [normalize_record(headers, row, numeric_fields) for row in rows]
     try:
         client.table(table).insert(payload).execute()
     except Exception as exc:  # noqa: BLE001
+        if key_columns and table not in _tables_without_team_keys and is_missing_column(exc, *key_columns):
+            logging.warning(
+                "Team key columns missing in %s (apply supabase_team_keys.sql), writing without them: %s",
+                table,
+                exc,
+            )
+            _tables_without_team_keys.add(table)
+            persist_records(client, table, headers, rows, match_id)
+            return
         logging.error("Failed to insert into %s for match %s: %s", table, match_id, exc)
 
 
@@ -985,7 +990,7 @@ async def main_async(args: argparse.Namespace) -> None:
         browser = await p.chromium.launch(headless=True)
         context = await browser.new_context(user_agent=USER_AGENT, viewport={"width": 1280, "height": 720})
         context.set_default_timeout(TIMEOUT_MS)
-        decoder = ObfuscationDecoder(context.request)
+        decoder = ObfuscationDecoder()
         try:
             for url in url_list:
                 match_id = extract_match_id(url)
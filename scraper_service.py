@@ -1,23 +1,67 @@
-import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
 from bs4 import BeautifulSoup
 from database_helper import db
+from http_client import http_client
 from season_config import CURRENT_STANDINGS_SEASON, validate_expected_group
 
 # Team-ID für TuS Viktoria Buchholz
 TEAM_ID = "011MI9UHGG000000VTVG0001VTR8C1K7"
 SAISON = CURRENT_STANDINGS_SEASON
 
-# User-Agent Header
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-}
+TABLE_URL_TEMPLATE = "https://www.fussball.de/ajax.team.table/-/saison/{season}/team-id/{team_id}"
+
+# Parallelität und Mindestabstand zwischen zwei Requests an fussball.de
+BATCH_MAX_WORKERS = 4
+BATCH_MIN_INTERVAL_SECONDS = 0.5
+
+@dataclass(frozen=True)
+class StandingsTarget:
+    """Ein Tabellen-Ziel: Team-ID und Saison, optional mit eigener erwarteter Gruppe."""
+
+    team_id: str
+    season: str
+    expected_teams: Optional[Tuple[str, ...]] = None
+
+
+@dataclass
+class StandingsResult:
+    """Ergebnis des Scrapings und der Gruppenprüfung für ein StandingsTarget."""
+
+    target: StandingsTarget
+    success: bool
+    message: str
+    teams: List[dict] = field(default_factory=list)
+
+
+class RateLimiter:
+    """Thread-sicherer Mindestabstand zwischen zwei ausgehenden Requests."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
 
 class TeamScraperService:
     """Service-Klasse für das Scraping von Teamdaten von fussball.de"""
     
-    def __init__(self):
-        self.team_id = TEAM_ID
-        self.season = SAISON
+    def __init__(self, team_id=TEAM_ID, season=SAISON):
+        self.team_id = team_id
+        self.season = season
         
     def extract_table_data(self, soup):
         """Extrahiert Tabellendaten aus HTML mit BeautifulSoup"""
@@ -132,17 +176,17 @@ class TeamScraperService:
         
         return teams_data
     
-    def scrape_current_standings(self):
+    def scrape_standings(self, team_id, season):
         """
-        Scraped aktuelle Tabellendaten von fussball.de
+        Scraped die Tabelle für eine beliebige Team-ID und Saison
         
         Returns:
             tuple: (success: bool, data: list oder error_message: str)
         """
         try:
             # Staffel-Tabelle laden
-            url_table = f"https://www.fussball.de/ajax.team.table/-/saison/{self.season}/team-id/{self.team_id}"
-            response = requests.get(url_table, headers=HEADERS, timeout=10)
+            url_table = TABLE_URL_TEMPLATE.format(season=season, team_id=team_id)
+            response = http_client.get(url_table, timeout=10)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'html.parser')
@@ -162,6 +206,85 @@ class TeamScraperService:
                 
         except Exception as e:
             return False, f"Scraping-Fehler: {str(e)}"
+
+    def scrape_current_standings(self):
+        """
+        Scraped aktuelle Tabellendaten von fussball.de
+        
+        Returns:
+            tuple: (success: bool, data: list oder error_message: str)
+        """
+        return self.scrape_standings(self.team_id, self.season)
+
+    def collect_standings(self, targets, max_workers=BATCH_MAX_WORKERS,
+                          min_interval=BATCH_MIN_INTERVAL_SECONDS):
+        """
+        Scraped mehrere (team_id, season)-Ziele parallel über den gemeinsamen HTTP-Client
+        und prüft jedes Ergebnis gegen seine eigene erwartete Gruppe.
+        
+        Args:
+            targets: Liste von StandingsTarget oder (team_id, season)-Tupeln
+            max_workers: Anzahl paralleler Requests
+            min_interval: Mindestabstand zwischen zwei Requests in Sekunden
+            
+        Returns:
+            list: StandingsResult in der Reihenfolge der targets
+        """
+        targets = [
+            target if isinstance(target, StandingsTarget) else StandingsTarget(*target)
+            for target in targets
+        ]
+        if not targets:
+            return []
+
+        workers = max(1, min(max_workers, len(targets)))
+        limiter = RateLimiter(min_interval)
+
+        def run(target):
+            limiter.wait()
+            success, data = self.scrape_standings(target.team_id, target.season)
+            if not success:
+                return StandingsResult(target, False, f"Scraping fehlgeschlagen: {data}")
+
+            expected = list(target.expected_teams) if target.expected_teams else None
+            group_ok, group_message = validate_expected_group(data, target.season, expected)
+            if not group_ok:
+                return StandingsResult(target, False, f"Scraping blockiert: {group_message}", data)
+            return StandingsResult(target, True, group_message, data)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(run, targets))
+
+    def update_standings_database_batch(self, targets, **kwargs):
+        """
+        Scraped mehrere Ziele parallel und speichert alle gültigen Tabellen in einem Insert
+        
+        Returns:
+            tuple: (success: bool, message: str, results: list)
+        """
+        results = self.collect_standings(targets, **kwargs)
+        valid = [result for result in results if result.success]
+        failed = [result for result in results if not result.success]
+
+        if not valid:
+            details = "; ".join(
+                f"{r.target.season}/{r.target.team_id}: {r.message}" for r in failed
+            )
+            return False, f"❌ Keine gültigen Tabellen: {details}", results
+
+        db_success, db_message = db.save_team_standings_batch(
+            [(result.target.season, result.teams) for result in valid]
+        )
+        if not db_success:
+            return False, f"❌ Datenbankfehler: {db_message}", results
+
+        message = f"✅ {len(valid)} von {len(results)} Tabellen aktualisiert: {db_message}"
+        if failed:
+            details = "; ".join(
+                f"{r.target.season}/{r.target.team_id}: {r.message}" for r in failed
+            )
+            message += f" | Übersprungen: {details}"
+        return True, message, results
     
     def update_standings_database(self):
         """
@@ -175,7 +298,7 @@ class TeamScraperService:
         if not success:
             return False, f"Scraping fehlgeschlagen: {data}"
 
-        group_ok, group_message = validate_expected_group(data)
+        group_ok, group_message = validate_expected_group(data, self.season)
         if not group_ok:
             return False, f"Scraping blockiert: {group_message}"
 
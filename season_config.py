@@ -1,4 +1,5 @@
-from datetime import date
+from datetime import date, timedelta
+from functools import lru_cache
 import re
 import unicodedata
 
@@ -26,6 +27,34 @@ EXPECTED_GROUP_TEAMS = [
     "Dümpten",
 ]
 
+# Gruppe der Saison 25/26 (Bezirksliga Gruppe 5) für Nachträge älterer Tabellen
+PREVIOUS_GROUP_TEAMS_2526 = [
+    "FC Neukirchen-Vluyn",
+    "Duisburger FV 08",
+    "VfL Repelen",
+    "Duisburger SV 1900",
+    "Mülheimer SV 07",
+    "TuS Viktoria Buchholz",
+    "Rheinland Hamborn",
+    "SC 1920 Oberhausen",
+    "SuS 21 Oberhausen",
+    "SV Genc Osman Duisburg",
+    "Tus Asterlagen",
+    "GSG Duisburg",
+    "SuS 09 Dinslaken",
+    "SV Rhenania Hamborn",
+    "VFB Homberg II",
+    "Spvgg. Meiderich 06/95",
+    "Schwarz-Weiss Alstaden",
+    "1. FC Mülheim",
+]
+
+# Erwartete Gruppe je Saison-Code (fussball.de-Format, z.B. "2627")
+SEASON_GROUPS = {
+    "2526": PREVIOUS_GROUP_TEAMS_2526,
+    CURRENT_STANDINGS_SEASON: EXPECTED_GROUP_TEAMS,
+}
+
 _EXPECTED_TEAM_ALIASES = {
     "TuS Viktoria Buchholz": ["v buchholz", "viktoria buchholz", "tus viktoria buchholz"],
     "MH-Styrum": ["mh styrum", "mh-styrum"],
@@ -42,6 +71,22 @@ _EXPECTED_TEAM_ALIASES = {
     "SG DU-Süd": ["sg du sud", "sg du-sud", "sg du süd", "sg du-süd"],
     "SV Wanheim": ["sv wanheim"],
     "Dümpten": ["dumpten", "duempten"],
+    "FC Neukirchen-Vluyn": ["fc neukirchen vluyn", "neukirchen vluyn"],
+    "Duisburger FV 08": ["duisburger fv 08", "duisburger fv"],
+    "VfL Repelen": ["vfl repelen"],
+    "Duisburger SV 1900": ["duisburger sv 1900", "duisburger sv"],
+    "Mülheimer SV 07": ["mulheimer sv 07", "muelheimer sv 07"],
+    "Rheinland Hamborn": ["rheinland hamborn"],
+    "SC 1920 Oberhausen": ["sc 1920 oberhausen"],
+    "SuS 21 Oberhausen": ["sus 21 oberhausen"],
+    "SV Genc Osman Duisburg": ["sv genc osman duisburg", "genc osman duisburg"],
+    "Tus Asterlagen": ["tus asterlagen"],
+    "SuS 09 Dinslaken": ["sus 09 dinslaken"],
+    "SV Rhenania Hamborn": ["sv rhenania hamborn"],
+    "VFB Homberg II": ["vfb homberg ii", "vfb homberg 2"],
+    "Spvgg. Meiderich 06/95": ["spvgg meiderich 06 95", "spvgg meiderich"],
+    "Schwarz-Weiss Alstaden": ["schwarz weiss alstaden"],
+    "1. FC Mülheim": ["1 fc mulheim", "1 fc muelheim"],
 }
 
 
@@ -54,46 +99,105 @@ def normalize_team_name(team_name: str) -> str:
     return re.sub(r"\s+", " ", normalized).strip()
 
 
-EXPECTED_GROUP_TEAM_KEYS = {
-    normalize_team_name(alias)
-    for aliases in _EXPECTED_TEAM_ALIASES.values()
-    for alias in aliases
-}
+def format_season_label(season: str) -> str:
+    """Format a fussball.de season code ("2627") for messages ("26/27")."""
+    season = str(season)
+    if len(season) == 4 and season.isdigit():
+        return f"{season[:2]}/{season[2:]}"
+    return season
+
+
+def _alias_keys(team_names) -> set[str]:
+    return {
+        normalize_team_name(alias)
+        for team_name in team_names
+        for alias in _EXPECTED_TEAM_ALIASES.get(team_name, [team_name])
+    }
+
+
+def _team_key_from_normalized(normalized: str) -> str:
+    return normalized.replace(" ", "-")
+
+
+def _build_team_identity_index() -> dict[str, str]:
+    index = {}
+    for team_name, aliases in _EXPECTED_TEAM_ALIASES.items():
+        team_key = _team_key_from_normalized(normalize_team_name(team_name))
+        for alias in [team_name, *aliases]:
+            alias_key = normalize_team_name(alias)
+            if index.setdefault(alias_key, team_key) != team_key:
+                raise ValueError(f"Team-Alias '{alias}' ist mehreren Teams zugeordnet")
+    return index
+
+
+# Normalisierter Alias → kanonischer Team-Key (z.B. "v buchholz" → "tus-viktoria-buchholz")
+TEAM_IDENTITY_INDEX = _build_team_identity_index()
+
+
+@lru_cache(maxsize=1024)
+def resolve_team_key(team_name: str) -> str:
+    """Resolve a raw fussball.de team name to its canonical team key.
+
+    Unknown teams get a stable key derived from their normalized name.
+    """
+    normalized = normalize_team_name(team_name)
+    return TEAM_IDENTITY_INDEX.get(normalized, _team_key_from_normalized(normalized))
+
+
+VIKTORIA_TEAM_KEY = resolve_team_key("TuS Viktoria Buchholz")
+
+
+def is_viktoria_team(team_name: str) -> bool:
+    return bool(team_name) and resolve_team_key(team_name) == VIKTORIA_TEAM_KEY
+
+
+EXPECTED_GROUP_TEAM_KEYS = _alias_keys(EXPECTED_GROUP_TEAMS)
 
 
 def get_expected_group_team_keys() -> set[str]:
     return set(EXPECTED_GROUP_TEAM_KEYS)
 
 
-def validate_expected_group(standings_data: list[dict]) -> tuple[bool, str]:
-    scraped_keys = {
-        normalize_team_name(team.get("team_name", ""))
+def get_expected_group(season: str = CURRENT_STANDINGS_SEASON) -> list[str] | None:
+    """Return the configured group for a season code, or None if unknown."""
+    group = SEASON_GROUPS.get(str(season))
+    return list(group) if group is not None else None
+
+
+def validate_expected_group(
+    standings_data: list[dict],
+    season: str = CURRENT_STANDINGS_SEASON,
+    expected_teams: list[str] | None = None,
+) -> tuple[bool, str]:
+    label = format_season_label(season)
+    if expected_teams is None:
+        expected_teams = get_expected_group(season)
+    if not expected_teams:
+        return False, f"Keine erwartete Gruppe für Saison {label} konfiguriert"
+
+    expected_by_key = {resolve_team_key(team): team for team in expected_teams}
+    scraped_by_key = {
+        resolve_team_key(team["team_name"]): normalize_team_name(team["team_name"])
         for team in standings_data
         if team.get("team_name")
     }
 
-    matched_expected = set()
-    for expected_team, aliases in _EXPECTED_TEAM_ALIASES.items():
-        alias_keys = {normalize_team_name(alias) for alias in aliases}
-        if scraped_keys & alias_keys:
-            matched_expected.add(expected_team)
-
-    missing = [team for team in EXPECTED_GROUP_TEAMS if team not in matched_expected]
-    unexpected = sorted(scraped_keys - EXPECTED_GROUP_TEAM_KEYS)
+    missing = [team for key, team in expected_by_key.items() if key not in scraped_by_key]
+    unexpected = sorted(name for key, name in scraped_by_key.items() if key not in expected_by_key)
 
     if missing:
-        return False, f"Erwartete 26/27-Teams fehlen: {', '.join(missing)}"
+        return False, f"Erwartete {label}-Teams fehlen: {', '.join(missing)}"
 
-    if len(standings_data) != len(EXPECTED_GROUP_TEAMS):
+    if len(standings_data) != len(expected_teams):
         return (
             False,
-            f"Teamanzahl passt nicht zur 26/27-Gruppe: {len(standings_data)} statt {len(EXPECTED_GROUP_TEAMS)}",
+            f"Teamanzahl passt nicht zur {label}-Gruppe: {len(standings_data)} statt {len(expected_teams)}",
         )
 
     if unexpected:
-        return False, f"Unerwartete Teams in der 26/27-Tabelle: {', '.join(unexpected)}"
+        return False, f"Unerwartete Teams in der {label}-Tabelle: {', '.join(unexpected)}"
 
-    return True, "Teamliste passt zur 26/27-Gruppe"
+    return True, f"Teamliste passt zur {label}-Gruppe"
 
 
 def get_preseason_standings() -> list[dict]:
@@ -132,3 +236,10 @@ def get_preseason_viktoria_info() -> dict[str, str]:
 
 def is_training_date_in_current_season(training_date: date) -> bool:
     return training_date >= TRAINING_SEASON_START
+
+
+def season_date_range() -> tuple[date, date]:
+    """Erster und letzter Tag der laufenden Saison (bis zum Tag vor dem nächsten Trainingsstart)."""
+    start = min(TRAINING_SEASON_START, SEASON_MATCH_START)
+    next_start = TRAINING_SEASON_START.replace(year=TRAINING_SEASON_START.year + 1)
+    return start, next_start - timedelta(days=1)
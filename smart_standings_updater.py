@@ -9,7 +9,7 @@ import logging
 from datetime import datetime, timedelta
 from scraper_service import scraper_service
 from database_helper import db
-from season_config import normalize_team_name, validate_expected_group
+from season_config import is_viktoria_team, validate_expected_group
 
 # Logging konfigurieren
 logging.basicConfig(
@@ -59,7 +59,7 @@ def get_current_viktoria_data():
             return None
 
         for team in teams_data:
-            if normalize_team_name(team.get('team_name', '')) in {'v buchholz', 'viktoria buchholz', 'tus viktoria buchholz'}:
+            if is_viktoria_team(team.get('team_name', '')):
                 return team
         return None
     except Exception as e:
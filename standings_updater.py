@@ -5,9 +5,10 @@ Lädt aktuelle Tabellendaten und speichert sie in Supabase
 """
 
 import sys
+import argparse
 import logging
 from datetime import datetime
-from scraper_service import scraper_service
+from scraper_service import scraper_service, StandingsTarget, TEAM_ID
 from database_helper import db
 
 # Logging konfigurieren
@@ -58,5 +59,32 @@ def main():
     
     logger.info("🎉 Tabellen-Update erfolgreich abgeschlossen")
 
+def backfill(seasons, team_ids):
+    """Lädt mehrere Saisons/Teams parallel nach und speichert sie in einem Insert"""
+    
+    targets = [StandingsTarget(team_id, season) for team_id in team_ids for season in seasons]
+    logger.info(f"📚 Tabellen-Nachtrag für {len(targets)} Ziele gestartet")
+    
+    success, message, results = scraper_service.update_standings_database_batch(targets)
+    for result in results:
+        status = "✅" if result.success else "⚠️"
+        logger.info(f"{status} {result.target.season} / {result.target.team_id}: {result.message}")
+    
+    if success:
+        logger.info(message)
+    else:
+        logger.error(message)
+        sys.exit(1)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="ViktoriaInsights Tabellen-Updater")
+    parser.add_argument("--seasons", nargs="+", help="Saison-Codes für einen Nachtrag, z.B. 2526 2627")
+    parser.add_argument("--team-ids", nargs="+", default=[TEAM_ID], help="fussball.de Team-IDs (Standard: erste Mannschaft)")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    if args.seasons:
+        backfill(args.seasons, args.team_ids)
+    else:
+        main()
\ No newline at end of file
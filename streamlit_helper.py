@@ -0,0 +1,75 @@
+"""Optionale Streamlit-Anbindung für Datenzugriff und Scraper.
+
+Automatisierungs-Skripte (Cron, Scheduler) sollen Streamlit nicht importieren
+müssen. Streamlit wird daher nur genutzt, wenn es im Prozess bereits geladen
+ist (Dashboard) oder ein Wert weder in der Umgebung noch in der .env steht.
+"""
+
+import os
+import sys
+import time
+from functools import wraps
+from typing import Any, Optional
+
+_MISSING = object()
+_streamlit_module: Any = _MISSING
+
+
+def get_streamlit():
+    """Liefert das streamlit-Modul oder None, importiert es aber nur bei Bedarf."""
+    global _streamlit_module
+    if _streamlit_module is _MISSING:
+        try:
+            import streamlit
+            _streamlit_module = streamlit
+        except ImportError:
+            _streamlit_module = None
+    return _streamlit_module
+
+
+def streamlit_loaded() -> bool:
+    """True, wenn Streamlit bereits importiert wurde (z.B. in der Dashboard-App)."""
+    return "streamlit" in sys.modules
+
+
+def get_secret(key: str, section: Optional[str] = "supabase") -> Optional[str]:
+    """Liest einen Zugangswert: zuerst Umgebung/.env, danach st.secrets (flach und verschachtelt)."""
+    value = os.getenv(key)
+    if value:
+        return value
+
+    st = get_streamlit()
+    if st is None:
+        return None
+    try:
+        value = st.secrets.get(key)
+        if not value and section:
+            value = st.secrets.get(section, {}).get(key)
+    except Exception:
+        return None
+    return value or None
+
+
+def cache_data(ttl: int):
+    """st.cache_data im Dashboard, sonst ein einfacher TTL-Cache ohne Streamlit-Import."""
+    if streamlit_loaded():
+        return sys.modules["streamlit"].cache_data(ttl=ttl)
+
+    def decorator(func):
+        cache = {}
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            hit = cache.get(key)
+            now = time.monotonic()
+            if hit is not None and now - hit[0] < ttl:
+                return hit[1]
+            result = func(*args, **kwargs)
+            cache[key] = (now, result)
+            return result
+
+        wrapper.clear = cache.clear
+        return wrapper
+
+    return decorator
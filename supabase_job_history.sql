@@ -0,0 +1,15 @@
+-- Table to persist runs of the automation scheduler (scheduler.py)
+create table if not exists job_runs (
+    id bigserial primary key,
+    job_name text not null,
+    trigger text not null,
+    started_at timestamptz not null,
+    finished_at timestamptz,
+    duration_ms integer,
+    status text not null check (status in ('running', 'success', 'failed', 'timeout')),
+    message text,
+    created_at timestamptz not null default now()
+);
+
+create index if not exists idx_job_runs_job_started
+    on job_runs (job_name, started_at desc);
@@ -0,0 +1,56 @@
+-- Server-side aggregates for the dashboard (DatabaseHelper.get_training_statistics,
+-- DatabaseHelper.get_last_week_donkey). Each call returns a single row instead of
+-- the raw fact rows. Both methods fall back to computing in Python when the
+-- functions are not deployed yet.
+
+-- Training statistics of a season: number of training days, number of wins and
+-- participants (2 x wins) of the latest and the previous training day.
+create or replace function training_statistics(p_season_start date default null)
+returns table (
+    total_trainings integer,
+    total_victories integer,
+    latest_participants integer,
+    previous_participants integer
+)
+language sql stable as $$
+    with per_day as (
+        select date_key, count(*) filter (where win_cnt > 0) as victories
+        from fact_training_win
+        where p_season_start is null
+           or date_key >= to_char(p_season_start, 'YYYYMMDD')::integer
+        group by date_key
+    ),
+    ranked as (
+        select victories, row_number() over (order by date_key desc) as position
+        from per_day
+    )
+    select
+        (select count(*) from per_day)::integer,
+        (select coalesce(sum(victories), 0) from per_day)::integer,
+        (select victories * 2 from ranked where position = 1)::integer,
+        (select victories * 2 from ranked where position = 2)::integer
+$$;
+
+-- Player with the highest penalty total between two dates (inclusive).
+-- Ties are broken alphabetically, like the pandas implementation.
+create or replace function weekly_donkey(p_week_start date, p_week_end date)
+returns table (player_name text, total_amount numeric, penalty_count integer)
+language sql stable as $$
+    select
+        coalesce(p.name, 'Unbekannt') as player_name,
+        round(sum(f.amount_eur)::numeric, 2) as total_amount,
+        count(*)::integer as penalty_count
+    from fact_penalty f
+    left join dim_player p on p.player_key = f.player_key
+    where f.date_key between to_char(p_week_start, 'YYYYMMDD')::integer
+                         and to_char(p_week_end, 'YYYYMMDD')::integer
+    group by coalesce(p.name, 'Unbekannt')
+    order by total_amount desc, player_name
+    limit 1
+$$;
+
+grant execute on function training_statistics(date) to anon, authenticated;
+grant execute on function weekly_donkey(date, date) to anon, authenticated;
+
+-- Range scans on the penalty date (fact_training_win is already keyed by date_key)
+create index if not exists idx_fact_penalty_date_key on fact_penalty (date_key);
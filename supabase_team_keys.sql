@@ -0,0 +1,16 @@
+-- Canonical team keys (season_config.resolve_team_key) for exact, indexed team lookups.
+-- New rows get their key at ingest time (scraper_service, scrape_match_reports).
+alter table team_standings add column if not exists team_key text;
+alter table matches add column if not exists home_team_key text;
+alter table matches add column if not exists away_team_key text;
+alter table lineups add column if not exists team_key text;
+
+-- Existing rows are backfilled from Python (python backfill_team_keys.py), so
+-- old and new rows get their key from the same resolve_team_key and cannot
+-- drift apart through a second normalizer in SQL.
+
+create index if not exists idx_team_standings_season_team_key
+    on team_standings (season, team_key, scraped_at desc);
+create index if not exists idx_matches_home_team_key on matches (home_team_key);
+create index if not exists idx_matches_away_team_key on matches (away_team_key);
+create index if not exists idx_lineups_team_key on lineups (team_key);
@@ -0,0 +1,38 @@
+-- Atomic replacement of one training day (DatabaseHelper.add_training_day_entries).
+-- The submitted roster is diffed against the existing fact_training_win rows in a
+-- single transaction: players no longer listed are deleted, new players inserted
+-- and only rows whose counts changed are updated on the (date_key, player_key)
+-- primary key. A failure leaves the previous state of the day untouched.
+-- The caller makes sure the dim_date row exists (pre-generated per season).
+--
+-- p_entries: [{"player_key": 1, "played_cnt": 1, "win_cnt": 0}, ...]
+-- Returns the number of deleted and upserted (inserted or changed) rows.
+create or replace function replace_training_day(p_date_key integer, p_entries jsonb)
+returns table (deleted integer, upserted integer)
+language plpgsql as $$
+declare
+    v_deleted integer;
+    v_upserted integer;
+begin
+    delete from fact_training_win f
+    where f.date_key = p_date_key
+      and not exists (
+          select 1 from jsonb_to_recordset(p_entries) as s(player_key integer)
+          where s.player_key = f.player_key
+      );
+    get diagnostics v_deleted = row_count;
+
+    insert into fact_training_win as f (date_key, player_key, played_cnt, win_cnt)
+    select p_date_key, s.player_key, coalesce(s.played_cnt, 1), s.win_cnt
+    from jsonb_to_recordset(p_entries) as s(player_key integer, played_cnt smallint, win_cnt smallint)
+    on conflict (date_key, player_key) do update
+        set played_cnt = excluded.played_cnt,
+            win_cnt = excluded.win_cnt
+        where (f.played_cnt, f.win_cnt) is distinct from (excluded.played_cnt, excluded.win_cnt);
+    get diagnostics v_upserted = row_count;
+
+    return query select v_deleted, v_upserted;
+end
+$$;
+
+grant execute on function replace_training_day(integer, jsonb) to anon, authenticated;
@@ -0,0 +1,7 @@
+-- Idempotency key for penalties written through the local write journal
+-- (write_journal.py, DatabaseHelper.enqueue_penalty). A retried batch upserts with
+-- on_conflict=request_id and ignore_duplicates, so a penalty is never stored twice
+-- even if the first attempt succeeded but its response was lost.
+alter table fact_penalty add column if not exists request_id uuid;
+
+create unique index if not exists fact_penalty_request_id_key on fact_penalty (request_id);
@@ -1,14 +1,13 @@
-import streamlit as st
 from datetime import datetime
 from database_helper import db
 from scraper_service import scraper_service
-from timezone_helper import get_german_now
 from season_config import SEASON_DISPLAY, get_preseason_viktoria_info
+from streamlit_helper import cache_data
 
 # Fallback-Daten bis fussball.de die neue Saison ausliefert.
 FALLBACK_DATA = get_preseason_viktoria_info()
 
-@st.cache_data(ttl=3600)  # Cache für 1 Stunde (da DB bereits tägliches Update hat)
+@cache_data(ttl=3600)  # Cache für 1 Stunde (da DB bereits tägliches Update hat)
 def get_team_data():
     """
     Hauptfunktion zum Abrufen der Teamdaten mit Supabase-Integration
@@ -17,22 +16,17 @@ def get_team_data():
         tuple: (viktoria_info: dict, data_source: str)
     """
     
-    # 1. Versuche Daten aus Supabase zu laden
-    viktoria_data = db.get_latest_viktoria_data()
+    # 1. Versuche Daten aus Supabase zu laden (Stand, Alter und Aktualität in einer Abfrage)
+    snapshot = db.get_standings_snapshot()
+    viktoria_data = snapshot['viktoria']
     
     if viktoria_data:
-        # Prüfe Aktualität der Daten
-        is_current = db.is_standings_data_current()
-        
-        if is_current:
+        if snapshot['is_current']:
             return viktoria_data, "Supabase (aktuell)"
+        elif snapshot['age_hours'] is not None:
+            return viktoria_data, f"Supabase ({snapshot['age_hours']:.1f}h alt)"
         else:
-            last_update = db.get_standings_last_update()
-            if last_update:
-                hours_old = (get_german_now() - last_update).total_seconds() / 3600
-                return viktoria_data, f"Supabase ({hours_old:.1f}h alt)"
-            else:
-                return viktoria_data, "Supabase (unbekanntes Alter)"
+            return viktoria_data, "Supabase (unbekanntes Alter)"
     
     # 2. Fallback: Versuche Live-Scraping (nur wenn keine DB-Daten vorhanden)
     try:
@@ -75,11 +69,12 @@ def get_data_status_info():
     Returns:
         dict: Status-Informationen
     """
-    last_update = db.get_standings_last_update()
-    is_current = db.is_standings_data_current()
+    snapshot = db.get_standings_snapshot()
+    last_update = snapshot['last_update']
+    is_current = snapshot['is_current']
     
     if last_update:
-        hours_old = (get_german_now() - last_update).total_seconds() / 3600
+        hours_old = snapshot['age_hours']
         
         return {
             'last_update': last_update,
@@ -48,21 +48,17 @@ def test_scraping_only():
     
     try:
         # Direkt importieren ohne database_helper
-        import requests
         from bs4 import BeautifulSoup
+        from http_client import http_client
         
         # Team-ID für TuS Viktoria Buchholz
         TEAM_ID = "011MI9UHGG000000VTVG0001VTR8C1K7"
         SAISON = CURRENT_STANDINGS_SEASON
         
-        HEADERS = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
-        
         url_table = f"https://www.fussball.de/ajax.team.table/-/saison/{SAISON}/team-id/{TEAM_ID}"
         print(f"📡 Teste URL: {url_table}")
         
-        response = requests.get(url_table, headers=HEADERS, timeout=10)
+        response = http_client.get(url_table, timeout=10)
         print(f"📊 HTTP Status: {response.status_code}")
         
         if response.status_code == 200:
@@ -0,0 +1,11 @@
+from database_helper import DatabaseHelper
+
+
+def make_helper(supabase=None, connected=True):
+    """DatabaseHelper ohne echten Verbindungsaufbau; supabase ist das Test-Double für den Client"""
+    helper = DatabaseHelper()
+    # Kein _connect(): weder Supabase-Client noch Health-Check-Thread
+    helper._connection_attempted = True
+    helper.connected = connected
+    helper.supabase = supabase
+    return helper
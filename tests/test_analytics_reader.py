@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+import pandas as pd
+
+from analytics_reader import ANALYTICS_QUERIES, AnalyticsReader, arrow_available, table_from_csv
+from database_helper import PENALTY_COLUMNS, DatabaseHelper
+from helpers import make_helper
+from local_replica import LocalReplica, ReplicaTable
+
+TABLES = {
+    'dim_player': [{'player_key': 1, 'name': 'Anna'}, {'player_key': 2, 'name': 'Ben'}],
+    'dim_penalty_type': [{'penalty_type_key': 1, 'description': 'Verspätung'}],
+    'fact_penalty': [
+        {'penalty_id': 1, 'date_key': 20261005, 'player_key': 1, 'penalty_type_key': 1, 'amount_eur': 5.0, 'note': None},
+        {'penalty_id': 2, 'date_key': 20261012, 'player_key': 2, 'penalty_type_key': 1, 'amount_eur': 1.5, 'note': 'Token'},
+        {'penalty_id': 3, 'date_key': 20261012, 'player_key': 9, 'penalty_type_key': 7, 'amount_eur': 2.0, 'note': ''},
+    ],
+    'fact_training_win': [
+        {'date_key': 20260630, 'player_key': 1, 'played_cnt': 1, 'win_cnt': 1},
+        {'date_key': 20261014, 'player_key': 1, 'played_cnt': 1, 'win_cnt': 0},
+        {'date_key': 20261014, 'player_key': 2, 'played_cnt': 1, 'win_cnt': 1},
+        {'date_key': 20261016, 'player_key': 9, 'played_cnt': 1, 'win_cnt': 2},
+        {'date_key': 20271231, 'player_key': 2, 'played_cnt': 1, 'win_cnt': 0},
+    ],
+    'lineups': [
+        {'match_id': '0042', 'team_side': 'home', 'team_name': 'Viktoria', 'team_key': 'viktoria', 'role': 'starter',
+         'number': 10, 'name': 'Anna', 'player_id': '01X', 'is_captain': True, 'is_goalkeeper': False},
+    ],
+}
+
+
+@unittest.skipUnless(arrow_available(), "pyarrow nicht installiert")
+class AnalyticsReaderTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        tables = [ReplicaTable(name) for name in TABLES]
+        self.replica = LocalReplica(os.path.join(directory.name, 'replica.sqlite3'), tables=tables)
+        self.addCleanup(self.replica.close)
+        self.replica.sync(lambda table, *args, **kwargs: [dict(row) for row in TABLES[table]])
+        self.reader = AnalyticsReader(replica=self.replica)
+
+    def test_penalties_match_the_json_path(self):
+        expected = DatabaseHelper._penalty_frame(self.replica.penalty_rows(), list(PENALTY_COLUMNS))
+
+        df = self.reader.read_frame('penalties')
+
+        pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+        self.assertEqual(str(df['Datum'].dtype), 'datetime64[ns]')
+        self.assertEqual(df['Spieler'].tolist(), ['Unbekannt', 'Ben', 'Anna'])
+
+    def test_training_victories_with_season_filter(self):
+        df = self.reader.read_frame('training_victories', start_key=20261001)
+
+        self.assertEqual(list(df.columns), ['Spieler', 'Datum', 'Sieg'])
+        self.assertEqual(df['Sieg'].tolist(), [False, True, True, False])
+        self.assertTrue(self.reader.read_frame('training_victories', start_key=20280101).empty)
+
+    def test_helper_arrow_path_matches_json_path(self):
+        helper = make_helper()
+        helper.replica = self.replica
+        season_start = date(2026, 7, 1)
+
+        arrow_training = helper.get_training_victories(season_start=season_start)
+        arrow_penalties = helper.get_penalties(start=date(2026, 10, 1), columns=['Datum', 'Spieler', 'Betrag'])
+        with mock.patch('database_helper.arrow_available', return_value=False):
+            json_training = helper.get_training_victories(season_start=season_start)
+            json_penalties = helper.get_penalties(start=date(2026, 10, 1), columns=['Datum', 'Spieler', 'Betrag'])
+
+        pd.testing.assert_frame_equal(arrow_training, json_training)
+        pd.testing.assert_frame_equal(arrow_penalties, json_penalties)
+        self.assertEqual(arrow_training['Datum'].dt.strftime('%Y%m%d').tolist(),
+                         ['20271231', '20261016', '20261014', '20261014'])
+        self.assertEqual(list(arrow_penalties.columns), ['Datum', 'Spieler', 'Betrag'])
+
+    def test_copy_csv_keeps_null_and_empty_string_apart(self):
+        query = ANALYTICS_QUERIES['lineups']
+        data = (b'match_id,team_side,team_name,team_key,role,number,name,player_id,is_captain,is_goalkeeper\n'
+                b'0042,home,"",,starter,10,Anna,01X,t,f\n')
+
+        table = table_from_csv(data, query.schema())
+
+        row = table.to_pylist()[0]
+        self.assertEqual(row['match_id'], '0042')
+        self.assertEqual(row['team_name'], '')
+        self.assertIsNone(row['team_key'])
+        self.assertEqual((row['is_captain'], row['is_goalkeeper']), (True, False))
+        self.assertEqual(self.reader.read_table('lineups').to_pylist()[0]['player_id'], '01X')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+
+from connection_manager import CLOSED, HALF_OPEN, OPEN, ConnectionManager
+from database_helper import DatabaseHelper
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Backend:
+    """Client-Fabrik und Probe, deren Erreichbarkeit der Test umschaltet."""
+
+    def __init__(self, up=True):
+        self.up = up
+        self.connects = 0
+        self.probes = 0
+
+    def connect(self):
+        self.connects += 1
+        if not self.up:
+            raise ConnectionError('Name or service not known')
+        return object()
+
+    def probe(self, client):
+        self.probes += 1
+        if not self.up:
+            raise TimeoutError('timed out')
+
+
+class ConnectionManagerTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.backend = _Backend(up=False)
+        self.manager = ConnectionManager(self.backend.connect, self.backend.probe, clock=self.clock)
+
+    def test_failed_start_recovers_after_backoff(self):
+        self.assertIsNone(self.manager.connect())
+        self.assertEqual(self.manager.state, OPEN)
+
+        # Während des Backoffs kein neuer Versuch, sofort None
+        self.backend.up = True
+        self.clock.now = 1
+        self.assertIsNone(self.manager.connect())
+        self.assertEqual(self.backend.connects, 1)
+
+        self.clock.now = 2
+        self.assertTrue(self.manager.check())
+        self.assertEqual(self.manager.state, CLOSED)
+        self.assertTrue(self.manager.get_status()['connected'])
+
+    def test_backoff_doubles_until_success(self):
+        self.manager.connect()
+        self.clock.now = 2
+        self.manager.connect()
+        self.assertEqual(self.manager.get_status()['retry_in_seconds'], 4)
+        self.clock.now = 6
+        self.manager.connect()
+        self.assertEqual(self.manager.get_status()['retry_in_seconds'], 8)
+        self.assertEqual(self.backend.connects, 3)
+
+    def test_probe_failures_open_the_circuit(self):
+        self.backend.up = True
+        self.manager.connect()
+        self.backend.up = False
+
+        self.assertTrue(self.manager.check())
+        self.assertFalse(self.manager.check())
+
+        self.assertEqual(self.manager.state, OPEN)
+        self.assertIsNone(self.manager.client)
+        self.assertEqual(self.manager.get_status()['last_error'], 'timed out')
+
+    def test_missing_configuration_is_not_retried(self):
+        manager = ConnectionManager(lambda: None, self.backend.probe, clock=self.clock)
+
+        self.assertIsNone(manager.connect())
+        self.clock.now = 1000
+        self.assertFalse(manager.check())
+        self.assertEqual(manager.get_status()['state'], 'not_configured')
+        self.assertNotIn(manager.state, (OPEN, HALF_OPEN))
+
+
+class HelperReconnectTests(unittest.TestCase):
+    def test_helper_switches_back_from_fallback(self):
+        clock = _Clock()
+        backend = _Backend(up=False)
+        helper = DatabaseHelper()
+        helper.connection = ConnectionManager(backend.connect, backend.probe, clock=clock)
+        helper._start_health_checks = lambda: None
+        helper.cache.get_or_load('key', lambda: 1, 60, ('players',))
+
+        helper._ensure_connected()
+        self.assertFalse(helper.connected)
+        self.assertEqual(helper.get_connection_info()['health']['state'], OPEN)
+
+        backend.up = True
+        clock.now = 2
+        self.assertTrue(helper.check_connection())
+        self.assertTrue(helper.connected)
+        self.assertIsNotNone(helper.supabase)
+        self.assertEqual(helper.cache.get_stats()['entries'], 0)
+
+    def test_query_errors_feed_the_breaker(self):
+        backend = _Backend(up=True)
+        helper = DatabaseHelper()
+        helper.connection = ConnectionManager(backend.connect, backend.probe, clock=_Clock())
+        helper._start_health_checks = lambda: None
+        helper._ensure_connected()
+        self.assertTrue(helper.connected)
+
+        class _Rejected(Exception):
+            code = '42883'
+
+        def use_client_raising(error):
+            def execute():
+                raise error
+            query = type('Query', (), {'execute': staticmethod(execute)})()
+            helper.connection.client = type('Client', (), {'rpc': staticmethod(lambda *args: query)})()
+            helper._sync_connection()
+
+        use_client_raising(_Rejected('no such function'))
+        for _ in range(3):
+            with self.assertRaises(_Rejected):
+                helper.call_rpc('missing')
+        self.assertEqual(helper.connection.state, CLOSED)
+
+        use_client_raising(TimeoutError('timed out'))
+        for _ in range(2):
+            with self.assertRaises(TimeoutError):
+                helper.call_rpc('team_stats')
+        self.assertEqual(helper.connection.state, OPEN)
+        self.assertFalse(helper.connected)
+
+
+if __name__ == "__main__":
+    unittest.main()
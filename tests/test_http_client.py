@@ -0,0 +1,56 @@
+import http.server
+import threading
+import unittest
+
+from http_client import HttpClient, ResponseTooLargeError
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"x" * (2000 if self.path.startswith("/big") else 10)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HttpClientTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.client = HttpClient(max_response_bytes=1000)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_small_response_is_read_and_counted(self):
+        response = self.client.get(f"{self.base_url}/small")
+        self.assertEqual(response.text, "x" * 10)
+
+        metrics = self.client.get_metrics()[f"127.0.0.1:{self.server.server_port}"]
+        self.assertEqual(metrics["requests"], 1)
+        self.assertEqual(metrics["bytes"], 10)
+        self.assertEqual(metrics["errors"], 0)
+
+    def test_oversized_response_is_rejected(self):
+        with self.assertRaises(ResponseTooLargeError):
+            self.client.get(f"{self.base_url}/big")
+
+        metrics = self.client.get_metrics()[f"127.0.0.1:{self.server.server_port}"]
+        self.assertEqual(metrics["errors"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from database_helper import PENALTY_COLUMNS
+from helpers import make_helper
+from local_replica import PENALTY_TABLES, TRAINING_TABLES, LocalReplica
+
+
+class _Query:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def gt(self, column, value):
+        return _Query([row for row in self.rows if row[column] > value])
+
+    def gte(self, column, value):
+        return _Query([row for row in self.rows if row[column] >= value])
+
+
+class _Server:
+    """Supabase-Ersatz für DatabaseHelper.read_table"""
+
+    def __init__(self):
+        self.tables = {
+            'dim_player': [{'player_key': 1, 'name': 'Anna'}, {'player_key': 2, 'name': 'Ben'}],
+            'dim_penalty_type': [{'penalty_type_key': 1, 'description': 'Verspätung'}],
+            'fact_penalty': [
+                {'penalty_id': 1, 'date_key': 20261005, 'player_key': 1, 'penalty_type_key': 1,
+                 'amount_eur': 5.0, 'note': None},
+                {'penalty_id': 2, 'date_key': 20261012, 'player_key': 2, 'penalty_type_key': 1,
+                 'amount_eur': 1.0, 'note': 'Token'},
+            ],
+            'fact_training_win': [
+                {'date_key': 20261006, 'player_key': 1, 'win_cnt': 1},
+                {'date_key': 20261008, 'player_key': 2, 'win_cnt': 0},
+            ],
+        }
+        self.fetched = []
+
+    def fetch(self, table, columns, key_columns, filters=None):
+        query = _Query(list(self.tables[table]))
+        if filters is not None:
+            query = filters(query)
+        self.fetched.append((table, len(query.rows)))
+        return [dict(row) for row in query.rows]
+
+
+class LocalReplicaTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.now = 0.0
+        self.server = _Server()
+        self.replica = LocalReplica(os.path.join(directory.name, 'replica.sqlite3'), clock=lambda: self.now)
+        self.addCleanup(self.replica.close)
+
+    def test_incremental_sync_loads_new_rows_and_drops_deleted_ones(self):
+        self.replica.sync(self.server.fetch, PENALTY_TABLES)
+        self.server.tables['fact_penalty'].append(
+            {'penalty_id': 3, 'date_key': 20261013, 'player_key': 1, 'penalty_type_key': 1,
+             'amount_eur': 15.0, 'note': None}
+        )
+        del self.server.tables['fact_penalty'][0]
+        self.now = 61
+        self.server.fetched.clear()
+
+        loaded = self.replica.sync(self.server.fetch, PENALTY_TABLES)
+
+        # Nur die neue Strafe wird geladen, ohne Schlüsselabgleich; die Dimensionen sind noch nicht fällig
+        self.assertEqual(loaded, {'fact_penalty': 1})
+        self.assertEqual(self.server.fetched, [('fact_penalty', 1)])
+        self.assertEqual([row['penalty_id'] for row in self.replica.penalty_rows()], [3, 2, 1])
+
+        # Nach einer lokalen Löschung werden die Schlüssel abgeglichen
+        self.replica.mark_stale('penalties', deleted=True)
+        self.assertEqual(self.replica.sync(self.server.fetch, PENALTY_TABLES), {'fact_penalty': 0})
+        self.assertEqual([row['penalty_id'] for row in self.replica.penalty_rows()], [3, 2])
+
+    def test_local_write_syncs_incrementally(self):
+        self.replica.sync(self.server.fetch, PENALTY_TABLES)
+        self.server.tables['fact_penalty'].append(
+            {'penalty_id': 3, 'date_key': 20261013, 'player_key': 1, 'penalty_type_key': 1,
+             'amount_eur': 15.0, 'note': None}
+        )
+        self.server.fetched.clear()
+
+        self.replica.mark_stale('penalties')
+
+        self.assertEqual(self.replica.sync(self.server.fetch, PENALTY_TABLES), {'fact_penalty': 1})
+        self.assertEqual(self.server.fetched, [('fact_penalty', 1)])
+
+    def test_backdated_training_day_is_replaced(self):
+        self.replica.sync(self.server.fetch, TRAINING_TABLES)
+        # Trainingstag vor dem Wasserstand nachgetragen, ein späterer Tag korrigiert
+        self.server.tables['fact_training_win'] = [
+            {'date_key': 20261006, 'player_key': 1, 'win_cnt': 1},
+            {'date_key': 20261007, 'player_key': 1, 'win_cnt': 1},
+            {'date_key': 20261007, 'player_key': 2, 'win_cnt': 0},
+        ]
+
+        self.replica.mark_stale('training', since=20261007)
+        self.assertEqual(self.replica.sync(self.server.fetch, TRAINING_TABLES), {'fact_training_win': 2})
+
+        rows = [(row['date_key'], row['player_key']) for row in self.replica.training_rows()]
+        self.assertEqual(rows, [(20261007, 2), (20261007, 1), (20261006, 1)])
+
+    def test_mark_stale_forces_full_reload(self):
+        self.replica.sync(self.server.fetch, PENALTY_TABLES)
+        self.server.tables['dim_player'][0]['name'] = 'Anna B.'
+
+        self.replica.mark_stale('players')
+        self.assertEqual(self.replica.sync(self.server.fetch, PENALTY_TABLES), {'dim_player': 2})
+        self.assertEqual(self.replica.penalty_rows(players=['Anna B.'])[0]['dim_player'], {'name': 'Anna B.'})
+
+    def test_offline_helper_reads_from_replica(self):
+        self.replica.sync(self.server.fetch, PENALTY_TABLES)
+        helper = make_helper(connected=False)
+        helper.replica = self.replica
+
+        df = helper.get_penalties(start=date(2026, 10, 10), columns=PENALTY_COLUMNS)
+
+        self.assertEqual(list(df['Spieler']), ['Ben'])
+        self.assertEqual(df['Betrag'].tolist(), [1.0])
+        self.assertEqual(str(df['Datum'].iloc[0].date()), '2026-10-12')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+import time
+import unittest
+from contextlib import contextmanager
+from datetime import date
+
+import numpy as np
+
+from helpers import make_helper
+from pg_backend import PostgresBackend
+
+
+class _Backend:
+    def __init__(self):
+        self.calls = []
+
+    def replace_training_day(self, date_row, entries):
+        self.calls.append((date_row['date_key'], sorted((e['player_key'], e['win_cnt']) for e in entries)))
+        return len(entries)
+
+    def fetch_all(self, sql, params=None):
+        self.calls.append((sql, params))
+        return []
+
+    def delete_penalties(self, penalty_ids):
+        self.calls.append(list(penalty_ids))
+        return list(penalty_ids)
+
+
+class _NoPostgrest:
+    def table(self, name):
+        raise AssertionError(f"PostgREST-Aufruf auf {name} trotz Postgres-Backend")
+
+
+class PostgresBackendRoutingTests(unittest.TestCase):
+    def test_training_day_is_written_in_one_transaction(self):
+        helper = make_helper(_NoPostgrest())
+        helper.pg = _Backend()
+        helper._player_keys = {'Anna': 1, 'Ben': 2}
+        helper._dim_loaded_at = time.monotonic()
+
+        ok, message = helper.add_training_day_entries(date(2026, 10, 14), ['Ben'], ['Anna', 'Ben', 'Carl'])
+
+        self.assertTrue(ok, message)
+        self.assertEqual(helper.pg.calls[-1], (20261014, [(1, 0), (2, 1)]))
+        self.assertIn(20261014, helper._date_keys)
+
+    def test_duplicate_ids_count_once_when_deleting(self):
+        helper = make_helper(_NoPostgrest())
+        helper.pg = _Backend()
+
+        ok, message = helper.delete_multiple_penalties([7, 8, 7])
+
+        self.assertTrue(ok)
+        self.assertIn("Alle 2 Strafen", message)
+        self.assertEqual(helper.pg.calls, [[7, 8]])
+
+
+class _Cursor:
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, sql, params):
+        self.executed.append(params)
+
+    def fetchall(self):
+        return [{'penalty_id': 7}]
+
+
+class PostgresBackendParameterTests(unittest.TestCase):
+    def setUp(self):
+        # Ohne Pool: nur die Parameter, die an psycopg gehen, werden geprüft
+        self.backend = PostgresBackend.__new__(PostgresBackend)
+        self.cursor = _Cursor()
+
+        @contextmanager
+        def transaction():
+            yield self.cursor
+
+        self.backend.transaction = transaction
+
+    def test_numpy_scalars_are_converted(self):
+        self.backend.delete_penalties(np.array([3, 4], dtype='int64'))
+        self.backend.insert_penalties([{'date_key': np.int64(20261014), 'player_key': np.int64(1),
+                                        'penalty_type_key': np.int64(2), 'amount_eur': np.float64(5),
+                                        'note': None}])
+
+        deleted, inserted = self.cursor.executed
+        self.assertEqual([type(value) for value in deleted[0]], [int, int])
+        self.assertEqual([type(column[0]) for column in inserted[:5]], [int, int, int, float, int])
+
+
+class _Rpc:
+    def __init__(self, supabase, name, params):
+        self.supabase, self.name, self.params = supabase, name, params
+
+    def execute(self):
+        self.supabase.rpc_calls.append((self.name, self.params))
+        if self.supabase.rpc_error:
+            raise self.supabase.rpc_error
+        return type('Response', (), {'data': [{'deleted': 1, 'upserted': 2}]})()
+
+
+class _Table:
+    def __init__(self, supabase, name):
+        self.supabase, self.name = supabase, name
+
+    def delete(self):
+        self.supabase.table_calls.append((self.name, 'delete'))
+        return self
+
+    def insert(self, rows):
+        self.supabase.table_calls.append((self.name, 'insert', rows))
+        self.rows = rows
+        return self
+
+    def eq(self, column, value):
+        return self
+
+    def execute(self):
+        return type('Response', (), {'data': getattr(self, 'rows', [])})()
+
+
+class _Supabase:
+    def __init__(self, rpc_error=None):
+        self.rpc_error = rpc_error
+        self.rpc_calls = []
+        self.table_calls = []
+
+    def rpc(self, name, params):
+        return _Rpc(self, name, params)
+
+    def table(self, name):
+        return _Table(self, name)
+
+
+class TrainingDayRpcTests(unittest.TestCase):
+    def rpc_helper(self, supabase):
+        helper = make_helper(supabase)
+        helper._player_keys = {'Anna': 1, 'Ben': 2}
+        helper._date_keys = {20261014}
+        helper._dim_loaded_at = time.monotonic()
+        return helper
+
+    def test_training_day_is_diffed_by_one_rpc(self):
+        helper = self.rpc_helper(_Supabase())
+
+        ok, message = helper.add_training_day_entries('2026-10-14', ['Ben'], ['Anna', 'Ben'])
+
+        self.assertTrue(ok, message)
+        self.assertIn('3 geändert', message)
+        self.assertEqual(helper.supabase.rpc_calls, [('replace_training_day', {
+            'p_date_key': 20261014,
+            'p_entries': [{'player_key': 1, 'played_cnt': 1, 'win_cnt': 0},
+                          {'player_key': 2, 'played_cnt': 1, 'win_cnt': 1}],
+        })])
+        self.assertEqual(helper.supabase.table_calls, [])
+
+    def test_missing_function_falls_back_to_delete_and_insert(self):
+        helper = self.rpc_helper(_Supabase(Exception('Could not find the function public.replace_training_day')))
+
+        ok, message = helper.add_training_day_entries('2026-10-14', ['Ben'], ['Anna', 'Ben'])
+
+        self.assertTrue(ok, message)
+        self.assertEqual([call[1] for call in helper.supabase.table_calls], ['delete', 'insert'])
+        self.assertEqual(helper.supabase.table_calls[1][2][0]['date_key'], 20261014)
+
+    def test_other_rpc_errors_do_not_delete_the_day(self):
+        helper = self.rpc_helper(_Supabase(Exception('violates foreign key constraint')))
+
+        ok, message = helper.add_training_day_entries('2026-10-14', ['Ben'], ['Anna', 'Ben'])
+
+        self.assertFalse(ok)
+        self.assertEqual(helper.supabase.table_calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+
+import pandas as pd
+
+from helpers import make_helper
+from query_cache import QueryCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class QueryCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.cache = QueryCache(clock=self.clock)
+        self.loads = 0
+
+    def _load(self):
+        self.loads += 1
+        return pd.DataFrame({"Spieler": ["A"], "Betrag": [5.0]})
+
+    def test_hits_until_ttl_expires(self):
+        for _ in range(3):
+            self.cache.get_or_load("penalties", self._load, ttl=60, tags=["penalties"])
+        self.clock.now = 61
+        self.cache.get_or_load("penalties", self._load, ttl=60, tags=["penalties"])
+
+        self.assertEqual(self.loads, 2)
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 2))
+
+    def test_invalidate_only_drops_matching_tags(self):
+        self.cache.get_or_load("penalties", self._load, ttl=60, tags=["penalties"])
+        self.cache.get_or_load("training", self._load, ttl=60, tags=["training"])
+
+        self.assertEqual(self.cache.invalidate("penalties"), 1)
+        self.cache.get_or_load("training", self._load, ttl=60, tags=["training"])
+        self.cache.get_or_load("penalties", self._load, ttl=60, tags=["penalties"])
+        self.assertEqual(self.loads, 3)
+
+    def test_callers_get_independent_copies(self):
+        first = self.cache.get_or_load("penalties", self._load, ttl=60)
+        first.loc[0, "Betrag"] = 99.0
+        second = self.cache.get_or_load("penalties", self._load, ttl=60)
+        self.assertEqual(second.loc[0, "Betrag"], 5.0)
+
+
+class _FailingTable:
+    def __getattr__(self, name):
+        raise ConnectionError("offline")
+
+
+class _FailingClient:
+    def table(self, name):
+        return _FailingTable()
+
+
+class CachedQueryFallbackTests(unittest.TestCase):
+    def setUp(self):
+        self.helper = make_helper(_FailingClient())
+
+    def test_fallback_results_are_not_cached(self):
+        self.assertTrue(self.helper.get_penalty_types())
+        self.assertTrue(self.helper.get_players_by_role("Spieler") is not None)
+
+        self.assertEqual(self.helper.cache.get_stats()["entries"], 0)
+
+    def test_successful_results_are_cached(self):
+        self.helper.supabase = None
+        self.helper.read_table = lambda *args, **kwargs: [{"description": "Verspätung", "default_amount": 5}]
+
+        self.assertEqual(self.helper.get_penalty_types()[0]["description"], "Verspätung")
+        self.assertEqual(self.helper.cache.get_stats()["entries"], 1)
+
+
+class _CountQuery:
+    def __init__(self, client):
+        self.client = client
+
+    def select(self, columns, count=None):
+        self.client.selects.append((columns, count))
+        return self
+
+    def limit(self, size):
+        return self
+
+    def execute(self):
+        self.count = 42
+        self.data = [{"penalty_id": 1}]
+        return self
+
+
+class _CountClient:
+    def __init__(self):
+        self.selects = []
+
+    def table(self, name):
+        return _CountQuery(self)
+
+
+class CountPenaltiesTests(unittest.TestCase):
+    def test_count_uses_exact_count_and_is_cached(self):
+        client = _CountClient()
+        helper = make_helper(client)
+
+        self.assertEqual(helper.count_penalties(), 42)
+        self.assertEqual(helper.count_penalties(), 42)
+        self.assertEqual(client.selects, [("penalty_id", "exact")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import unittest
+
+from helpers import make_helper
+from query_metrics import JsonLogSink, QueryMetrics, RingBufferSink
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class QueryMetricsTests(unittest.TestCase):
+    def test_latency_histogram_and_payload(self):
+        clock = _Clock()
+        metrics = QueryMetrics([RingBufferSink()], clock=clock)
+        for ms in (3, 40, 40, 700):
+            with metrics.track('get_penalties') as call:
+                clock.now += ms / 1000
+                call.result([{'Spieler': 'Anna'}, {'Spieler': 'Ben'}])
+
+        stats = metrics.get_stats()['get_penalties']
+
+        self.assertEqual(stats['calls'], 4)
+        self.assertEqual(stats['rows'], 8)
+        self.assertEqual(stats['bytes'], 4 * len(json.dumps([{'Spieler': 'Anna'}, {'Spieler': 'Ben'}])))
+        self.assertEqual(stats['histogram']['<=5ms'], 1)
+        self.assertEqual(stats['histogram']['<=50ms'], 2)
+        self.assertEqual(stats['p50_ms'], 50)
+        self.assertEqual(stats['p95_ms'], 700)
+
+    def test_errors_are_recorded_and_reraised(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'metrics.jsonl')
+            metrics = QueryMetrics([JsonLogSink(path)])
+            with self.assertRaises(ConnectionError):
+                with metrics.track('read_table'):
+                    raise ConnectionError('offline')
+
+            with open(path, encoding='utf-8') as handle:
+                event = json.loads(handle.readline())
+
+        self.assertEqual(metrics.get_stats()['read_table']['errors'], 1)
+        self.assertEqual(event['error'], 'ConnectionError: offline')
+
+
+class InstrumentedHelperTests(unittest.TestCase):
+    def test_cache_hits_are_attributed_to_the_method(self):
+        helper = make_helper()
+        helper.replica = None
+        calls = []
+
+        def read_table(*args, **kwargs):
+            calls.append(args[0])
+            return [{'player_key': 2, 'name': 'Ben'}, {'player_key': 1, 'name': 'Anna'}]
+
+        helper.read_table = read_table
+
+        first = helper.get_player_names()
+        second = helper.get_player_names()
+
+        self.assertEqual(first, ['Anna', 'Ben'])
+        self.assertEqual(second, first)
+        self.assertEqual(calls, ['dim_player'])
+        events = helper.get_query_metrics()['recent']
+        self.assertEqual([event.cache_hit for event in events if event.method == 'get_player_names'], [True, False])
+        self.assertEqual(helper.metrics.get_stats()['get_player_names']['cache_hits'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import asyncio
+import sys
+import threading
+import unittest
+
+from scheduler import Job, JobHistory, JobScheduler
+
+
+class SchedulerTests(unittest.TestCase):
+    def _scheduler(self, jobs):
+        return JobScheduler(jobs, history=JobHistory(database=None))
+
+    def test_dependents_run_after_success_only(self):
+        order = []
+
+        def fail():
+            order.append("standings")
+            sys.exit(1)
+
+        scheduler = self._scheduler([
+            Job("matches", lambda: order.append("matches")),
+            Job("standings", fail, after=("matches",)),
+            Job("content", lambda: order.append("content"), after=("standings",)),
+        ])
+
+        self.assertTrue(asyncio.run(scheduler.run_job("matches")))
+        self.assertEqual(order, ["matches", "standings"])
+        statuses = [(run.job_name, run.status) for run in scheduler.history.runs]
+        self.assertEqual(statuses, [("matches", "success"), ("standings", "failed")])
+
+    def test_overlapping_start_is_skipped(self):
+        async def slow():
+            await asyncio.sleep(0.05)
+
+        scheduler = self._scheduler([Job("slow", slow)])
+
+        async def run_twice():
+            return await asyncio.gather(scheduler.run_job("slow"), scheduler.run_job("slow"))
+
+        self.assertEqual(asyncio.run(run_twice()), [True, False])
+        self.assertEqual(len(scheduler.history.runs), 1)
+        self.assertGreaterEqual(scheduler.history.runs[0].duration_ms, 40)
+
+    def test_timed_out_thread_keeps_job_running(self):
+        release = threading.Event()
+        scheduler = self._scheduler([Job("stuck", lambda: release.wait(5), timeout_seconds=0.05)])
+
+        async def scenario():
+            self.assertFalse(await scheduler.run_job("stuck"))
+            self.assertTrue(scheduler.is_running("stuck"))
+            self.assertFalse(await scheduler.run_job("stuck"))
+            release.set()
+            for _ in range(100):
+                if not scheduler.is_running("stuck"):
+                    break
+                await asyncio.sleep(0.01)
+            self.assertFalse(scheduler.is_running("stuck"))
+
+        with self.assertLogs("scheduler", level="WARNING"):
+            asyncio.run(scenario())
+        self.assertEqual([run.status for run in scheduler.history.runs], ["timeout"])
+
+    def test_unknown_dependency_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self._scheduler([Job("content", lambda: None, after=("missing",))])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import time
+import unittest
+from datetime import date
+
+from date_keys import build_dim_date_rows, date_key_partitions
+from helpers import make_helper
+from season_config import season_date_range
+
+
+class _Table:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def upsert(self, rows, **kwargs):
+        self.calls.append(rows)
+        return self
+
+    def execute(self):
+        return None
+
+
+class _Supabase:
+    def __init__(self):
+        self.upserts = []
+
+    def table(self, name):
+        assert name == 'dim_date', name
+        return _Table(self.upserts)
+
+
+class SeasonDatesTests(unittest.TestCase):
+    def setUp(self):
+        self.helper = make_helper(_Supabase())
+        self.helper._dim_loaded_at = time.monotonic()
+
+    def test_last_partition_is_open_ended(self):
+        class _Query:
+            def __init__(self):
+                self.filters = []
+
+            def gte(self, column, value):
+                self.filters.append(('gte', value))
+                return self
+
+            def lte(self, column, value):
+                self.filters.append(('lte', value))
+                return self
+
+        filters = [partition(_Query()).filters for partition in date_key_partitions(date(2025, 7, 1), date(2026, 10, 19))]
+
+        self.assertEqual(filters, [[('gte', 20250701), ('lte', 20251231)], [('gte', 20260101)]])
+
+    def test_season_range_covers_training_and_match_start(self):
+        start, end = season_date_range()
+        rows = build_dim_date_rows(start, end)
+
+        self.assertEqual(start, date(2026, 7, 1))
+        self.assertEqual(end, date(2027, 6, 30))
+        self.assertEqual(len(rows), 365)
+        self.assertEqual(rows[-1]['date_key'], 20270630)
+
+    def test_first_write_fills_season_then_no_more_requests(self):
+        keys = self.helper._ensure_date_keys([date(2026, 10, 14), date(2025, 5, 1)])
+        self.helper._ensure_date_keys([date(2027, 3, 2)])
+        self.helper._ensure_date_key(date(2026, 10, 14))
+
+        self.assertEqual(keys, [20261014, 20250501])
+        self.assertEqual(len(self.helper.supabase.upserts), 1)
+        self.assertEqual(len(self.helper.supabase.upserts[0]), 366)
+
+    def test_ensure_season_dates_skips_known_days(self):
+        self.helper._date_keys = {20260701, 20260702}
+
+        self.assertEqual(self.helper.ensure_season_dates(), 363)
+        self.assertEqual(self.helper.ensure_season_dates(), 0)
+        self.assertEqual(len(self.helper.supabase.upserts), 1)
+
+
+class _PlayerQuery:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def select(self, columns):
+        return self
+
+    def in_(self, column, values):
+        self.client.lookups.append((self.name, column, list(values)))
+        return self
+
+    def execute(self):
+        self.data = [{'player_key': 3, 'name': 'Carl'}]
+        return self
+
+
+class _PlayerSupabase:
+    def __init__(self):
+        self.lookups = []
+
+    def table(self, name):
+        return _PlayerQuery(self, name)
+
+
+class DimensionLookupTests(unittest.TestCase):
+    def test_unknown_player_is_looked_up_without_reloading_all_dimensions(self):
+        helper = make_helper(_PlayerSupabase())
+        helper._player_keys = {'Anna': 1, 'Ben': 2}
+        helper._date_keys = {20261014}
+        helper._dim_loaded_at = time.monotonic()
+
+        keys = helper._get_player_keys(['Anna', 'Carl', 'Zoe'])
+
+        self.assertEqual(keys, {'Anna': 1, 'Carl': 3})
+        self.assertEqual(helper.supabase.lookups, [('dim_player', 'name', ['Carl', 'Zoe'])])
+        self.assertEqual(helper._date_keys, {20261014})
+
+
+if __name__ == "__main__":
+    unittest.main()
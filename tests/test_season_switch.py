@@ -2,8 +2,11 @@ import unittest
 from datetime import date
 
 from season_config import (
+    PREVIOUS_GROUP_TEAMS_2526,
     get_preseason_standings,
+    VIKTORIA_TEAM_KEY,
     is_training_date_in_current_season,
+    resolve_team_key,
     validate_expected_group,
 )
 
@@ -38,11 +41,28 @@ class SeasonSwitchTests(unittest.TestCase):
         ok, _ = validate_expected_group(standings)
         self.assertFalse(ok)
 
+    def test_old_2526_group_is_accepted_for_its_own_season(self):
+        standings = [{"team_name": team} for team in PREVIOUS_GROUP_TEAMS_2526]
+        standings[-3]["team_name"] = "Spvgg. Meiderich 06/\u200b95"
+        ok, message = validate_expected_group(standings, "2526")
+        self.assertTrue(ok, message)
+
+    def test_unknown_season_is_rejected(self):
+        ok, message = validate_expected_group(get_preseason_standings(), "2324")
+        self.assertFalse(ok)
+        self.assertIn("23/24", message)
+
     def test_wrong_team_count_is_rejected(self):
         standings = get_preseason_standings()[:-1]
         ok, _ = validate_expected_group(standings)
         self.assertFalse(ok)
 
+    def test_team_aliases_resolve_to_one_key(self):
+        for name in ["TuS Viktoria Buchholz", "V Buchholz", "Viktoria  Buchholz"]:
+            self.assertEqual(resolve_team_key(name), VIKTORIA_TEAM_KEY)
+        self.assertEqual(resolve_team_key("Mülheimer SV 2"), resolve_team_key("Mülheimer SV II"))
+        self.assertEqual(resolve_team_key("SV Unbekannt 09"), "sv-unbekannt-09")
+
     def test_training_cutoff_includes_july_first(self):
         self.assertFalse(is_training_date_in_current_season(date(2026, 6, 30)))
         self.assertTrue(is_training_date_in_current_season(date(2026, 7, 1)))
@@ -0,0 +1,181 @@
+import unittest
+from datetime import timedelta
+
+from helpers import make_helper
+from season_config import CURRENT_STANDINGS_SEASON
+from timezone_helper import get_german_now
+
+
+class _Query:
+    def __init__(self, client, rows):
+        self.client = client
+        self.rows = rows
+
+    def __getattr__(self, name):
+        # select/order/limit verändern die Testdaten nicht (Zeilen sind schon neueste zuerst)
+        return lambda *args, **kwargs: self
+
+    def eq(self, column, value):
+        self.rows = [row for row in self.rows if row.get(column) == value]
+        return self
+
+    def execute(self):
+        self.client.executed += 1
+        self.data = self.rows[:1]
+        return self
+
+
+class _Supabase:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = 0
+
+    def table(self, name):
+        return _Query(self, self.rows)
+
+
+class _MissingColumnError(Exception):
+    code = 'PGRST204'
+
+
+class _InsertQuery:
+    def __init__(self, client):
+        self.client = client
+
+    def insert(self, rows):
+        self.rows = rows
+        return self
+
+    def execute(self):
+        if any('team_key' in row for row in self.rows):
+            raise _MissingColumnError("Could not find the 'team_key' column of 'team_standings' in the schema cache")
+        self.client.inserted.append(self.rows)
+        self.data = self.rows
+        return self
+
+
+class _SupabaseWithoutTeamKey:
+    def __init__(self):
+        self.inserted = []
+
+    def table(self, name):
+        return _InsertQuery(self)
+
+
+class _FilterQuery:
+    def __init__(self, client):
+        self.client = client
+        self.filters = []
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(('eq', column, value))
+        return self
+
+    def ilike(self, column, pattern):
+        self.filters.append(('ilike', column, pattern))
+        return self
+
+    def order(self, *args, **kwargs):
+        return self
+
+    def limit(self, count):
+        return self
+
+    def execute(self):
+        self.client.queries.append(self.filters)
+        if not self.client.has_team_key and any(column == 'team_key' for _, column, _ in self.filters):
+            raise _MissingColumnError("column team_standings.team_key does not exist")
+        self.data = []
+        return self
+
+
+class _HistorySupabase:
+    def __init__(self, has_team_key):
+        self.has_team_key = has_team_key
+        self.queries = []
+
+    def table(self, name):
+        return _FilterQuery(self)
+
+
+def _standing(team_name, team_key, position, scraped_at):
+    return {
+        'team_name': team_name, 'team_key': team_key, 'season': CURRENT_STANDINGS_SEASON, 'position': position,
+        'points': 20 - position, 'games_played': 9, 'wins': 5, 'draws': 2, 'losses': 2,
+        'goals_for': 18, 'goals_against': 11, 'goal_difference': 7, 'scraped_at': scraped_at,
+    }
+
+
+class StandingsSnapshotTests(unittest.TestCase):
+    def test_sidebar_helpers_share_one_query(self):
+        scraped_at = (get_german_now() - timedelta(hours=30)).isoformat()
+        supabase = _Supabase([
+            _standing('SV Nord', 'sv-nord', 1, scraped_at),
+            _standing('TuS Viktoria Buchholz', 'tus-viktoria-buchholz', 4, scraped_at),
+        ])
+        helper = make_helper(supabase)
+
+        viktoria = helper.get_latest_viktoria_data()
+        is_current = helper.is_standings_data_current()
+        last_update = helper.get_standings_last_update()
+        snapshot = helper.get_standings_snapshot(max_age_hours=48)
+
+        self.assertEqual(supabase.executed, 1)
+        self.assertEqual(viktoria['platz'], "4.")
+        self.assertFalse(is_current)
+        self.assertIsNotNone(last_update)
+        self.assertTrue(snapshot['is_current'])
+        self.assertAlmostEqual(snapshot['age_hours'], 30, delta=0.1)
+
+    def test_snapshot_ignores_newer_scrapes_of_other_groups(self):
+        other_group = (get_german_now() - timedelta(hours=2)).isoformat()
+        viktoria_group = (get_german_now() - timedelta(hours=30)).isoformat()
+        supabase = _Supabase([
+            _standing('SV Fremd', 'sv-fremd', 1, other_group),
+            _standing('TuS Viktoria Buchholz', 'tus-viktoria-buchholz', 4, viktoria_group),
+        ])
+        helper = make_helper(supabase)
+
+        snapshot = helper.get_standings_snapshot(max_age_hours=24)
+
+        self.assertEqual(snapshot['viktoria']['platz'], "4.")
+        self.assertAlmostEqual(snapshot['age_hours'], 30, delta=0.1)
+        self.assertFalse(snapshot['is_current'])
+
+    def test_standings_saved_without_team_key_until_migration(self):
+        supabase = _SupabaseWithoutTeamKey()
+        helper = make_helper(supabase)
+        standings = [{'team_name': 'TuS Viktoria Buchholz', 'position': 4, 'points': 16}]
+
+        first, _ = helper.save_team_standings_batch([('2526', standings)])
+        second, _ = helper.save_team_standings_batch([('2526', standings)])
+
+        self.assertTrue(first)
+        self.assertTrue(second)
+        self.assertFalse(helper._team_key_columns)
+        self.assertEqual(len(supabase.inserted), 2)
+        self.assertNotIn('team_key', supabase.inserted[0][0])
+
+    def test_history_filters_by_team_key(self):
+        supabase = _HistorySupabase(has_team_key=True)
+        helper = make_helper(supabase)
+
+        helper.get_team_standings_history('2526', 'V Buchholz')
+
+        self.assertEqual(supabase.queries, [[('eq', 'season', '2526'), ('eq', 'team_key', 'tus-viktoria-buchholz')]])
+
+    def test_history_falls_back_to_name_without_team_key_column(self):
+        supabase = _HistorySupabase(has_team_key=False)
+        helper = make_helper(supabase)
+
+        helper.get_team_standings_history('2526', 'Viktoria Buchholz')
+
+        self.assertEqual(supabase.queries[-1], [('eq', 'season', '2526'), ('ilike', 'team_name', '%Viktoria Buchholz%')])
+        self.assertFalse(helper._team_key_columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
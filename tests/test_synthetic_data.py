@@ -0,0 +1,63 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from bench_load import make_helper  # noqa: E402
+from postgrest_standin import SqlitePostgrest  # noqa: E402
+from synthetic_data import generate, load_sqlite, row_counts  # noqa: E402
+
+UNTIL = date(2026, 10, 18)
+
+
+class SyntheticDataTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.workdir = directory.name
+        self.tables = generate(seasons=2, scale=1, seed=7, until=UNTIL)
+        self.conn = load_sqlite(self.tables)
+        self.addCleanup(self.conn.close)
+        self.client = SqlitePostgrest(self.conn)
+
+    def test_seeded_and_scaled(self):
+        self.assertEqual(row_counts(generate(seasons=2, scale=1, seed=7, until=UNTIL)), row_counts(self.tables))
+        scaled = row_counts(generate(seasons=2, scale=3, seed=7, until=UNTIL))
+        counts = row_counts(self.tables)
+        for table in ('fact_penalty', 'fact_training_win', 'team_standings', 'lineups'):
+            self.assertAlmostEqual(scaled[table] / counts[table], 3, delta=0.2)
+        self.assertEqual(scaled['dim_date'], counts['dim_date'])
+
+    def test_helper_reads_the_same_through_postgrest_and_replica(self):
+        postgrest = make_helper(self.client, 'postgrest', self.workdir)
+        replica = make_helper(self.client, 'replica', self.workdir)
+        self.addCleanup(lambda: replica.replica and replica.replica.close())
+
+        expected = postgrest.get_penalties()
+        self.assertEqual(len(expected), len(self.tables['fact_penalty']))
+        pd.testing.assert_frame_equal(
+            replica.get_penalties().reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False
+        )
+        self.assertEqual(len(postgrest.get_training_victories(season_start=None)),
+                         len(self.tables['fact_training_win']))
+        self.assertIsNotNone(replica.replica)
+
+    def test_standin_rpc_matches_python_fallback(self):
+        helper = make_helper(self.client, 'postgrest', self.workdir)
+
+        via_rpc = helper.get_training_statistics(season_start=date(2026, 7, 1))
+        computed = helper._compute_training_statistics(season_start=date(2026, 7, 1))
+
+        self.assertEqual(via_rpc, computed)
+        ok, message = helper.add_training_day_entries(date(2026, 10, 20), ['Ben Schmidt'], ['Ben Schmidt', 'Luca Schmidt'])
+        self.assertTrue(ok, message)
+        self.assertEqual(len(helper.get_training_day_entries(date(2026, 10, 20))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+import pandas as pd
+
+from helpers import make_helper
+
+
+class _Rpc:
+    def __init__(self, data=None, error=None):
+        self.data = data
+        self.error = error
+
+    def execute(self):
+        if self.error:
+            raise self.error
+        return self
+
+
+class _Supabase:
+    def __init__(self, data=None, error=None):
+        self.calls = []
+        self._data = data
+        self._error = error
+
+    def rpc(self, function, params):
+        self.calls.append((function, params))
+        return _Rpc(self._data, self._error)
+
+
+class TrainingStatisticsTests(unittest.TestCase):
+    def test_uses_server_side_aggregate(self):
+        supabase = _Supabase(data=[{
+            'total_trainings': 12, 'total_victories': 70,
+            'latest_participants': 14, 'previous_participants': 16,
+        }])
+        helper = make_helper(supabase)
+
+        stats = helper.get_training_statistics()
+
+        self.assertEqual(supabase.calls[0][0], 'training_statistics')
+        self.assertEqual(stats['total_trainings'], 12)
+        self.assertEqual(stats['latest_training_participants'], 14)
+        self.assertEqual(stats['training_delta_text'], "-2")
+
+    def test_local_fallback_matches_aggregate_semantics(self):
+        helper = make_helper(_Supabase(error=RuntimeError("function training_statistics does not exist")))
+        helper.get_training_victories = lambda season_start=None: pd.DataFrame({
+            'Spieler': ['A', 'B', 'C', 'A', 'B'],
+            'Datum': pd.to_datetime(['2025-08-05', '2025-08-05', '2025-08-05', '2025-08-01', '2025-08-01']),
+            'Sieg': [True, True, False, True, False],
+        })
+
+        stats = helper.get_training_statistics()
+
+        self.assertEqual(stats['total_trainings'], 2)
+        self.assertEqual(stats['total_victories'], 3)
+        self.assertEqual(stats['latest_training_participants'], 4)
+        self.assertEqual(stats['training_delta_text'], "+ 2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from datetime import date
+
+import pandas as pd
+
+from dashboard_stats import compute_weekly_donkeys, get_week_donkey
+
+
+class WeeklyDonkeyTests(unittest.TestCase):
+    def test_iso_week_53_spans_the_year_boundary(self):
+        penalties = pd.DataFrame({
+            # 2026 hat 53 ISO-Wochen: 28.12.2026 - 03.01.2027 ist KW 53/2026
+            'Datum': pd.to_datetime(['2026-12-28', '2027-01-02', '2027-01-03', '2027-01-04']),
+            'Spieler': ['Anna', 'Ben', 'Ben', 'Anna'],
+            'Betrag': [5.0, 1.0, 5.0, 15.0],
+        })
+
+        donkeys = compute_weekly_donkeys(penalties)
+
+        self.assertEqual(list(zip(donkeys['iso_year'], donkeys['iso_week'])), [(2027, 1), (2026, 53)])
+        self.assertEqual(get_week_donkey(donkeys, date(2026, 12, 28)), ('Ben', 6.0, 2))
+        self.assertEqual(get_week_donkey(donkeys, date(2027, 1, 4)), ('Anna', 15.0, 1))
+        self.assertEqual(get_week_donkey(donkeys, date(2026, 12, 21)), (None, 0, 0))
+
+    def test_ties_are_broken_alphabetically(self):
+        penalties = pd.DataFrame({
+            'Datum': pd.to_datetime(['2025-03-03', '2025-03-04']),
+            'Spieler': ['Zoe', 'Anna'],
+            'Betrag': [5.0, 5.0],
+        })
+
+        self.assertEqual(get_week_donkey(compute_weekly_donkeys(penalties), date(2025, 3, 3))[0], 'Anna')
+
+    def test_empty_input(self):
+        self.assertTrue(compute_weekly_donkeys(pd.DataFrame(columns=['Datum', 'Spieler', 'Betrag'])).empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
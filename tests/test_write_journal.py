@@ -0,0 +1,238 @@
+import os
+import tempfile
+import unittest
+
+from database_helper import DatabaseHelper
+from helpers import make_helper
+from write_journal import MAX_BACKOFF_SECONDS, WriteJournal
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class WriteJournalTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'journal.jsonl')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_pending_entries_survive_restart(self):
+        journal = WriteJournal(self.path)
+        first = journal.append('penalty', {'Spieler': 'Anna'})
+        second = journal.append('penalty', {'Spieler': 'Ben'})
+        journal.complete([first])
+
+        reloaded = WriteJournal(self.path)
+
+        self.assertEqual([entry.id for entry in reloaded.ready()], [second])
+        reloaded.complete([second])
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+    def test_retry_backs_off_without_giving_up(self):
+        clock = _Clock()
+        journal = WriteJournal(self.path, clock=clock)
+        entry_id = journal.append('penalty', {'Spieler': 'Anna'})
+
+        journal.retry([entry_id], 'timeout')
+        self.assertEqual(journal.ready(), [])
+        clock.now = 2
+        self.assertEqual(len(journal.ready()), 1)
+
+        for _ in range(20):
+            journal.retry([entry_id], 'timeout')
+        self.assertEqual(journal.get_status()['pending'], 1)
+        self.assertEqual(journal.get_status()['dead'], 0)
+        clock.now += MAX_BACKOFF_SECONDS
+        self.assertEqual(len(journal.ready()), 1)
+
+    def test_dead_entries_are_shown_until_acknowledged(self):
+        journal = WriteJournal(self.path)
+        entry_id = journal.append('penalty', {'Spieler': 'Zoe'})
+        journal.fail([entry_id], 'unbekannter Spieler')
+
+        dead = WriteJournal(self.path).dead_entries()
+        self.assertEqual([(entry['payload']['Spieler'], entry['error']) for entry in dead],
+                         [('Zoe', 'unbekannter Spieler')])
+
+        journal.acknowledge([entry_id])
+        self.assertEqual(WriteJournal(self.path).dead_entries(), [])
+
+    def test_supersede_drops_older_training_day(self):
+        journal = WriteJournal(self.path)
+        journal.append('training_day', {'datum': '2026-10-14'})
+        journal.append('training_day', {'datum': '2026-10-16'})
+
+        self.assertEqual(journal.supersede('training_day', lambda p: p['datum'] == '2026-10-14'), 1)
+        self.assertEqual([entry.payload['datum'] for entry in journal.ready()], ['2026-10-16'])
+
+
+class FlushJournalTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.helper = make_helper()
+        self.helper.replica = None
+        self.helper.journal = WriteJournal(os.path.join(self.tmp.name, 'journal.jsonl'))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_penalties_are_flushed_in_one_batch_with_request_ids(self):
+        batches = []
+
+        def save(records):
+            batches.append(records)
+            return len(records) - 1, {2: "Spieler 'Zoe' nicht in dim_player gefunden"}
+
+        self.helper._save_penalties = save
+        ids = [self.helper.journal.append('penalty', {'Spieler': name}) for name in ('Anna', 'Zoe', 'Ben')]
+
+        result = self.helper.flush_journal()
+
+        self.assertEqual(result, {'saved': 2, 'retry': 0, 'failed': 1})
+        self.assertEqual([record['request_id'] for record in batches[0]], ids)
+        self.assertEqual(self.helper.get_journal_status()['pending'], 0)
+        self.assertEqual(self.helper.get_journal_status()['dead'], 1)
+
+    def test_network_error_keeps_entries_for_retry(self):
+        def save(records):
+            raise ConnectionError('offline')
+
+        self.helper._save_penalties = save
+        self.helper.journal.append('penalty', {'Spieler': 'Anna'})
+
+        self.assertEqual(self.helper.flush_journal(), {'saved': 0, 'retry': 1, 'failed': 0})
+        self.assertEqual(self.helper.get_journal_status()['last_error'], 'offline')
+
+    def test_rejected_batch_only_dead_letters_the_offending_entry(self):
+        class _CheckViolation(Exception):
+            code = '23514'
+
+        def save(records):
+            if any(record['Spieler'] == 'Zoe' for record in records):
+                raise _CheckViolation('amount_eur must be positive')
+            return len(records), {}
+
+        self.helper._save_penalties = save
+        for name in ('Anna', 'Zoe', 'Ben'):
+            self.helper.journal.append('penalty', {'Spieler': name})
+
+        self.assertEqual(self.helper.flush_journal(), {'saved': 2, 'retry': 0, 'failed': 1})
+        dead = self.helper.journal.dead_entries()
+        self.assertEqual([entry['payload']['Spieler'] for entry in dead], ['Zoe'])
+
+    def test_training_day_network_error_is_retried(self):
+        def save(*args):
+            raise TimeoutError('timed out')
+
+        self.helper._save_training_day = save
+        self.helper.journal.append('training_day', {'datum': '2026-10-14', 'spieler_mit_sieg': [],
+                                                    'alle_spieler': ['Anna']})
+
+        self.assertEqual(self.helper.flush_journal(), {'saved': 0, 'retry': 1, 'failed': 0})
+        self.assertEqual(self.helper.get_journal_status()['dead'], 0)
+
+    def test_offline_flush_leaves_entries_pending(self):
+        self.helper.connected = False
+        self.helper.journal.append('penalty', {'Spieler': 'Anna'})
+
+        self.assertEqual(self.helper.flush_journal(), {'saved': 0, 'retry': 0, 'failed': 0})
+        self.assertEqual(self.helper.get_journal_status()['pending'], 1)
+
+    def test_offline_enqueue_uses_the_journal(self):
+        self.helper.connected = False
+        self.helper._journal_path = os.path.join(self.tmp.name, 'journal.jsonl')
+        self.helper._fallback_save_penalty = lambda record: self.fail("CSV-Fallback trotz Journal")
+
+        ok, _ = self.helper.enqueue_penalty({'Datum': '19.10.2026', 'Spieler': 'Anna',
+                                             'Strafe': 'Verspätung', 'Betrag': 5})
+
+        self.assertTrue(ok)
+        self.assertEqual(self.helper.get_journal_status()['pending'], 1)
+
+
+
+class _MissingColumn(Exception):
+    code = 'PGRST204'
+
+
+class _Table:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def upsert(self, rows, **kwargs):
+        self.calls.append(('upsert', rows))
+        return self
+
+    def insert(self, rows):
+        self.calls.append(('insert', rows))
+        return self
+
+    def execute(self):
+        action, rows = self.calls[-1]
+        if action == 'upsert':
+            raise _MissingColumn("Could not find the 'request_id' column of 'fact_penalty' in the schema cache")
+        return type('Response', (), {'data': rows})()
+
+
+class MissingMigrationTests(unittest.TestCase):
+    def test_penalties_are_saved_without_request_id_column(self):
+        calls = []
+        helper = make_helper(type('Client', (), {'table': lambda self, name: _Table(calls)})())
+        helper._get_player_keys = lambda names: {name: 1 for name in names}
+        helper._get_or_create_penalty_type_keys = lambda amounts: {name: 2 for name in amounts}
+        helper._ensure_date_keys = lambda dates: [20261019 for _ in dates]
+        record = {'Datum': '19.10.2026', 'Spieler': 'Anna', 'Strafe': 'Verspätung', 'Betrag': 5, 'request_id': 'a1'}
+
+        self.assertEqual(helper._save_penalties([record]), (1, {}))
+        self.assertEqual(helper._save_penalties([dict(record, request_id='a2')]), (1, {}))
+
+        self.assertEqual([action for action, _ in calls], ['upsert', 'insert', 'insert'])
+        self.assertNotIn('request_id', calls[-1][1][0])
+
+
+class AddPenaltiesTests(unittest.TestCase):
+    def test_insert_error_keeps_known_problems(self):
+        helper = make_helper()
+        helper._get_player_keys = lambda names: {name: 1 for name in names if name != 'Zoe'}
+        helper._get_or_create_penalty_type_keys = lambda amounts: {name: 2 for name in amounts}
+        helper._ensure_date_keys = lambda dates: [20261019 for _ in dates]
+
+        def insert(rows):
+            raise ConnectionError('offline')
+
+        helper._insert_penalty_rows = insert
+        records = [{'Datum': '19.10.2026', 'Spieler': name, 'Strafe': 'Verspätung', 'Betrag': 5}
+                   for name in ('Anna', 'Zoe')]
+
+        saved, problems = helper.add_penalties(records)
+
+        self.assertEqual(saved, 0)
+        self.assertEqual(problems, ["Datensatz 1: offline",
+                                    "Datensatz 2: Spieler 'Zoe' nicht in dim_player gefunden"])
+
+    def test_non_finite_amounts_are_rejected(self):
+        helper = DatabaseHelper()
+        for amount in (float('nan'), float('inf'), 'nan'):
+            problem, _ = helper._validate_penalty_record(
+                {'Datum': '19.10.2026', 'Spieler': 'Anna', 'Strafe': 'Verspätung', 'Betrag': amount})
+            self.assertTrue(problem.startswith("ungültiger Betrag"))
+
+    def test_add_penalty_uses_the_batch_path(self):
+        helper = DatabaseHelper()
+        batches = []
+        helper._save_penalties = lambda records: (batches.append(records) or len(records), {})
+
+        record = {'Datum': '19.10.2026', 'Spieler': 'Anna', 'Strafe': 'Verspätung', 'Betrag': 5}
+        self.assertTrue(helper.add_penalty(record))
+        self.assertEqual(batches, [[record]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+"""Lokales Append-only-Journal für verzögerte Schreibvorgänge (Write-Behind).
+
+Neue Strafen und Trainingstage werden zuerst als JSON-Zeile angehängt (fsync)
+und dem Benutzer sofort bestätigt. DatabaseHelper schreibt sie im Hintergrund
+gesammelt nach Supabase. Jeder Eintrag trägt eine Idempotenz-ID (request_id),
+damit Wiederholungen nach Netzwerkfehlern keine Duplikate erzeugen.
+
+Zeilenformat:
+    {"id": ..., "kind": "penalty", "payload": {...}, "created_at": ...}   Eintrag
+    {"done": id}                                                         geschrieben
+    {"dead": id, "error": "..."}                                         aufgegeben
+    {"ack": id}                                                          Aufgabe gesehen
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+MAX_BACKOFF_SECONDS = 300
+
+
+@dataclass
+class JournalEntry:
+    id: str
+    kind: str
+    payload: Dict[str, Any]
+    created_at: str
+    attempts: int = 0
+    next_attempt: float = 0.0
+    last_error: Optional[str] = field(default=None)
+
+
+class WriteJournal:
+    """Thread-sicheres JSONL-Journal mit Wiederholungen und exponentiellem Backoff."""
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.monotonic) -> None:
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pending: Dict[str, JournalEntry] = {}
+        self._dead: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Abgebrochene letzte Zeile (Absturz beim Schreiben) ignorieren
+                    continue
+                if "kind" in record:
+                    self._pending[record["id"]] = JournalEntry(
+                        record["id"], record["kind"], record["payload"], record["created_at"]
+                    )
+                elif "done" in record:
+                    self._pending.pop(record["done"], None)
+                elif "dead" in record:
+                    entry = self._pending.pop(record["dead"], None)
+                    self._dead[record["dead"]] = self._dead_record(entry, record["dead"], record.get("error", ""))
+                elif "ack" in record:
+                    self._dead.pop(record["ack"], None)
+
+    def _append(self, records: Iterable[Dict[str, Any]]) -> None:
+        lines = "".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in records)
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(lines)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def append(self, kind: str, payload: Dict[str, Any]) -> str:
+        """Hängt einen Eintrag dauerhaft an und liefert seine Idempotenz-ID."""
+        entry = JournalEntry(uuid.uuid4().hex, kind, payload, datetime.now().isoformat(timespec="seconds"))
+        with self._lock:
+            self._append([{"id": entry.id, "kind": kind, "payload": payload, "created_at": entry.created_at}])
+            self._pending[entry.id] = entry
+        return entry.id
+
+    def ready(self) -> List[JournalEntry]:
+        """Offene Einträge, deren Backoff abgelaufen ist, in Schreibreihenfolge."""
+        now = self._clock()
+        with self._lock:
+            return [entry for entry in self._pending.values() if entry.next_attempt <= now]
+
+    def complete(self, ids: Iterable[str]) -> None:
+        with self._lock:
+            ids = [entry_id for entry_id in ids if entry_id in self._pending]
+            if not ids:
+                return
+            self._append({"done": entry_id} for entry_id in ids)
+            for entry_id in ids:
+                self._pending.pop(entry_id, None)
+            if not self._pending:
+                self._compact()
+
+    def supersede(self, kind: str, matches: Callable[[Dict[str, Any]], bool]) -> int:
+        """Markiert offene Einträge als erledigt, die ein neuerer Eintrag ersetzt (z.B. gleicher Trainingstag)."""
+        with self._lock:
+            ids = [entry.id for entry in self._pending.values() if entry.kind == kind and matches(entry.payload)]
+        self.complete(ids)
+        return len(ids)
+
+    def retry(self, ids: Iterable[str], error: str) -> None:
+        """Verschiebt Einträge nach einem vorübergehenden Fehler per Backoff (höchstens MAX_BACKOFF_SECONDS).
+
+        Sie werden nie aufgegeben, solange der Fehler vorübergehend ist; dauerhafte
+        Fehler gehen über fail().
+        """
+        now = self._clock()
+        with self._lock:
+            for entry_id in ids:
+                entry = self._pending.get(entry_id)
+                if entry is None:
+                    continue
+                entry.attempts += 1
+                entry.last_error = error
+                entry.next_attempt = now + min(2 ** entry.attempts, MAX_BACKOFF_SECONDS)
+
+    def fail(self, ids: Iterable[str], error: str) -> None:
+        """Einträge sofort aufgeben (dauerhafter Fehler, z.B. unbekannter Spieler)."""
+        with self._lock:
+            self._give_up([entry_id for entry_id in ids if entry_id in self._pending], error)
+
+    def _give_up(self, ids: List[str], error: str) -> None:
+        if not ids:
+            return
+        self._append({"dead": entry_id, "error": error} for entry_id in ids)
+        for entry_id in ids:
+            entry = self._pending.pop(entry_id, None)
+            self._dead[entry_id] = self._dead_record(entry, entry_id, error)
+
+    @staticmethod
+    def _dead_record(entry: Optional[JournalEntry], entry_id: str, error: str) -> Dict[str, Any]:
+        return {
+            "id": entry_id,
+            "kind": entry.kind if entry else None,
+            "payload": entry.payload if entry else {},
+            "created_at": entry.created_at if entry else None,
+            "error": error,
+        }
+
+    def dead_entries(self) -> List[Dict[str, Any]]:
+        """Aufgegebene Einträge (id, kind, payload, created_at, error), damit der Benutzer sie nachtragen kann."""
+        with self._lock:
+            return list(self._dead.values())
+
+    def acknowledge(self, ids: Iterable[str]) -> None:
+        """Aufgegebene Einträge als gesehen markieren; sie werden danach nicht mehr angezeigt."""
+        with self._lock:
+            ids = [entry_id for entry_id in ids if entry_id in self._dead]
+            if not ids:
+                return
+            self._append({"ack": entry_id} for entry_id in ids)
+            for entry_id in ids:
+                self._dead.pop(entry_id)
+            if not self._pending:
+                self._compact()
+
+    def _compact(self) -> None:
+        # Nichts mehr offen → Datei auf die aufgegebenen Einträge zurücksetzen
+        kept = []
+        if self._dead and os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if record.get("id") in self._dead or record.get("dead") in self._dead:
+                        kept.append(record)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            handle.writelines(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in kept)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, self.path)
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            oldest = min((entry.created_at for entry in self._pending.values()), default=None)
+            return {
+                "path": self.path,
+                "pending": len(self._pending),
+                "dead": len(self._dead),
+                "oldest_pending": oldest,
+                "last_error": next(
+                    (entry.last_error for entry in reversed(list(self._pending.values())) if entry.last_error),
+                    None,
+                ),
+            }